@@ -0,0 +1,415 @@
+# =============================================================================
+# LOCAL KNOWLEDGE BASE
+# =============================================================================
+# A local alternative to the managed Bedrock Knowledge Base:
+#   - PDFs are parsed one page at a time, chunked, and embedded in batches,
+#     so peak memory depends on the batch size, not on the PDF size
+#   - vectors are appended to an on-disk index (float32 rows + a JSONL chunk
+#     store with byte offsets), searched in-process with numpy
+#   - files are re-ingested only when their content hash changes, and the
+#     rows of files no longer present are dropped (tombstoned)
+#   - sources are keyed by their path relative to the ingested folder, so the
+#     docs folder (or the index) can move without a re-ingestion
+#   - searches only read shared memory maps, so one index can serve many
+#     threads (e.g. Streamlit sessions) without a lock
+#
+# Index layout (one directory):
+#   manifest.json  dimension, row count, embedding model, ingested sources
+#   vectors.f32    normalised float32 rows, memory-mapped for search
+#   chunks.jsonl   one {"text", "source", "page"} line per row, memory-mapped;
+#                  "source" is the file's key (e.g. "guides/setup.pdf")
+#   offsets.u64    byte offset of every line in chunks.jsonl
+#
+# local_kb_retriever.py wraps LocalVectorIndex as a LangChain retriever for
+# get_retriever(). Build an index with:
+#   python local_kb.py ingest ../docs --index ../kb_index
+# =============================================================================
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import time
+import zlib
+
+import numpy as np
+
+MANIFEST = "manifest.json"
+VECTORS = "vectors.f32"
+CHUNKS = "chunks.jsonl"
+OFFSETS = "offsets.u64"
+
+SEPARATORS = ["\n\n", "\n", ". ", " "]
+SEARCH_BLOCK_ROWS = 65536  # rows scored per matrix product, bounds search memory
+
+
+# -----------------------------------------------------------------------------
+# Parsing and chunking
+# -----------------------------------------------------------------------------
+def iter_pdf_pages(path):
+    """Yield (page_number, text) one page at a time."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    for number, page in enumerate(reader.pages, start=1):
+        yield number, page.extract_text() or ""
+
+
+def split_text(text, chunk_size=1000, chunk_overlap=100):
+    """
+    Yield chunks of at most `chunk_size` characters, cut at the last paragraph,
+    line, sentence or word break in the second half of the window, with about
+    `chunk_overlap` characters carried over between consecutive chunks.
+    """
+    start = 0
+    length = len(text)
+    while start < length:
+        end = min(start + chunk_size, length)
+        if end < length:
+            for separator in SEPARATORS:
+                cut = text.rfind(separator, start + chunk_size // 2, end)
+                if cut != -1:
+                    end = cut + len(separator)
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            yield chunk
+        if end >= length:
+            break
+        # restart at a word boundary inside the overlap
+        space = text.find(" ", end - chunk_overlap, end)
+        start = space + 1 if space != -1 and space + 1 > start else end
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# -----------------------------------------------------------------------------
+# Embeddings
+# -----------------------------------------------------------------------------
+def bedrock_embeddings():
+    """Titan text embeddings, the model used by the managed Knowledge Base."""
+    from langchain_community.embeddings import BedrockEmbeddings
+
+    return BedrockEmbeddings(
+        model_id="amazon.titan-embed-text-v2:0",
+        credentials_profile_name="<default_profile>",
+    )
+
+
+class HashingEmbeddings:
+    """
+    Offline stand-in with the LangChain Embeddings interface: signed feature
+    hashing of lowercase word tokens. Only lexical overlap is captured, but it
+    is deterministic and needs no model, for tests and benchmarks.
+    """
+
+    model_name = "hashing"
+
+    def __init__(self, dimension=384):
+        self.dimension = dimension
+
+    def _embed(self, text):
+        vector = [0.0] * self.dimension
+        for token in re.findall(r"\w+", text.lower()):
+            h = zlib.crc32(token.encode())
+            vector[h % self.dimension] += 1.0 if h & 0x80000000 else -1.0
+        return vector
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def embeddings_for(manifest):
+    """The embedding model an index was built with, to embed queries."""
+    if manifest["embedding_model"] == HashingEmbeddings.model_name:
+        return HashingEmbeddings(manifest["dimension"])
+    return bedrock_embeddings()
+
+
+def embedding_model_name(embeddings):
+    return (
+        getattr(embeddings, "model_id", None)
+        or getattr(embeddings, "model_name", None)
+        or type(embeddings).__name__
+    )
+
+
+def normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+# -----------------------------------------------------------------------------
+# Index
+# -----------------------------------------------------------------------------
+def _read_manifest(index_dir):
+    path = os.path.join(index_dir, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+class IndexWriter:
+    """
+    Append-only writer. Rows are written to the data files first and the
+    manifest last (atomically), so an interrupted ingestion leaves the index
+    at its previous state; trailing partial writes are truncated on reopen.
+    """
+
+    def __init__(self, index_dir, embeddings, batch_size=64):
+        os.makedirs(index_dir, exist_ok=True)
+        self.index_dir = index_dir
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.manifest = _read_manifest(index_dir) or {
+            "dimension": None,
+            "count": 0,
+            "chunks_bytes": 0,
+            "embedding_model": embedding_model_name(embeddings),
+            "sources": {},
+            "tombstones": [],
+        }
+        if self.manifest["embedding_model"] != embedding_model_name(embeddings):
+            raise ValueError(
+                f"Index {index_dir} was built with {self.manifest['embedding_model']}, "
+                f"not {embedding_model_name(embeddings)}; rebuild it in a new directory"
+            )
+
+        count, dimension = self.manifest["count"], self.manifest["dimension"]
+        self._vectors = self._open(VECTORS, count * (dimension or 0) * 4)
+        self._chunks = self._open(CHUNKS, self.manifest["chunks_bytes"])
+        self._offsets = self._open(OFFSETS, count * 8)
+        self._pending = []  # (text, source, page) waiting for the next batch
+        self._seen = set()  # chunk digests of the current source, to drop duplicates
+
+    def _open(self, name, valid_bytes):
+        f = open(os.path.join(self.index_dir, name), "ab")
+        f.truncate(valid_bytes)
+        return f
+
+    def add(self, text, source, page):
+        digest = hashlib.sha1(text.encode()).digest()
+        if digest in self._seen:
+            return
+        self._seen.add(digest)
+        self._pending.append((text, source, page))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        vectors = normalize_rows(self.embeddings.embed_documents([t for t, _, _ in self._pending]))
+        if self.manifest["dimension"] is None:
+            self.manifest["dimension"] = int(vectors.shape[1])
+        elif vectors.shape[1] != self.manifest["dimension"]:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} != index {self.manifest['dimension']}")
+
+        offsets = []
+        position = self.manifest["chunks_bytes"]
+        lines = []
+        for text, source, page in self._pending:
+            line = (json.dumps({"text": text, "source": source, "page": page}) + "\n").encode()
+            offsets.append(position)
+            position += len(line)
+            lines.append(line)
+
+        self._vectors.write(vectors.tobytes())
+        self._chunks.write(b"".join(lines))
+        self._offsets.write(np.asarray(offsets, dtype=np.uint64).tobytes())
+        self.manifest["count"] += len(self._pending)
+        self.manifest["chunks_bytes"] = position
+        self._pending = []
+
+    def remove_source(self, key):
+        """Tombstone the rows of `key` and forget it."""
+        self.manifest["tombstones"].append(self.manifest["sources"].pop(key)["rows"])
+
+    def begin_source(self, key, sha256):
+        """Tombstone the rows of a previous version of `key`."""
+        previous = self.manifest["sources"].get(key)
+        if previous is not None:
+            self.manifest["tombstones"].append(previous["rows"])
+        self.manifest["sources"][key] = {"sha256": sha256, "rows": [self.manifest["count"], None]}
+        self._seen = set()
+
+    def end_source(self, key):
+        self.flush()
+        self.manifest["sources"][key]["rows"][1] = self.manifest["count"]
+
+    def commit(self):
+        self.flush()
+        for f in (self._vectors, self._chunks, self._offsets):
+            f.flush()
+            os.fsync(f.fileno())
+        tmp = os.path.join(self.index_dir, MANIFEST + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, os.path.join(self.index_dir, MANIFEST))
+
+    def close(self):
+        for f in (self._vectors, self._chunks, self._offsets):
+            f.close()
+
+
+def source_files(paths):
+    """
+    Map source key -> path for PDF files and directories of PDFs. Files in a
+    directory are keyed by their path relative to it ("guides/setup.pdf"),
+    single files by their name, so keys survive moving the folder.
+    """
+    files = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.lower().endswith(".pdf"):
+                        full = os.path.join(root, name)
+                        files[os.path.relpath(full, path).replace(os.sep, "/")] = full
+        else:
+            files[os.path.basename(path)] = path
+    return files
+
+
+def ingest(
+    paths, index_dir, embeddings=None, chunk_size=1000, chunk_overlap=100, batch_size=64, prune=True
+):
+    """
+    Stream PDFs (files or directories of PDFs) into the index at `index_dir`.
+    Files whose content hash is already indexed are skipped. With `prune`,
+    the index mirrors `paths`: rows of indexed files that are not part of
+    this run (deleted, renamed, or from an older index keyed by absolute
+    path) are tombstoned. Returns a report dict (files ingested/skipped/
+    removed, pages, chunks, elapsed seconds).
+    """
+    embeddings = embeddings or bedrock_embeddings()
+    start = time.perf_counter()
+    files = source_files(paths)
+
+    report = {"ingested": [], "skipped": [], "removed": [], "pages": 0, "chunks": 0, "elapsed": 0.0}
+    writer = IndexWriter(index_dir, embeddings, batch_size=batch_size)
+    try:
+        if prune:
+            report["removed"] = sorted(set(writer.manifest["sources"]) - set(files))
+            for key in report["removed"]:
+                writer.remove_source(key)
+            if report["removed"]:
+                writer.commit()
+        for key, path in files.items():
+            sha256 = file_sha256(path)
+            if writer.manifest["sources"].get(key, {}).get("sha256") == sha256:
+                report["skipped"].append(path)
+                continue
+            writer.begin_source(key, sha256)
+            rows_before = writer.manifest["count"]
+            for page_number, text in iter_pdf_pages(path):
+                report["pages"] += 1
+                for chunk in split_text(text, chunk_size, chunk_overlap):
+                    writer.add(chunk, key, page_number)
+            writer.end_source(key)
+            report["chunks"] += writer.manifest["count"] - rows_before
+            writer.commit()  # one durable checkpoint per file
+            report["ingested"].append(path)
+    finally:
+        writer.close()
+    report["elapsed"] = time.perf_counter() - start
+    return report
+
+
+class LocalVectorIndex:
+    """Read side of the index: cosine-similarity search in-process."""
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        self.manifest = _read_manifest(index_dir)
+        if self.manifest is None or not self.manifest["count"]:
+            raise FileNotFoundError(f"No local index in {index_dir}; run: python local_kb.py ingest")
+        count, dimension = self.manifest["count"], self.manifest["dimension"]
+        self.vectors = np.memmap(
+            os.path.join(index_dir, VECTORS), dtype=np.float32, mode="r", shape=(count, dimension)
+        )
+        self.offsets = np.fromfile(os.path.join(index_dir, OFFSETS), dtype=np.uint64, count=count)
+        self.ends = np.append(self.offsets[1:], np.uint64(self.manifest["chunks_bytes"]))
+        self.live = np.ones(count, dtype=bool)
+        for first, last in self.manifest["tombstones"]:
+            self.live[first:last] = False
+        # Slicing the map has no shared file position, unlike seek + readline
+        # on one handle, so concurrent searches cannot read each other's rows
+        with open(os.path.join(index_dir, CHUNKS), "rb") as f:
+            self._chunks = mmap.mmap(f.fileno(), self.manifest["chunks_bytes"], access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return int(self.live.sum())
+
+    def search(self, query_vector, k=4):
+        """Return [(score, {"text", "source", "page"})] for the top-k rows."""
+        query = normalize_rows(query_vector)
+        count = len(self.offsets)
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        for first in range(0, count, SEARCH_BLOCK_ROWS):
+            scores = self.vectors[first:first + SEARCH_BLOCK_ROWS] @ query
+            scores[~self.live[first:first + SEARCH_BLOCK_ROWS]] = -np.inf
+            top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+            best_scores = np.concatenate([best_scores, scores[top]])
+            best_rows = np.concatenate([best_rows, top + first])
+        order = np.argsort(-best_scores)[:k]
+        results = []
+        for i in order:
+            if not np.isfinite(best_scores[i]):
+                continue
+            row = best_rows[i]
+            line = self._chunks[int(self.offsets[row]):int(self.ends[row])]
+            results.append((float(best_scores[i]), json.loads(line)))
+        return results
+
+    def close(self):
+        self._chunks.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Knowledge Base index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_ingest = sub.add_parser("ingest", help="stream PDFs into the index")
+    p_ingest.add_argument("paths", nargs="+", help="PDF files or folders")
+    p_ingest.add_argument("--index", default="kb_index")
+    p_ingest.add_argument("--batch-size", type=int, default=64)
+    p_ingest.add_argument("--offline", action="store_true", help="use HashingEmbeddings instead of Bedrock")
+    p_ingest.add_argument(
+        "--keep-missing", action="store_true", help="keep the rows of indexed files not given this time"
+    )
+    p_query = sub.add_parser("query", help="search the index")
+    p_query.add_argument("text")
+    p_query.add_argument("--index", default="kb_index")
+    p_query.add_argument("-k", type=int, default=4)
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        embeddings = HashingEmbeddings() if args.offline else bedrock_embeddings()
+        report = ingest(
+            args.paths, args.index, embeddings, batch_size=args.batch_size, prune=not args.keep_missing
+        )
+        print(
+            f"Ingested {len(report['ingested'])} file(s) ({report['pages']} pages, "
+            f"{report['chunks']} chunks), skipped {len(report['skipped'])} unchanged, "
+            f"removed {len(report['removed'])} in {report['elapsed']:.2f}s"
+        )
+    else:
+        index = LocalVectorIndex(args.index)
+        embeddings = embeddings_for(index.manifest)
+        for score, chunk in index.search(embeddings.embed_query(args.text), args.k):
+            print(f"[{score:.3f}] {chunk['source']} p.{chunk['page']}: {chunk['text'][:120]!r}")
@@ -0,0 +1,144 @@
+# =============================================================================
+# LOCAL KNOWLEDGE BASE BENCHMARK (offline)
+# =============================================================================
+# Writes a large synthetic text PDF, then compares:
+#   1. a load-everything pipeline (all pages -> all chunks -> one embed call)
+#   2. the streaming pipeline of local_kb.ingest (page by page, batched)
+# on wall time and peak Python memory (tracemalloc, numpy included), and
+# measures in-process retrieval latency on the resulting index.
+# HashingEmbeddings is used, so no model or network is involved.
+# =============================================================================
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from local_kb import (
+    HashingEmbeddings,
+    LocalVectorIndex,
+    ingest,
+    iter_pdf_pages,
+    normalize_rows,
+    split_text,
+)
+
+WORDS = (
+    "amazon aws customers revenue growth cloud retail logistics delivery prime "
+    "advertising invest long term margin infrastructure region compute storage "
+    "machine learning model inference training chips graviton trainium bedrock "
+    "menu soup cheese onion dessert starter wine bread butter cream sugar"
+).split()
+
+
+def write_pdf(path, n_pages, lines_per_page=45, seed=0):
+    """Minimal multi-page PDF with Helvetica text, written incrementally."""
+    rng = random.Random(seed)
+    offsets = []
+
+    with open(path, "wb") as f:
+
+        def obj(number, body):
+            offsets.append((number, f.tell()))
+            f.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+        f.write(b"%PDF-1.4\n")
+        kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(n_pages))
+        obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {n_pages} >>".encode())
+        obj(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+        for i in range(n_pages):
+            lines = [" ".join(rng.choices(WORDS, k=12)) for _ in range(lines_per_page)]
+            text = " Tj T* ".join(f"({line})" for line in lines)
+            stream = f"BT /F1 9 Tf 11 TL 40 800 Td {text} Tj ET".encode()
+            obj(
+                4 + 2 * i,
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode(),
+            )
+            obj(5 + 2 * i, f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+
+        xref = f.tell()
+        offsets.sort()
+        f.write(f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode())
+        for _, offset in offsets:
+            f.write(f"{offset:010d} 00000 n \n".encode())
+        f.write(f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+
+
+def load_everything(path, embeddings):
+    """Baseline: materialise every page, chunk and vector before writing."""
+    pages = list(iter_pdf_pages(path))
+    chunks = [chunk for _, text in pages for chunk in split_text(text)]
+    vectors = normalize_rows(embeddings.embed_documents(chunks))
+    return len(chunks), vectors
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark local PDF ingestion and retrieval")
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="local-kb-")
+    try:
+        pdf = os.path.join(workdir, "large.pdf")
+        write_pdf(pdf, args.pages)
+        embeddings = HashingEmbeddings()
+
+        print("\n" + "=" * 80)
+        print(f"LOCAL KB BENCHMARK - {args.pages} pages, {os.path.getsize(pdf) / 1e6:.1f} MB PDF")
+        print("=" * 80 + "\n")
+
+        (n_chunks, _), elapsed, peak = measure(lambda: load_everything(pdf, embeddings))
+        print(f"{'pipeline':<28}{'chunks':>8}{'time':>10}{'peak memory':>14}")
+        print(f"{'load everything':<28}{n_chunks:>8}{elapsed:>9.2f}s{peak / 1e6:>11.1f} MB")
+
+        index_dir = os.path.join(workdir, "index")
+        report, elapsed, peak = measure(
+            lambda: ingest([pdf], index_dir, embeddings, batch_size=args.batch_size)
+        )
+        print(f"{'streaming (batch ' + str(args.batch_size) + ')':<28}{report['chunks']:>8}{elapsed:>9.2f}s{peak / 1e6:>11.1f} MB")
+
+        index = LocalVectorIndex(index_dir)
+        rng = random.Random(1)
+        queries = [" ".join(rng.choices(WORDS, k=6)) for _ in range(args.queries)]
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(embeddings.embed_query(query), k=4)
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        print(
+            f"\nIn-process retrieval over {len(index):,} chunks: "
+            f"p50 {statistics.median(latencies):.2f} ms, "
+            f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.2f} ms (embedding included)"
+        )
+        index.close()
+    finally:
+        shutil.rmtree(workdir)
+
+    print("\n" + "=" * 80)
+    print("BENCHMARK COMPLETED")
+    print("=" * 80 + "\n")
+
+
+# -----------------------------------------------------------------------------
+# Execution Instructions
+# -----------------------------------------------------------------------------
+# Run this file with: python local_kb_bench.py [--pages 300] [--batch-size 64]
@@ -0,0 +1,46 @@
+# =============================================================================
+# LOCAL KNOWLEDGE BASE RETRIEVER
+# =============================================================================
+# LangChain retriever over the on-disk index built by local_kb.py: a drop-in
+# alternative to AmazonKnowledgeBasesRetriever in get_retriever(). Retrieval
+# runs in-process, so a chat turn makes no Knowledge Base network call (only
+# the query embedding, unless the index was built offline).
+# =============================================================================
+
+from typing import Any, List
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+from local_kb import LocalVectorIndex, embeddings_for
+
+
+class LocalKBRetriever(BaseRetriever):
+    """Return the `k` chunks closest to the query as Documents."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: Any
+    embeddings: Any
+    k: int = 4
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        results = self.index.search(self.embeddings.embed_query(query), self.k)
+        return [
+            Document(
+                page_content=chunk["text"],
+                metadata={"source": chunk["source"], "page": chunk["page"], "score": score},
+            )
+            for score, chunk in results
+        ]
+
+
+def get_local_retriever(index_dir: str, k: int = 4, embeddings=None) -> LocalKBRetriever:
+    index = LocalVectorIndex(index_dir)
+    return LocalKBRetriever(
+        index=index, embeddings=embeddings or embeddings_for(index.manifest), k=k
+    )
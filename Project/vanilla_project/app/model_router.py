@@ -0,0 +1,194 @@
+# =============================================================================
+# MODEL ROUTER (chatbot)
+# =============================================================================
+# Picks the foundation model per question instead of sending everything to
+# Claude 3 Sonnet. Short, factual questions whose retrieved chunks match well
+# go to a small fast model; long questions, reasoning questions ("why",
+# "compare"...) and questions the Knowledge Base matches poorly go to the
+# large one. An answer that looks unsure ("I don't know") is retried on the
+# next larger model.
+#
+# The policy is DEFAULT_POLICY unless MODEL_ROUTING_POLICY points to a JSON
+# file with the same keys (missing keys keep their default, and "weights" is
+# merged key by key). A policy with a single route pins that model.
+# Per-route calls, latency, tokens and cost are kept in `stats`; report()
+# adds the savings against answering everything with the largest model.
+# =============================================================================
+
+import copy
+import json
+import os
+import re
+import threading
+import time
+
+# Prices are USD per 1,000 tokens (Bedrock on-demand list prices, check your region)
+DEFAULT_POLICY = {
+    "routes": [  # cheapest first
+        {
+            "name": "small",
+            "model_id": "anthropic.claude-3-haiku-20240307-v1:0",
+            "max_difficulty": 0.35,
+            "input_price": 0.00025,
+            "output_price": 0.00125,
+        },
+        {
+            "name": "large",
+            "model_id": "anthropic.claude-3-sonnet-20240229-v1:0",
+            "max_difficulty": 1.0,
+            "input_price": 0.003,
+            "output_price": 0.015,
+        },
+    ],
+    "weights": {"length": 0.3, "reasoning": 0.5, "retrieval": 0.6},
+    "long_question_words": 60,  # length signal saturates here
+    "reasoning_terms": [
+        "why", "how does", "explain", "compare", "difference", "versus", " vs ",
+        "analy", "impact", "trade-off", "evaluate", "summar", "strategy",
+    ],
+    "escalate_below": 0.5,  # answer confidence under which the next route is tried
+    "max_escalations": 1,
+}
+
+_UNSURE = re.compile(
+    r"\b(i don't know|i do not know|i'm not sure|i am not sure|cannot answer|can't answer"
+    r"|not (?:mentioned|provided) in the context|no (?:relevant )?information)\b",
+    re.IGNORECASE,
+)
+
+
+ROUTE_KEYS = ("name", "model_id", "max_difficulty", "input_price", "output_price")
+
+
+def load_policy(path=None):
+    """DEFAULT_POLICY overridden by a JSON file; nested dicts ("weights") are merged key by key."""
+    policy = copy.deepcopy(DEFAULT_POLICY)
+    path = path or os.getenv("MODEL_ROUTING_POLICY")
+    if path:
+        with open(path) as f:
+            for key, value in json.load(f).items():
+                if isinstance(value, dict) and isinstance(policy.get(key), dict):
+                    policy[key].update(value)
+                else:
+                    policy[key] = value
+    validate_policy(policy)
+    return policy
+
+
+def validate_policy(policy):
+    """Raise ValueError on a policy the router could not use."""
+    if not policy["routes"]:
+        raise ValueError("the routing policy needs at least one route")
+    for route in policy["routes"]:
+        missing = [key for key in ROUTE_KEYS if key not in route]
+        if missing:
+            raise ValueError(f"route {route.get('name', route)!r} is missing {', '.join(missing)}")
+    missing = [name for name in DEFAULT_POLICY["weights"] if name not in policy["weights"]]
+    if missing:
+        raise ValueError(f"the routing policy has no weight for {', '.join(missing)}")
+
+
+def estimate_tokens(text):  # ~4 characters per token
+    return max(1, len(text) // 4)
+
+
+def difficulty(question, retrieval_scores, policy):
+    """Weighted mean in [0, 1] of question length, reasoning terms and retrieval mismatch."""
+    lower = f" {question.lower()} "
+    signals = {
+        "length": min(len(question.split()) / policy["long_question_words"], 1.0),
+        "reasoning": min(sum(term in lower for term in policy["reasoning_terms"]) / 2, 1.0),
+    }
+    if retrieval_scores:
+        # best chunk similarity: a poor match needs the stronger model to cope
+        signals["retrieval"] = 1.0 - min(max(max(retrieval_scores), 0.0), 1.0)
+    weights = policy["weights"]
+    return sum(weights[name] * value for name, value in signals.items()) / sum(
+        weights[name] for name in signals
+    )
+
+
+def answer_confidence(answer):  # 0 (empty), 0.2 (unsure) or 1
+    if not answer.strip():
+        return 0.0
+    if _UNSURE.search(answer):
+        return 0.2
+    return 1.0
+
+
+class ModelRouter:
+    """
+    Usage:
+        router = ModelRouter()
+        answer = router.route(question, generate, retrieval_scores=[0.71, 0.64])
+
+    generate(route) answers on route["model_id"] and returns
+    (answer, input_tokens, output_tokens).
+    """
+
+    def __init__(self, policy=None):
+        self.policy = policy or load_policy()
+        self.order = [route["name"] for route in self.policy["routes"]]
+        self.routes = {route["name"]: route for route in self.policy["routes"]}
+        self._lock = threading.Lock()
+        self.stats = {
+            name: {"requests": 0, "calls": 0, "escalated": 0, "seconds": 0.0,
+                   "input_tokens": 0, "output_tokens": 0, "cost": 0.0}
+            for name in self.order
+        }
+        self.largest_only_cost = 0.0
+
+    def cost(self, route, input_tokens, output_tokens):
+        return (input_tokens * route["input_price"] + output_tokens * route["output_price"]) / 1000
+
+    def choose(self, question, retrieval_scores=None):
+        score = difficulty(question, retrieval_scores, self.policy)
+        for name in self.order:
+            if score <= self.routes[name]["max_difficulty"]:
+                return name
+        return self.order[-1]
+
+    def route(self, question, generate, retrieval_scores=None):
+        name = self.choose(question, retrieval_scores)
+        with self._lock:
+            self.stats[name]["requests"] += 1
+
+        for attempt in range(self.policy["max_escalations"] + 1):
+            route = self.routes[name]
+            start = time.perf_counter()
+            answer, input_tokens, output_tokens = generate(route)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self.stats[name]
+                stats["calls"] += 1
+                stats["seconds"] += elapsed
+                stats["input_tokens"] += input_tokens
+                stats["output_tokens"] += output_tokens
+                stats["cost"] += self.cost(route, input_tokens, output_tokens)
+
+            position = self.order.index(name)
+            if position + 1 == len(self.order) or answer_confidence(answer) >= self.policy["escalate_below"]:
+                break
+            if attempt < self.policy["max_escalations"]:
+                with self._lock:
+                    self.stats[name]["escalated"] += 1
+                name = self.order[position + 1]
+
+        with self._lock:
+            # the largest model would have read and written about as many tokens
+            self.largest_only_cost += self.cost(self.routes[self.order[-1]], input_tokens, output_tokens)
+        return answer
+
+    def report(self):
+        with self._lock:
+            routes = {
+                name: dict(s, avg_latency_ms=s["seconds"] / s["calls"] * 1000 if s["calls"] else 0.0)
+                for name, s in self.stats.items()
+            }
+            cost = sum(s["cost"] for s in routes.values())
+            return {
+                "routes": routes,
+                "cost": cost,
+                "largest_only_cost": self.largest_only_cost,
+                "cost_saved": self.largest_only_cost - cost,
+            }
@@ -0,0 +1,142 @@
+# =============================================================================
+# MODEL ROUTING DEMO (offline)
+# =============================================================================
+# Asks a mix of easy and hard questions through get_rag_chat_response with a
+# stand-in retriever and stand-in answer chains (no Bedrock or Knowledge Base
+# needed), first with the default routing policy, then with every question
+# on the large model. Prints calls, escalations, latency, tokens and cost per
+# route and the measured savings.
+#
+# The stand-in models sleep like real ones (fixed latency + per output token)
+# and the small one says "I don't know" when a question is too hard for it,
+# which exercises escalation.
+# =============================================================================
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+import model_router
+import rag_chatbot_lib as glib
+
+# Per model: (seconds before the first token, seconds per output token, capability)
+STAND_IN_PROFILES = {
+    "anthropic.claude-3-haiku-20240307-v1:0": (0.05, 0.0005, 0.30),
+    "anthropic.claude-3-sonnet-20240229-v1:0": (0.20, 0.0020, 1.00),
+}
+
+EASY = [
+    ("Who wrote the shareholder letter?", 0.82),
+    ("When was the letter published?", 0.77),
+    ("What is Amazon Prime?", 0.74),
+    ("How many employees does Amazon have?", 0.71),
+    ("What does the letter say about Graviton chips?", 0.45),  # borderline: may escalate
+]
+
+HARD = [
+    ("Why did Amazon keep investing in AWS when retail margins were shrinking?", 0.58),
+    ("Compare the long-term strategy for AWS with the strategy for advertising", 0.55),
+    ("What is the difference between the approach to Graviton and Trainium chips, and how does it impact costs?", 0.49),
+    ("What did the letter say about the soup on the menu?", 0.21),  # barely in the documents
+]
+
+
+class StandInRetriever:
+    def __init__(self, scores):
+        self.scores = scores
+
+    def invoke(self, question):
+        best = self.scores[question]
+        return [
+            SimpleNamespace(page_content="lorem ipsum " * 100, metadata={"score": best - 0.05 * i})
+            for i in range(glib.NUMBER_OF_RESULTS)
+        ]
+
+
+class StandInAnswerChain:
+    def __init__(self, model_id, difficulty_of, rng):
+        self.first_token, self.per_token, self.capability = STAND_IN_PROFILES[model_id]
+        self.difficulty_of = difficulty_of
+        self.rng = rng
+
+    def invoke(self, inputs):
+        output_tokens = self.rng.randint(40, 120)
+        time.sleep(self.first_token + self.per_token * output_tokens)
+        if self.difficulty_of(inputs["input"]) > self.capability:
+            return "I don't know."
+        return "word " * output_tokens
+
+
+def ask_all(router, questions, scores, seed=0):
+    rng = random.Random(seed)
+    policy = router.policy
+
+    def difficulty_of(question):  # the router's estimate, give or take a bit
+        return model_router.difficulty(question, [scores[question]], policy) + rng.uniform(-0.1, 0.1)
+
+    chains = {}
+    glib.model_router = router
+    glib.get_rag_retriever = lambda: StandInRetriever(scores)
+    glib.get_answer_chain = lambda model_id: chains.setdefault(
+        model_id, StandInAnswerChain(model_id, difficulty_of, rng)
+    )
+
+    start = time.perf_counter()
+    answers = [glib.get_rag_chat_response(question, memory=None) for question in questions]
+    unsure = sum(model_router.answer_confidence(a) < policy["escalate_below"] for a in answers)
+    return time.perf_counter() - start, unsure
+
+
+def print_report(router, elapsed, unsure, n):
+    r = router.report()
+    print(f"{'route':<8}{'model':<42}{'requests':>9}{'calls':>7}{'escalated':>11}{'avg latency':>13}{'cost':>11}")
+    for name, s in r["routes"].items():
+        print(
+            f"{name:<8}{router.routes[name]['model_id']:<42}{s['requests']:>9}{s['calls']:>7}"
+            f"{s['escalated']:>11}{s['avg_latency_ms']:>10.0f} ms{'$' + format(s['cost'], '.4f'):>11}"
+        )
+    print(f"Total ${r['cost']:.4f}, {elapsed / n * 1000:.0f} ms per question, {unsure} unsure final answers\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline demo of model routing in the RAG chatbot")
+    parser.add_argument("--questions", type=int, default=60)
+    parser.add_argument("--hard-share", type=float, default=0.3)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    scores = dict(EASY + HARD)
+    questions = [
+        rng.choice(HARD if rng.random() < args.hard_share else EASY)[0] for _ in range(args.questions)
+    ]
+
+    print("\n" + "=" * 80)
+    print(f"CHATBOT MODEL ROUTING DEMO - {args.questions} questions, {args.hard_share:.0%} hard")
+    print("=" * 80 + "\n")
+
+    routed = model_router.ModelRouter(model_router.load_policy())
+    elapsed, unsure = ask_all(routed, questions, scores)
+    print("--- Routed (default policy) ---")
+    print_report(routed, elapsed, unsure, len(questions))
+
+    policy = model_router.load_policy()
+    large_only = model_router.ModelRouter(dict(policy, routes=policy["routes"][-1:]))
+    elapsed_large, unsure_large = ask_all(large_only, questions, scores)
+    print("--- Everything on the large model ---")
+    print_report(large_only, elapsed_large, unsure_large, len(questions))
+
+    print(
+        f"Routing saved {1 - routed.report()['cost'] / large_only.report()['cost']:.0%} of the token cost "
+        f"and {1 - elapsed / elapsed_large:.0%} of the mean answer latency"
+    )
+
+    print("\n" + "=" * 80)
+    print("DEMO COMPLETED")
+    print("=" * 80 + "\n")
+
+
+# -----------------------------------------------------------------------------
+# Execution Instructions
+# -----------------------------------------------------------------------------
+# Run this file with: python model_router_demo.py [--questions 60] [--hard-share 0.3]
@@ -1,13 +1,18 @@
-from langchain.memory import ConversationBufferWindowMemory
-from langchain_community.chat_models import BedrockChat
-from langchain_community.retrievers import AmazonKnowledgeBasesRetriever
-from langchain_core.prompts import ChatPromptTemplate
-from langchain.chains import create_retrieval_chain
-from langchain.chains.combine_documents import create_stuff_documents_chain
+# LangChain is imported inside the functions that need it, so importing this
+# module (and drawing the Streamlit page) does not wait for the whole stack.
 import os
+from functools import lru_cache
 
+from model_router import ModelRouter, estimate_tokens
+from single_flight import SingleFlight
 
-def get_llm():
+MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0"  # default foundation model (see model_router)
+KNOWLEDGE_BASE_ID = "J9ILKVUWWO"  # 👈 Set your Knowledge base ID
+NUMBER_OF_RESULTS = 4  # retrieved chunks per question
+
+
+def get_llm(model_id=MODEL_ID):
+    from langchain_community.chat_models import BedrockChat
 
     model_kwargs = {  # anthropic
         "max_tokens": 512,
@@ -18,7 +23,7 @@ def get_llm():
     }
 
     llm = BedrockChat(
-        model_id="anthropic.claude-3-sonnet-20240229-v1:0",  # set the foundation model
+        model_id=model_id,  # set the foundation model
         model_kwargs=model_kwargs,  # configure the inference parameters
         credentials_profile_name="<default_profile>",
     )
@@ -26,12 +31,26 @@ def get_llm():
     return llm
 
 
+@lru_cache(maxsize=1)
+def local_kb_index():  # LOCAL_KB_INDEX, read once so the retriever in use and retrieval_key() agree
+    return os.getenv("LOCAL_KB_INDEX")
+
+
 def get_retriever():  # creates and returns an in-memory vector store to be used in the application
 
+    # Local on-disk index (built with app/local_kb.py): in-process retrieval
+    index_dir = local_kb_index()
+    if index_dir:
+        from local_kb_retriever import get_local_retriever
+
+        return get_local_retriever(index_dir, k=NUMBER_OF_RESULTS)
+
+    from langchain_community.retrievers import AmazonKnowledgeBasesRetriever
+
     # Amazon Bedrock - KnowledgeBase Retriever
     retriever = AmazonKnowledgeBasesRetriever(
-        knowledge_base_id="J9ILKVUWWO",  # 👈 Set your Knowledge base ID
-        retrieval_config={"vectorSearchConfiguration": {"numberOfResults": 4}},
+        knowledge_base_id=KNOWLEDGE_BASE_ID,  # 👈 Set your Knowledge base ID (top of file)
+        retrieval_config={"vectorSearchConfiguration": {"numberOfResults": NUMBER_OF_RESULTS}},
         credentials_profile_name="<default_profile>",
     )
 
@@ -39,6 +58,7 @@ def get_retriever():  # creates and returns an in-memory vector store to be used
 
 
 def get_memory():  # create memory for this chat session
+    from langchain.memory import ConversationBufferWindowMemory
 
     memory = ConversationBufferWindowMemory(
         memory_key="chat_history", return_messages=True
@@ -47,27 +67,67 @@ def get_memory():  # create memory for this chat session
     return memory
 
 
-def get_rag_chat_response(input_text, memory):  # chat client function
+SYSTEM_PROMPT = (
+    "Use the given context to answer the question. "
+    "If you don't know the answer, say you don't know. "
+    "Use three sentence maximum and keep the answer concise. "
+    "Context: {context}"
+)
 
-    llm = get_llm()
 
-    retriever = get_retriever()
+@lru_cache(maxsize=1)
+def get_rag_retriever():  # built on first use, then reused across requests and Streamlit reruns
+    return get_retriever()
+
+
+@lru_cache(maxsize=None)
+def get_answer_chain(model_id):  # one (LLM + prompt) chain per routed model, built on first use
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain.chains.combine_documents import create_stuff_documents_chain
 
-    system_prompt = (
-        "Use the given context to answer the question. "
-        "If you don't know the answer, say you don't know. "
-        "Use three sentence maximum and keep the answer concise. "
-        "Context: {context}"
-    )
     prompt = ChatPromptTemplate.from_messages(
         [
-            ("system", system_prompt),
+            ("system", SYSTEM_PROMPT),
             ("human", "{input}"),
         ]
     )
-    question_answer_chain = create_stuff_documents_chain(llm, prompt)
-    chain = create_retrieval_chain(retriever, question_answer_chain)
+    return create_stuff_documents_chain(get_llm(model_id), prompt)
+
+
+# Easy questions go to a small fast model and hard ones to the large model,
+# with unsure answers retried on the large model; see model_router.stats.
+model_router = ModelRouter()
 
-    chat_response = chain.invoke({"input": input_text})
 
-    return chat_response["answer"]
+def answer_question(input_text):  # retrieval once, then generation on the routed model
+    docs = get_rag_retriever().invoke(input_text)
+    scores = [doc.metadata["score"] for doc in docs if doc.metadata.get("score") is not None]
+    prompt_tokens = estimate_tokens(SYSTEM_PROMPT + input_text + "".join(doc.page_content for doc in docs))
+
+    def generate(route):
+        answer = get_answer_chain(route["model_id"]).invoke({"input": input_text, "context": docs})
+        return answer, prompt_tokens, estimate_tokens(answer)
+
+    return model_router.route(input_text, generate, retrieval_scores=scores)
+
+
+# Identical questions in flight at the same time (e.g. a popular question from
+# many sessions) share one retrieval + generation; see rag_flight.stats.
+rag_flight = SingleFlight()
+
+
+def normalize_question(text):  # "What is AWS?  " and "what is  aws" share a key
+    return " ".join(text.lower().split()).rstrip("?!. ")
+
+
+def retrieval_key():  # everything besides the question that shapes the answer
+    models = tuple(route["model_id"] for route in model_router.policy["routes"])
+    return (models, local_kb_index() or KNOWLEDGE_BASE_ID, NUMBER_OF_RESULTS)
+
+
+def get_rag_chat_response(input_text, memory):  # chat client function
+
+    return rag_flight.do(
+        (normalize_question(input_text), retrieval_key()),
+        lambda: answer_question(input_text),
+    )
@@ -0,0 +1,76 @@
+# =============================================================================
+# SINGLE-FLIGHT REQUEST COALESCING
+# =============================================================================
+# When the same question arrives from many sessions at once, only the first
+# caller (the leader) runs the retrieval + generation; concurrent callers with
+# the same key wait for it and share its result, or its exception. Nothing is
+# cached: once the call completes, the next request runs again.
+#
+# Streamlit serves every session from a thread of the same process, so a
+# module-level SingleFlight coalesces across all sessions.
+# =============================================================================
+
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Usage:
+        flight = SingleFlight()
+        answer = flight.do(key, lambda: expensive(question))
+
+    stats: calls (requests received), executions (upstream calls made),
+    coalesced (upstream calls saved), errors (failed executions),
+    max_waiters (largest number of callers sharing one execution).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0, "max_waiters": 0}
+
+    def do(self, key, fn):
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats["coalesced"] += 1
+                self.stats["max_waiters"] = max(self.stats["max_waiters"], call.waiters)
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.stats["executions"] += 1
+                leader = True
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                with self._lock:
+                    self.stats["errors"] += 1
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,100 @@
+# =============================================================================
+# REQUEST COALESCING DEMO (offline)
+# =============================================================================
+# Simulates a burst of chat sessions asking a few popular questions at the
+# same time, through get_rag_chat_response, with a stand-in chain that takes
+# `latency` seconds per call (no Bedrock or Knowledge Base needed). Prints how
+# many upstream calls were made and saved, then shows that an upstream error
+# reaches every waiter.
+# =============================================================================
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import rag_chatbot_lib as glib
+
+
+class StandInChain:
+    """Counts invocations; sleeps like a retrieval + generation round trip."""
+
+    def __init__(self, latency, fail=False):
+        self.latency = latency
+        self.fail = fail
+        self.invocations = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, inputs):
+        with self._lock:
+            self.invocations += 1
+        time.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError("ThrottlingException: Too many requests")
+        return {"answer": f"Answer to: {inputs['input']}"}
+
+
+QUESTIONS = [
+    "What did Amazon say about AWS growth?",
+    "what did amazon say about   AWS growth",
+    "What is Amazon's long-term strategy?",
+    "Who wrote the shareholder letter?",
+]
+
+
+def burst(sessions, latency, seed=0):
+    chain = StandInChain(latency)
+    # stand-in instead of Bedrock + Knowledge Base
+    glib.answer_question = lambda question: chain.invoke({"input": question})["answer"]
+    rng = random.Random(seed)
+    questions = [rng.choice(QUESTIONS) for _ in range(sessions)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        answers = list(pool.map(lambda q: glib.get_rag_chat_response(q, memory=None), questions))
+    return chain.invocations, len(answers), time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Demo of single-flight coalescing")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds per upstream call")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 80)
+    print(f"REQUEST COALESCING DEMO - {args.sessions} concurrent sessions, {args.latency:.1f}s upstream")
+    print("=" * 80 + "\n")
+
+    invocations, answered, elapsed = burst(args.sessions, args.latency)
+    print(f"Answered {answered} requests in {elapsed:.2f}s with {invocations} upstream calls")
+    print(f"Counters: {glib.rag_flight.stats}\n")
+
+    # An upstream failure is delivered to every coalesced caller
+    failing = StandInChain(args.latency, fail=True)
+    glib.answer_question = lambda question: failing.invoke({"input": question})["answer"]
+    errors = []
+
+    def ask():
+        try:
+            glib.get_rag_chat_response("Who wrote the shareholder letter?", memory=None)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=ask) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(f"Failing upstream: {failing.invocations} call, {len(errors)} callers got the error ({errors[0]})")
+    print(f"Counters: {glib.rag_flight.stats}")
+
+    print("\n" + "=" * 80)
+    print("DEMO COMPLETED")
+    print("=" * 80 + "\n")
+
+
+# -----------------------------------------------------------------------------
+# Execution Instructions
+# -----------------------------------------------------------------------------
+# Run this file with: python single_flight_demo.py [--sessions 200]
@@ -0,0 +1,362 @@
+# =============================================================================
+# KNOWLEDGE BASE DOCUMENT SYNC
+# =============================================================================
+# `upload_pdf_to_s3` in main.ipynb uploads one PDF at a time, and any change
+# means re-syncing the whole Knowledge Base. This module syncs a whole docs
+# directory instead:
+#   - every local file is hashed (SHA-256, stored as object metadata) and only
+#     new or changed files are uploaded; unchanged ones are skipped
+#   - changed files are uploaded in parallel, large ones as multipart transfers
+#   - a Knowledge Base ingestion job is started only when something changed
+#
+# The boto3 clients are passed in, so the whole flow can be exercised offline
+# with the stand-ins at the bottom (see doc_sync_bench.py).
+#
+# Run it with:
+#   python doc_sync.py docs --bucket <bucket> [--kb-id <id> --data-source-id <id>]
+# =============================================================================
+
+import argparse
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+HASH_METADATA_KEY = "sha256"  # stored as x-amz-meta-sha256
+DEFAULT_EXTENSIONS = (".pdf",)
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+
+
+# -----------------------------------------------------------------------------
+# Local side
+# -----------------------------------------------------------------------------
+def hash_file(path, chunk_size=1024 * 1024):
+    """Return (sha256, md5) hex digests of a file, read in one pass."""
+    sha256 = hashlib.sha256()
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+            md5.update(chunk)
+    return sha256.hexdigest(), md5.hexdigest()
+
+
+def has_extension(name, extensions=DEFAULT_EXTENSIONS):
+    """True if a file name or S3 key ends with one of `extensions` (any name when empty)."""
+    return not extensions or name.lower().endswith(tuple(e.lower() for e in extensions))
+
+
+def list_local_files(folder, prefix="", extensions=DEFAULT_EXTENSIONS):
+    """Map S3 key -> local path for every matching file under `folder`."""
+    files = {}
+    for root, _, names in os.walk(folder):
+        for name in names:
+            if not has_extension(name, extensions):
+                continue
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, folder).replace(os.sep, "/")
+            files[prefix + relative] = path
+    return files
+
+
+# -----------------------------------------------------------------------------
+# Remote side
+# -----------------------------------------------------------------------------
+def list_remote_objects(s3_client, bucket_name, prefix=""):
+    """Map key -> {"size", "etag"} for every object under `prefix`."""
+    objects = {}
+    kwargs = {"Bucket": bucket_name, "Prefix": prefix}
+    while True:
+        response = s3_client.list_objects_v2(**kwargs)
+        for obj in response.get("Contents", []):
+            objects[obj["Key"]] = {"size": obj["Size"], "etag": obj["ETag"].strip('"')}
+        if not response.get("IsTruncated"):
+            return objects
+        kwargs["ContinuationToken"] = response["NextContinuationToken"]
+
+
+def is_unchanged(s3_client, bucket_name, key, size, sha256, md5, remote):
+    """
+    Compare a local file with its stored object. A size mismatch is decided
+    from the listing alone; otherwise the stored SHA-256 metadata is checked,
+    falling back to the ETag (the MD5 of single-part uploads) for objects
+    uploaded without it, e.g. by upload_pdf_to_s3.
+    """
+    if remote is None or remote["size"] != size:
+        return False
+    metadata = s3_client.head_object(Bucket=bucket_name, Key=key).get("Metadata", {})
+    if HASH_METADATA_KEY in metadata:
+        return metadata[HASH_METADATA_KEY] == sha256
+    return remote["etag"] == md5
+
+
+def default_transfer_config(max_concurrency=4):
+    """Multipart settings for boto3's managed transfers (upload_file)."""
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=MULTIPART_CHUNKSIZE,
+        max_concurrency=max_concurrency,
+    )
+
+
+def delete_objects(s3_client, bucket_name, keys):
+    """Delete keys in batches of 1000 (the DeleteObjects limit)."""
+    keys = sorted(keys)
+    for i in range(0, len(keys), 1000):
+        s3_client.delete_objects(
+            Bucket=bucket_name,
+            Delete={"Objects": [{"Key": key} for key in keys[i:i + 1000]], "Quiet": True},
+        )
+
+
+# -----------------------------------------------------------------------------
+# Sync
+# -----------------------------------------------------------------------------
+def sync_docs(
+    s3_client,
+    bucket_name,
+    folder,
+    prefix="",
+    bedrock_agent_client=None,
+    knowledge_base_id=None,
+    data_source_id=None,
+    extensions=DEFAULT_EXTENSIONS,
+    max_workers=8,
+    transfer_config=None,
+    delete_removed=False,
+):
+    """
+    Upload new and changed files from `folder` to `bucket_name/prefix` in
+    parallel, then start a Knowledge Base ingestion job if anything changed.
+
+    :param bedrock_agent_client: boto3 "bedrock-agent" client; with
+        knowledge_base_id and data_source_id, used to start the ingestion job
+    :param max_workers: files hashed, compared and uploaded concurrently
+    :param transfer_config: boto3 TransferConfig (multipart settings);
+        defaults to default_transfer_config()
+    :param delete_removed: also delete objects with no local file. Only
+        objects matching `extensions` are candidates, so other objects under
+        the prefix are never touched. Nothing is deleted when no local
+        file matches (an empty or wrong folder must not wipe the bucket)
+    :return: a report dict (uploaded, skipped, deleted and failed keys,
+        bytes_uploaded, elapsed seconds, ingestion_job_id)
+    :raises NotADirectoryError: if `folder` is not a directory
+    """
+    start = time.perf_counter()
+    if not os.path.isdir(folder):
+        raise NotADirectoryError(f"{folder} is not a directory")
+    if transfer_config is None:
+        transfer_config = default_transfer_config()
+
+    local_files = list_local_files(folder, prefix, extensions)
+    remote_objects = list_remote_objects(s3_client, bucket_name, prefix)
+
+    report = {
+        "uploaded": [],
+        "skipped": [],
+        "deleted": [],
+        "failed": {},
+        "bytes_uploaded": 0,
+        "elapsed": 0.0,
+        "ingestion_job_id": None,
+    }
+    lock = threading.Lock()
+
+    def sync_file(key, path):
+        try:
+            size = os.path.getsize(path)
+            sha256, md5 = hash_file(path)
+            if is_unchanged(
+                s3_client, bucket_name, key, size, sha256, md5, remote_objects.get(key)
+            ):
+                with lock:
+                    report["skipped"].append(key)
+                return
+            s3_client.upload_file(
+                path,
+                bucket_name,
+                key,
+                ExtraArgs={
+                    "Metadata": {HASH_METADATA_KEY: sha256},
+                    "ContentType": "application/pdf" if key.lower().endswith(".pdf") else "binary/octet-stream",
+                },
+                Config=transfer_config,
+            )
+            with lock:
+                report["uploaded"].append(key)
+                report["bytes_uploaded"] += size
+        except Exception as e:
+            logger.error("Failed to sync %s: %s", key, e)
+            with lock:
+                report["failed"][key] = repr(e)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for key, path in local_files.items():
+            pool.submit(sync_file, key, path)
+
+    if delete_removed and not local_files:
+        logger.warning("No local file matches %s in %s: nothing deleted", extensions, folder)
+    elif delete_removed:
+        synced = {key for key in remote_objects if has_extension(key, extensions)}
+        removed = synced - set(local_files)
+        if removed:
+            delete_objects(s3_client, bucket_name, removed)
+            report["deleted"] = sorted(removed)
+
+    changed = report["uploaded"] or report["deleted"]
+    if changed and bedrock_agent_client is not None and knowledge_base_id and data_source_id:
+        response = bedrock_agent_client.start_ingestion_job(
+            knowledgeBaseId=knowledge_base_id,
+            dataSourceId=data_source_id,
+            clientToken=str(uuid.uuid4()),
+        )
+        report["ingestion_job_id"] = response["ingestionJob"]["ingestionJobId"]
+    elif not changed:
+        logger.info("Knowledge Base source is up to date, no ingestion job started")
+
+    report["uploaded"].sort()
+    report["skipped"].sort()
+    report["elapsed"] = time.perf_counter() - start
+    return report
+
+
+def print_report(report):
+    print(
+        f"Uploaded {len(report['uploaded'])} file(s) "
+        f"({report['bytes_uploaded'] / 1e6:.1f} MB), skipped {len(report['skipped'])} "
+        f"unchanged, deleted {len(report['deleted'])}, failed {len(report['failed'])} "
+        f"in {report['elapsed']:.2f}s"
+    )
+    for key, error in report["failed"].items():
+        print(f"  failed: {key}: {error}")
+    if report["ingestion_job_id"]:
+        print(f"Started ingestion job {report['ingestion_job_id']}")
+
+
+# -----------------------------------------------------------------------------
+# Local stand-ins (offline testing and benchmarks)
+# -----------------------------------------------------------------------------
+class LocalS3:
+    """
+    In-memory S3 stand-in: list_objects_v2 (paginated), head_object,
+    upload_file, delete_objects. Each request costs `latency` seconds and each
+    connection moves `bandwidth` bytes/s; uploads above the Config multipart
+    threshold are split into parts sent `max_concurrency` at a time.
+    """
+
+    def __init__(self, latency=0.0, bandwidth=None, page_size=1000):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.page_size = page_size
+        self.objects = {}  # key -> {"Body", "ETag", "Metadata"}
+        self.requests = {"list": 0, "head": 0, "put": 0, "delete": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, kind):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def list_objects_v2(self, Bucket, Prefix="", ContinuationToken=None, **kwargs):
+        time.sleep(self.latency)
+        self._count("list")
+        keys = sorted(k for k in self.objects if k.startswith(Prefix))
+        offset = int(ContinuationToken or 0)
+        page = keys[offset:offset + self.page_size]
+        response = {
+            "Contents": [
+                {"Key": k, "Size": len(self.objects[k]["Body"]), "ETag": f'"{self.objects[k]["ETag"]}"'}
+                for k in page
+            ],
+            "IsTruncated": offset + self.page_size < len(keys),
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(offset + self.page_size)
+        return response
+
+    def head_object(self, Bucket, Key):
+        time.sleep(self.latency)
+        self._count("head")
+        obj = self.objects[Key]
+        return {"ContentLength": len(obj["Body"]), "ETag": obj["ETag"], "Metadata": obj["Metadata"]}
+
+    def upload_file(self, Filename, Bucket, Key, ExtraArgs=None, Config=None):
+        with open(Filename, "rb") as f:
+            body = f.read()
+        threshold = getattr(Config, "multipart_threshold", MULTIPART_THRESHOLD)
+        chunk = getattr(Config, "multipart_chunksize", MULTIPART_CHUNKSIZE)
+        concurrency = getattr(Config, "max_concurrency", 1)
+        parts = 1 if len(body) < threshold else -(-len(body) // chunk)
+        rounds = -(-parts // concurrency)
+        transfer = len(body) / (self.bandwidth * min(parts, concurrency)) if self.bandwidth else 0.0
+        # single PUT, or create + part rounds + complete for multipart
+        time.sleep(self.latency * (1 if parts == 1 else rounds + 2) + transfer)
+        self._count("put")
+        etag = hashlib.md5(body).hexdigest() if parts == 1 else f"{uuid.uuid4().hex}-{parts}"
+        with self._lock:
+            self.objects[Key] = {
+                "Body": body,
+                "ETag": etag,
+                "Metadata": dict((ExtraArgs or {}).get("Metadata", {})),
+            }
+
+    def delete_objects(self, Bucket, Delete):
+        time.sleep(self.latency)
+        self._count("delete")
+        with self._lock:
+            for obj in Delete["Objects"]:
+                self.objects.pop(obj["Key"], None)
+        return {}
+
+
+class LocalBedrockAgent:
+    """In-memory bedrock-agent stand-in recording start_ingestion_job calls."""
+
+    def __init__(self):
+        self.ingestion_jobs = []
+
+    def start_ingestion_job(self, knowledgeBaseId, dataSourceId, clientToken=None, **kwargs):
+        job_id = uuid.uuid4().hex[:10].upper()
+        self.ingestion_jobs.append((knowledgeBaseId, dataSourceId, job_id))
+        return {"ingestionJob": {"ingestionJobId": job_id, "status": "STARTING"}}
+
+
+if __name__ == "__main__":
+    import boto3
+
+    parser = argparse.ArgumentParser(description="Sync a docs folder to the Knowledge Base bucket")
+    parser.add_argument("folder", help="local docs folder (e.g. docs)")
+    parser.add_argument("--bucket", required=True)
+    parser.add_argument("--prefix", default="")
+    parser.add_argument("--kb-id", help="Knowledge Base id (starts an ingestion job on change)")
+    parser.add_argument("--data-source-id")
+    parser.add_argument("--region", default="us-east-1")
+    parser.add_argument("--profile", default=None)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--delete", action="store_true", help="delete PDFs under the prefix with no local file"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    session = boto3.Session(profile_name=args.profile, region_name=args.region)
+    print_report(
+        sync_docs(
+            session.client("s3"),
+            args.bucket,
+            args.folder,
+            prefix=args.prefix,
+            bedrock_agent_client=session.client("bedrock-agent") if args.kb_id else None,
+            knowledge_base_id=args.kb_id,
+            data_source_id=args.data_source_id,
+            max_workers=args.workers,
+            delete_removed=args.delete,
+        )
+    )
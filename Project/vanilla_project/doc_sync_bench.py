@@ -0,0 +1,154 @@
+# =============================================================================
+# DOCUMENT SYNC BENCHMARK (offline)
+# =============================================================================
+# Generates a folder of synthetic PDFs and syncs it to the in-memory S3
+# stand-in (LocalS3, with per-request latency and per-connection bandwidth):
+#   1. serial upload of every file, one PUT at a time (upload_pdf_to_s3)
+#   2. first sync of an empty bucket (parallel + multipart)
+#   3. re-sync with nothing changed (no upload, no ingestion job)
+#   4. re-sync after editing a few files
+#   5. sync of the bucket filled by (1), whose objects carry no hash metadata
+#      (single-part objects are matched by ETag; multipart ones re-upload once)
+#
+# files/s counts every file checked (uploaded or skipped).
+# =============================================================================
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from types import SimpleNamespace
+
+from doc_sync import (
+    MULTIPART_CHUNKSIZE,
+    MULTIPART_THRESHOLD,
+    LocalBedrockAgent,
+    LocalS3,
+    list_local_files,
+    sync_docs,
+)
+
+BUCKET = "kb-docs"
+
+
+def make_corpus(folder, n_files, large_fraction, seed=0):
+    """Small PDFs (20-600 KB) plus a fraction of 12 MB ones (multipart)."""
+    rng = random.Random(seed)
+    total = 0
+    for i in range(n_files):
+        if rng.random() < large_fraction:
+            size = 12 * 1024 * 1024
+        else:
+            size = rng.randint(20_000, 600_000)
+        subdir = os.path.join(folder, f"batch{i % 10}")
+        os.makedirs(subdir, exist_ok=True)
+        with open(os.path.join(subdir, f"doc{i:05d}.pdf"), "wb") as f:
+            f.write(b"%PDF-1.4\n" + rng.getrandbits(8 * size).to_bytes(size, "little"))
+        total += size
+    return total
+
+
+def edit_files(folder, fraction, seed=1):
+    rng = random.Random(seed)
+    paths = sorted(list_local_files(folder).values())
+    edited = rng.sample(paths, max(1, int(len(paths) * fraction)))
+    for path in edited:
+        with open(path, "ab") as f:
+            f.write(b"\n% revised\n")
+    return len(edited)
+
+
+def serial_upload(s3, folder):
+    """The notebook's approach: one upload_file per file, no multipart tuning."""
+    start = time.perf_counter()
+    for key, path in sorted(list_local_files(folder).items()):
+        s3.upload_file(path, BUCKET, key)
+    return time.perf_counter() - start
+
+
+def row(name, n_uploaded, n_skipped, n_bytes, elapsed, jobs):
+    print(
+        f"{name:<34}{n_uploaded:>9}{n_skipped:>9}{elapsed:>9.2f}s"
+        f"{(n_uploaded + n_skipped) / elapsed:>10.1f}{n_bytes / 1e6 / elapsed:>10.1f}{jobs:>6}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Knowledge Base document sync")
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--large-fraction", type=float, default=0.02)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per S3 request")
+    parser.add_argument("--bandwidth", type=float, default=50.0, help="MB/s per connection")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--edit-fraction", type=float, default=0.05)
+    args = parser.parse_args()
+
+    # Same multipart settings as default_transfer_config(), without boto3
+    config = SimpleNamespace(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=MULTIPART_CHUNKSIZE,
+        max_concurrency=4,
+    )
+
+    def new_s3():
+        return LocalS3(latency=args.latency, bandwidth=args.bandwidth * 1e6)
+
+    folder = tempfile.mkdtemp(prefix="kb-docs-")
+    try:
+        total = make_corpus(folder, args.files, args.large_fraction)
+
+        print("\n" + "=" * 90)
+        print(
+            f"DOCUMENT SYNC BENCHMARK - {args.files} PDFs, {total / 1e6:.0f} MB, "
+            f"{args.latency * 1000:.0f} ms/request, {args.bandwidth:.0f} MB/s per connection"
+        )
+        print("=" * 90 + "\n")
+        print(f"{'scenario':<34}{'uploaded':>9}{'skipped':>9}{'time':>10}{'files/s':>10}{'up MB/s':>10}{'jobs':>6}")
+
+        serial_s3 = new_s3()
+        elapsed = serial_upload(serial_s3, folder)
+        row("1. serial upload (notebook)", args.files, 0, total, elapsed, 0)
+
+        s3, agent = new_s3(), LocalBedrockAgent()
+
+        def sync(name, target):
+            jobs = len(agent.ingestion_jobs)
+            r = sync_docs(
+                target,
+                BUCKET,
+                folder,
+                bedrock_agent_client=agent,
+                knowledge_base_id="KB123",
+                data_source_id="DS123",
+                max_workers=args.workers,
+                transfer_config=config,
+            )
+            row(
+                name,
+                len(r["uploaded"]),
+                len(r["skipped"]),
+                r["bytes_uploaded"],
+                r["elapsed"],
+                len(agent.ingestion_jobs) - jobs,
+            )
+
+        sync("2. first sync (empty bucket)", s3)
+        sync("3. re-sync, nothing changed", s3)
+        n_edited = edit_files(folder, args.edit_fraction)
+        sync(f"4. re-sync, {n_edited} files edited", s3)
+        sync("5. sync of a pre-existing bucket", serial_s3)
+        print(f"\nS3 requests for the first sync + 2 re-syncs: {s3.requests}")
+    finally:
+        shutil.rmtree(folder)
+
+    print("\n" + "=" * 90)
+    print("BENCHMARK COMPLETED")
+    print("=" * 90 + "\n")
+
+
+# -----------------------------------------------------------------------------
+# Execution Instructions
+# -----------------------------------------------------------------------------
+# Run this file with: python doc_sync_bench.py [--files 300] [--workers 16]
@@ -0,0 +1,93 @@
+# =============================================================================
+# DOC SYNC TESTS (offline, against the LocalS3 stand-in)
+# =============================================================================
+# Run with: python -m pytest Project/vanilla_project/tests
+# =============================================================================
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from doc_sync import LocalS3, sync_docs  # noqa: E402
+
+BUCKET = "kb-docs"
+TRANSFER = SimpleNamespace(multipart_threshold=1 << 30, multipart_chunksize=1 << 30, max_concurrency=1)
+
+
+def put(s3, key, body=b"data", metadata=None):
+    s3.objects[key] = {"Body": body, "ETag": "etag", "Metadata": metadata or {}}
+
+
+def write(folder, name, body=b"%PDF-1.4\n"):
+    path = os.path.join(folder, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(body)
+
+
+def test_delete_removed_only_deletes_synced_extensions(tmp_path):
+    write(str(tmp_path), "kept.pdf")
+    s3 = LocalS3()
+    put(s3, "gone.pdf")
+    put(s3, "GONE-TOO.PDF")
+    put(s3, "notes.txt")
+    put(s3, "images/diagram.png")
+    put(s3, "index.html")
+
+    report = sync_docs(s3, BUCKET, str(tmp_path), transfer_config=TRANSFER, delete_removed=True)
+
+    assert report["deleted"] == ["GONE-TOO.PDF", "gone.pdf"]
+    assert sorted(s3.objects) == ["images/diagram.png", "index.html", "kept.pdf", "notes.txt"]
+
+
+def test_delete_removed_stays_under_prefix(tmp_path):
+    write(str(tmp_path), "a.pdf")
+    s3 = LocalS3()
+    put(s3, "kb/old.pdf")
+    put(s3, "kb/readme.md")
+    put(s3, "other/old.pdf")
+
+    report = sync_docs(
+        s3, BUCKET, str(tmp_path), prefix="kb/", transfer_config=TRANSFER, delete_removed=True
+    )
+
+    assert report["uploaded"] == ["kb/a.pdf"]
+    assert report["deleted"] == ["kb/old.pdf"]
+    assert sorted(s3.objects) == ["kb/a.pdf", "kb/readme.md", "other/old.pdf"]
+
+
+def test_without_delete_nothing_is_removed(tmp_path):
+    write(str(tmp_path), "a.pdf")
+    s3 = LocalS3()
+    put(s3, "old.pdf")
+
+    report = sync_docs(s3, BUCKET, str(tmp_path), transfer_config=TRANSFER)
+
+    assert report["deleted"] == []
+    assert "old.pdf" in s3.objects
+
+
+def test_missing_folder_raises_and_deletes_nothing(tmp_path):
+    s3 = LocalS3()
+    put(s3, "a.pdf")
+
+    with pytest.raises(NotADirectoryError):
+        sync_docs(s3, BUCKET, str(tmp_path / "typo"), transfer_config=TRANSFER, delete_removed=True)
+
+    assert "a.pdf" in s3.objects
+
+
+def test_no_matching_local_files_deletes_nothing(tmp_path):
+    write(str(tmp_path), "notes.txt", b"not a pdf")
+    s3 = LocalS3()
+    put(s3, "a.pdf")
+    put(s3, "b.pdf")
+
+    report = sync_docs(s3, BUCKET, str(tmp_path), transfer_config=TRANSFER, delete_removed=True)
+
+    assert report["deleted"] == []
+    assert sorted(s3.objects) == ["a.pdf", "b.pdf"]
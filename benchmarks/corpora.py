@@ -0,0 +1,131 @@
+# =============================================================================
+# SYNTHETIC CORPORA
+# =============================================================================
+# Deterministic (seeded) inputs for the benchmarks, generated at any scale
+# with no download. Word frequencies follow a Zipf-like distribution so that
+# texts, duplicates and keyword hits look roughly like real documents.
+# =============================================================================
+
+import random
+from typing import Dict, List, Tuple
+
+VOCABULARY_SIZE = 5000
+
+_TOPICS = [
+    "python", "machine", "learning", "neural", "network", "transformer", "retrieval",
+    "generation", "embedding", "vector", "database", "fine", "tuning", "agent",
+    "bedrock", "lambda", "sagemaker", "inference", "token", "prompt",
+]
+
+
+def vocabulary(size: int = VOCABULARY_SIZE) -> List[str]:
+    return _TOPICS + [f"w{i:04d}" for i in range(size - len(_TOPICS))]
+
+
+def _word_sampler(rng: random.Random, words: List[str]):
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    cumulative = []
+    total = 0.0
+    for w in weights:
+        total += w
+        cumulative.append(total)
+
+    def sample(k: int) -> List[str]:
+        return rng.choices(words, cum_weights=cumulative, k=k)
+
+    return sample
+
+
+def documents(n: int, seed: int = 0) -> List[Dict]:
+    """n retriever documents: {"id", "text"} with 8-24 words each."""
+    rng = random.Random(seed)
+    sample = _word_sampler(rng, vocabulary())
+    return [{"id": i, "text": " ".join(sample(rng.randint(8, 24))) + "."} for i in range(n)]
+
+
+def queries(n: int, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    sample = _word_sampler(rng, vocabulary())
+    return [" ".join(sample(rng.randint(3, 8))) + "?" for _ in range(n)]
+
+
+def evaluation_pairs(n: int, n_docs: int = 100_000, k: int = 10, seed: int = 2) -> List[Tuple[List[int], List[int]]]:
+    """n (retrieved_ids, relevant_ids) pairs: k retrieved, 1-5 relevant."""
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(n):
+        relevant = rng.sample(range(n_docs), rng.randint(1, 5))
+        retrieved = rng.sample(range(n_docs), k - 2) + relevant[:2]
+        rng.shuffle(retrieved)
+        pairs.append((retrieved, relevant))
+    return pairs
+
+
+def markdown_documents(n_paragraphs: int, paragraphs_per_doc: int = 20, duplicate_rate: float = 0.05, seed: int = 3) -> List[str]:
+    """
+    Markdown documents totalling n_paragraphs paragraphs (headers, prose, code
+    fences). About `duplicate_rate` of the paragraphs repeat earlier ones, to
+    exercise the dedup step of split_documents_optimized.
+    """
+    rng = random.Random(seed)
+    sample = _word_sampler(rng, vocabulary())
+    docs, current, seen = [], [], []
+    for i in range(n_paragraphs):
+        if seen and rng.random() < duplicate_rate:
+            paragraph = rng.choice(seen)
+        elif i % paragraphs_per_doc == 0:
+            paragraph = "## " + " ".join(sample(4))
+        elif rng.random() < 0.1:
+            paragraph = "```\n" + " ".join(sample(8)) + "\n```"
+        else:
+            paragraph = " ".join(sample(rng.randint(30, 90))) + "."
+        current.append(paragraph)
+        if len(seen) < 1000:
+            seen.append(paragraph)
+        if len(current) == paragraphs_per_doc:
+            docs.append("\n\n".join(current))
+            current = []
+    if current:
+        docs.append("\n\n".join(current))
+    return docs
+
+
+def tool_inputs(n: int, unique: int = None, seed: int = 4) -> List[str]:
+    """n short texts for the agent tools; only `unique` distinct ones if given."""
+    rng = random.Random(seed)
+    sample = _word_sampler(rng, vocabulary())
+    distinct = [" ".join(sample(rng.randint(5, 40))) + "." for _ in range(min(n, unique or n))]
+    if unique is None or unique >= n:
+        return distinct
+    return [rng.choice(distinct) for _ in range(n)]
+
+
+def lambda_events(n: int, n_sessions: int, seed: int = 5) -> List[Dict]:
+    """Bedrock Agent action-group events for the order Lambda, mixed functions."""
+    rng = random.Random(seed)
+    events = []
+    for _ in range(n):
+        session = f"session-{rng.randrange(n_sessions):06d}"
+        function = rng.choices(
+            ["get_phone_number", "place_order", "get_all_orders", "compute_bill", "send_notification_sms"],
+            weights=[1, 4, 2, 2, 1],
+        )[0]
+        if function == "get_phone_number":
+            parameters = [{"name": "phone_number", "value": f"+3361{rng.randrange(10**7):07d}"}]
+        elif function == "place_order":
+            parameters = [{"name": "dish", "value": rng.choice(_TOPICS)}, {"name": "quantity", "value": str(rng.randint(1, 4))}]
+        elif function == "compute_bill":
+            parameters = [{"name": "list_of_prices", "value": str([rng.randint(5, 40) for _ in range(rng.randint(1, 6))])}]
+        else:
+            parameters = []
+        events.append(
+            {
+                "actionGroup": "orders",
+                "function": function,
+                "parameters": parameters,
+                "sessionId": session,
+                "sessionAttributes": {},
+                "promptSessionAttributes": {},
+            }
+        )
+    return events
@@ -0,0 +1,180 @@
+# =============================================================================
+# REPOSITORY BENCHMARK SUITE
+# =============================================================================
+# Runs the micro/macro benchmarks of suites.py on synthetic corpora at
+# several scales (10k, 100k, 1M items by default), writes the results to a
+# machine-readable JSON file and, given a baseline file, reports regressions.
+#
+# Each benchmark is run `--repeat` times after its (untimed) setup and the
+# best time is kept. At 1M only one run is made.
+# =============================================================================
+
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from suites import BENCHMARKS, Skip  # noqa: E402
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+
+def parse_scales(value):
+    scales = []
+    for label in value.lower().split(","):
+        label = label.strip()
+        if label not in SCALES:
+            raise argparse.ArgumentTypeError(f"unknown scale {label!r} (choose from {', '.join(SCALES)})")
+        scales.append(label)
+    return scales
+
+
+def run_one(name, n, repeat):
+    try:
+        run, ops = BENCHMARKS[name](n)
+    except Skip as e:
+        return {"n": n, "skipped": str(e)}
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        "n": n,
+        "ops": ops,
+        "seconds": round(best, 6),
+        "ops_per_sec": round(ops / best, 1) if best > 0 else None,
+        "runs": len(times),
+    }
+
+
+def compare(results, baseline, tolerance, slack):
+    """
+    Return (key, baseline ops/s, current ops/s, change) for every regression:
+    ops/s down by more than `tolerance` and the run slower by more than
+    `slack` seconds (millisecond-long runs are too noisy to judge on ratio).
+    """
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get("results", {}).get(key, {})
+        if not result.get("ops_per_sec") or not before.get("ops_per_sec"):
+            continue
+        change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        slower_by = result["seconds"] - result["ops"] / before["ops_per_sec"]
+        if change < -tolerance and slower_by > slack:
+            regressions.append((key, before["ops_per_sec"], result["ops_per_sec"], change))
+    return regressions
+
+
+def print_table(results, baseline=None):
+    print(f"{'benchmark':<40}{'scale':>8}{'ops':>10}{'time':>11}{'ops/s':>14}{'vs base':>10}")
+    print("-" * 93)
+    for key, result in results.items():
+        name, scale = key.rsplit("@", 1)
+        if "skipped" in result:
+            print(f"{name:<40}{scale:>8}   skipped: {result['skipped']}")
+            continue
+        change = ""
+        before = (baseline or {}).get("results", {}).get(key, {})
+        if before.get("ops_per_sec"):
+            change = f"{result['ops_per_sec'] / before['ops_per_sec'] - 1:+.0%}"
+        print(
+            f"{name:<40}{scale:>8}{result['ops']:>10,}{result['seconds']:>10.3f}s"
+            f"{result['ops_per_sec']:>14,.0f}{change:>10}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the repository benchmarks on synthetic corpora")
+    parser.add_argument("--scales", type=parse_scales, default=["10k", "100k"],
+                        help="comma-separated scales: 10k,100k,1m (default: 10k,100k)")
+    parser.add_argument("--only", action="append", default=[],
+                        help="glob on benchmark names, e.g. 'retriever.*' (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="results.json", help="where to write the results")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--save-baseline", metavar="PATH", help="also write the results to PATH")
+    parser.add_argument("--tolerance", type=float, default=0.20,
+                        help="allowed ops/s drop before a result counts as a regression")
+    parser.add_argument("--slack-ms", type=float, default=10.0,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        sys.exit(0)
+
+    names = [
+        name for name in BENCHMARKS
+        if not args.only or any(fnmatch.fnmatch(name, pattern) for pattern in args.only)
+    ]
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print("\n" + "=" * 93)
+    print(f"BENCHMARKS - {len(names)} benchmarks at {', '.join(args.scales)}")
+    print("=" * 93 + "\n")
+
+    results = {}
+    for scale in args.scales:
+        n = SCALES[scale]
+        repeat = 1 if n >= 1_000_000 else args.repeat
+        for name in names:
+            print(f"  running {name}@{scale}...", end="\r", flush=True)
+            results[f"{name}@{scale}"] = run_one(name, n, repeat)
+    print(" " * 93, end="\r")
+
+    print_table(results, baseline)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scales": args.scales,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {path}")
+
+    exit_code = 0
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance, args.slack_ms / 1000)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for key, before, after, change in regressions:
+                print(f"  {key}: {before:,.0f} -> {after:,.0f} ops/s ({change:+.0%})")
+            exit_code = 1
+        else:
+            print(f"\nNo regression beyond {args.tolerance:.0%} against {args.baseline}")
+
+    print("\n" + "=" * 93)
+    print("BENCHMARKS COMPLETED")
+    print("=" * 93 + "\n")
+    sys.exit(exit_code)
+
+
+# -----------------------------------------------------------------------------
+# Execution Instructions
+# -----------------------------------------------------------------------------
+# Run this file with: python benchmarks/run_benchmarks.py [--scales 10k,100k,1m]
+#   Save a baseline:  python benchmarks/run_benchmarks.py --save-baseline baseline.json
+#   Compare:          python benchmarks/run_benchmarks.py --baseline baseline.json
@@ -0,0 +1,167 @@
+# =============================================================================
+# CODE UNDER TEST
+# =============================================================================
+# Much of the hot-path code lives in notebooks (SimpleRetriever, the
+# precision/recall metrics, split_documents_optimized) or in scripts that run
+# an agent at import time (the @tool functions). Rather than copying it, the
+# benchmarks extract the named top-level definitions from those files with
+# `ast` and execute only them, so they always measure the code as committed.
+#
+# Model-backed dependencies are replaced by deterministic offline stand-ins
+# (HashEncoder for SentenceTransformer, WhitespaceTokenizer for AutoTokenizer,
+# LocalTable for the DynamoDB table), so no network or model download is needed.
+# =============================================================================
+
+import ast
+import importlib
+import json
+import os
+import sys
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable
+
+import numpy as np
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _silent_print(*args, **kwargs):
+    pass
+
+
+def _extract(source: str, names: Iterable[str], filename: str, strip_decorators: bool) -> ast.Module:
+    names = set(names)
+    tree = ast.parse(source, filename=filename)
+    body = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and node.name in names:
+            if strip_decorators:
+                node.decorator_list = []
+            body.append(node)
+            names.discard(node.name)
+        elif (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and node.targets[0].id in names
+        ):
+            body.append(node)  # module-level constants such as MARKDOWN_SEPARATORS
+            names.discard(node.targets[0].id)
+    if names:
+        raise LookupError(f"{', '.join(sorted(names))} not found in {filename}")
+    return ast.Module(body=body, type_ignores=[])
+
+
+def load_definitions(
+    path: str,
+    names: Iterable[str],
+    namespace: Dict[str, Any],
+    strip_decorators: bool = True,
+) -> Dict[str, Any]:
+    """
+    Execute the top-level functions, classes or constants `names` from a .py
+    or .ipynb file (repo-relative) in `namespace`, which provides the globals
+    they use.
+    Decorators such as @tool are dropped so the plain function is measured.
+    """
+    full_path = os.path.join(REPO, path)
+    with open(full_path, encoding="utf-8") as f:
+        if path.endswith(".ipynb"):
+            cells = [
+                "".join(cell["source"])
+                for cell in json.load(f)["cells"]
+                if cell["cell_type"] == "code"
+            ]
+            # drop shell and magic lines ("!pip install ...", "%matplotlib ...")
+            source = "\n\n".join(
+                "\n".join(line for line in cell.splitlines() if not line.lstrip().startswith(("!", "%")))
+                for cell in cells
+            )
+        else:
+            source = f.read()
+
+    module = _extract(source, names, full_path, strip_decorators)
+    namespace = {"__name__": f"bench_{os.path.basename(path)}", "print": _silent_print, **namespace}
+    exec(compile(module, full_path, "exec"), namespace)
+    return namespace
+
+
+def import_module(directory: str, name: str):
+    """Import a module from a repo directory (added to sys.path)."""
+    path = os.path.join(REPO, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(name)
+
+
+@contextmanager
+def default_env(**values: str):
+    """Set the environment variables that are not already set, for the block only."""
+    added = [key for key in values if key not in os.environ]
+    os.environ.update({key: values[key] for key in added})
+    try:
+        yield
+    finally:
+        for key in added:
+            os.environ.pop(key, None)
+
+
+# -----------------------------------------------------------------------------
+# Offline stand-ins
+# -----------------------------------------------------------------------------
+class HashEncoder:
+    """
+    SentenceTransformer stand-in: every text maps to a fixed pseudo-random
+    vector chosen by its CRC-32. encode() cost is a checksum + a row gather,
+    so the benchmark measures the retriever's own indexing/search work. The
+    checksum (unlike hash(), salted per process) keeps the vectors, and so
+    the rankings, identical across runs and against a baseline.
+    """
+
+    TABLE_ROWS = 4096
+
+    def __init__(self, model_name: str = "stand-in", dimension: int = 64):
+        self.table = np.random.default_rng(0).standard_normal((self.TABLE_ROWS, dimension)).astype(np.float32)
+
+    def encode(self, texts, convert_to_numpy: bool = True, **kwargs):
+        if isinstance(texts, str):
+            return self.table[zlib.crc32(texts.encode()) % self.TABLE_ROWS]
+        rows = np.fromiter(
+            (zlib.crc32(t.encode()) % self.TABLE_ROWS for t in texts), dtype=np.int64, count=len(texts)
+        )
+        return self.table[rows]
+
+
+class WhitespaceTokenizer:
+    """AutoTokenizer stand-in: whitespace tokens, no download."""
+
+    @classmethod
+    def from_pretrained(cls, name: str, **kwargs):
+        return cls()
+
+    def tokenize(self, text: str, **kwargs):
+        return text.split()
+
+    def encode(self, text: str, **kwargs):
+        return list(range(len(text.split())))
+
+
+class LocalTable:
+    """DynamoDB Table stand-in for the action Lambda: get_item, put_item, update_item."""
+
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key):
+        item = self.items.get(Key["sessionId"])
+        return {"Item": item} if item is not None else {}
+
+    def put_item(self, Item, ConditionExpression=None):
+        self.items[Item["sessionId"]] = dict(Item)
+        return {}
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues):
+        item = self.items.setdefault(Key["sessionId"], {"sessionId": Key["sessionId"]})
+        item["orders"] = ExpressionAttributeValues[":orders"]
+        return {}
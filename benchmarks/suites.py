@@ -0,0 +1,293 @@
+# =============================================================================
+# BENCHMARK DEFINITIONS
+# =============================================================================
+# Each benchmark is a setup function taking the scale `n` and returning
+# (run, ops): `run()` is the timed callable and `ops` the number of
+# operations it performs (documents indexed, calls made...). Setup work
+# (corpus generation, imports, index building) is not timed. A setup raises
+# Skip when an optional dependency of the code under test is missing.
+# =============================================================================
+
+import importlib
+import json
+import os
+import random
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+import corpora
+from sources import HashEncoder, LocalTable, WhitespaceTokenizer, default_env, import_module, load_definitions
+
+BENCHMARKS: Dict[str, Callable[[int], Tuple[Callable[[], object], int]]] = {}
+
+RETRIEVE_QUERIES = 20  # queries per retrieval run, whatever the index size
+
+
+class Skip(Exception):
+    """The benchmark cannot run here (reason in the message)."""
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _require(module: str) -> None:
+    try:
+        importlib.import_module(module)
+    except ImportError:
+        raise Skip(f"{module} is not installed")
+
+
+# -----------------------------------------------------------------------------
+# day_1_rag: SimpleRetriever and the evaluation metrics (4_rag_evaluation.ipynb)
+# -----------------------------------------------------------------------------
+def _simple_retriever():
+    namespace = load_definitions(
+        "day_1_rag/4_rag_evaluation.ipynb",
+        ["SimpleRetriever"],
+        {"np": np, "List": List, "Dict": Dict, "SentenceTransformer": HashEncoder},
+    )
+    return namespace["SimpleRetriever"]
+
+
+@benchmark("retriever.index")
+def retriever_index(n):
+    SimpleRetriever = _simple_retriever()
+    docs = corpora.documents(n)
+    return lambda: SimpleRetriever().index(docs), n
+
+
+@benchmark("retriever.retrieve")
+def retriever_retrieve(n):
+    retriever = _simple_retriever()()
+    retriever.index(corpora.documents(n))
+    queries = corpora.queries(RETRIEVE_QUERIES)
+
+    def run():
+        for query in queries:
+            retriever.retrieve(query, k=5)
+
+    return run, len(queries)
+
+
+@benchmark("eval.precision_recall")
+def eval_precision_recall(n):
+    namespace = load_definitions(
+        "day_1_rag/4_rag_evaluation.ipynb", ["precision_at_k", "recall_at_k"], {"List": List}
+    )
+    precision_at_k, recall_at_k = namespace["precision_at_k"], namespace["recall_at_k"]
+    pairs = corpora.evaluation_pairs(n)
+
+    def run():
+        for retrieved, relevant in pairs:
+            precision_at_k(retrieved, relevant, k=5)
+            recall_at_k(retrieved, relevant, k=5)
+
+    return run, n
+
+
+# -----------------------------------------------------------------------------
+# day_1_rag: split_documents_optimized (2_advanced_rag.ipynb)
+# -----------------------------------------------------------------------------
+@benchmark("chunking.split_documents_optimized")
+def chunking(n):
+    """n = paragraphs across all documents (~20 per document)."""
+    _require("langchain_text_splitters")
+    from langchain_core.documents import Document
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    class TokenSplitter(RecursiveCharacterTextSplitter):
+        # from_huggingface_tokenizer insists on a transformers tokenizer; this
+        # builds the same splitter (length = number of tokens) on the stand-in
+        @classmethod
+        def from_huggingface_tokenizer(cls, tokenizer, **kwargs):
+            return cls(length_function=lambda text: len(tokenizer.tokenize(text)), **kwargs)
+
+    namespace = load_definitions(
+        "day_1_rag/2_advanced_rag.ipynb",
+        ["MARKDOWN_SEPARATORS", "split_documents_optimized"],
+        {
+            "List": List,
+            "Document": Document,
+            "RecursiveCharacterTextSplitter": TokenSplitter,
+            "AutoTokenizer": WhitespaceTokenizer,
+        },
+    )
+    split = namespace["split_documents_optimized"]
+    docs = [
+        Document(page_content=text, metadata={"source": f"doc{i}"})
+        for i, text in enumerate(corpora.markdown_documents(n))
+    ]
+    return lambda: split(docs, chunk_size=512), n
+
+
+# -----------------------------------------------------------------------------
+# day_5_agent: @tool functions (plain and memoized)
+# -----------------------------------------------------------------------------
+def _tool(path, name):
+    namespace = load_definitions(
+        path, [name], {"json": json, "random": random, "datetime": datetime}
+    )
+    return namespace[name]
+
+
+@benchmark("tools.letter_counter")
+def tools_letter_counter(n):
+    letter_counter = _tool("day_5_agent/2-strandAgentBasic.py", "letter_counter")
+    words = [text.split()[0] for text in corpora.tool_inputs(n)]
+
+    def run():
+        for word in words:
+            letter_counter(word, "w")
+
+    return run, n
+
+
+@benchmark("tools.text_analyzer")
+def tools_text_analyzer(n):
+    text_analyzer = _tool("day_5_agent/5-strandAgentObs.py", "text_analyzer")
+    texts = corpora.tool_inputs(n)
+
+    def run():
+        for text in texts:
+            text_analyzer(text)
+
+    return run, n
+
+
+@benchmark("tools.text_analyzer.memoized")
+def tools_text_analyzer_memoized(n):
+    """
+    Repeated inputs (1,000 distinct texts) through tool_cache.memoize: the
+    lookup overhead, compared with tools.text_analyzer.
+    """
+    tool_cache = import_module("day_5_agent", "tool_cache")
+    text_analyzer = _tool("day_5_agent/5-strandAgentObs.py", "text_analyzer")
+    texts = corpora.tool_inputs(n, unique=1000)
+    tool_cache.unregister("bench_text_analyzer")
+    cached = tool_cache.memoize(maxsize=4096, name="bench_text_analyzer")(text_analyzer)
+
+    def run():
+        cached.cache.clear()
+        for text in texts:
+            cached(text)
+
+    return run, n
+
+
+@benchmark("tools.web_search")
+def tools_web_search(n):
+    web_search = _tool("day_5_agent/5-strandAgentObs.py", "web_search")
+    queries = corpora.queries(n)
+
+    def run():
+        for query in queries:
+            web_search(query)
+
+    return run, n
+
+
+@benchmark("tools.get_weather")
+def tools_get_weather(n):
+    get_weather = _tool("day_5_agent/3-strandAgentAsTools.py", "get_weather")
+    random.seed(0)
+
+    def run():
+        for i in range(n):
+            get_weather(f"City {i % 500}")
+
+    return run, n
+
+
+# -----------------------------------------------------------------------------
+# day_5_agent: AWSLabMCPServer (n students, n // 1000 extra use cases)
+# -----------------------------------------------------------------------------
+def _lab(n):
+    server = import_module("day_5_agent", "aws_lab_mcp_server")
+    synthetic_data = import_module("day_5_agent", "aws_lab_bench").synthetic_data
+    n_use_cases = max(10, n // 1000)
+    return server.AWSLabMCPServer, synthetic_data(n, n_use_cases), n_use_cases
+
+
+@benchmark("lab.build")
+def lab_build(n):
+    AWSLabMCPServer, data, _ = _lab(n)
+    return lambda: AWSLabMCPServer(data), n
+
+
+@benchmark("lab.get_lab_config")
+def lab_get_lab_config(n):
+    AWSLabMCPServer, data, _ = _lab(n)
+    lab = AWSLabMCPServer(data)
+    rng = random.Random(0)
+    # 10% unknown ids exercise the error path
+    ids = [f"STU{rng.randrange(int(n * 1.1)):06d}" for _ in range(n)]
+
+    def run():
+        for student_id in ids:
+            lab.get_lab_config(student_id)
+
+    return run, n
+
+
+@benchmark("lab.get_service_recommendations")
+def lab_get_service_recommendations(n):
+    AWSLabMCPServer, data, n_use_cases = _lab(n)
+    lab = AWSLabMCPServer(data)
+    rng = random.Random(0)
+    queries = [
+        f"I need help with usecase{rng.randrange(n_use_cases):05d} for my project"
+        if rng.random() < 0.8
+        else "How do I build a rag chatbot with fine tuning?"
+        for _ in range(n)
+    ]
+
+    def run():
+        for query in queries:
+            lab.get_service_recommendations(query)
+
+    return run, n
+
+
+@benchmark("lab.estimate_cost")
+def lab_estimate_cost(n):
+    AWSLabMCPServer, data, _ = _lab(n)
+    lab = AWSLabMCPServer(data)
+    rng = random.Random(0)
+    services = list(data["service_prices"]) + ["Unknown"]
+    requests = [(rng.sample(services, 4), rng.choice([720, 360, 24])) for _ in range(n)]
+
+    def run():
+        for service_list, hours in requests:
+            lab.estimate_cost(service_list, hours)
+
+    return run, n
+
+
+# -----------------------------------------------------------------------------
+# day_4_agent_opti: action Lambda dispatch (n events over n // 10 sessions)
+# -----------------------------------------------------------------------------
+@benchmark("lambda.dispatch")
+def lambda_dispatch(n):
+    _require("boto3")
+    # boto3 clients are created at import time: give them a region, for the
+    # import only. The outbox path sends notifications to the in-memory queue
+    with default_env(AWS_DEFAULT_REGION="us-east-1"):
+        handler_module = import_module("day_4_agent_opti/lambda", "lambda_function")
+    handler_module.outbox_queue_url = "https://sqs.us-east-1.amazonaws.com/000000000000/bench-outbox"
+    LocalQueue = import_module("day_4_agent_opti/lambda", "notification_outbox").LocalQueue
+    events = corpora.lambda_events(n, max(1, n // 10))
+
+    def run():
+        handler_module.table = LocalTable()
+        handler_module.sqs_client = LocalQueue()
+        for event in events:
+            handler_module.lambda_handler(event, None)
+
+    return run, n
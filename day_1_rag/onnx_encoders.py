@@ -0,0 +1,352 @@
+# =============================================================================
+# QUANTIZED ONNX ENCODERS (CPU)
+# =============================================================================
+# Optional CPU backend for the day 1 encoders: the bi-encoders
+# (all-MiniLM-L6-v2, BAAI/bge-small-en-v1.5) and the
+# cross-encoder/ms-marco-MiniLM-L-12-v2 reranker.
+#
+# export (needs torch, sentence-transformers, onnx, onnxruntime):
+#   the transformer inside the SentenceTransformer / CrossEncoder is exported
+#   to ONNX with dynamic batch and sequence axes, its attention and layer-norm
+#   subgraphs are fused by the onnxruntime transformer optimizer, and an int8
+#   copy is made with dynamic quantization (int8 weights, activations
+#   quantized on the fly, no calibration data needed). Pooling, normalisation,
+#   score activation and max sequence length go to encoder_config.json.
+#
+# serve (needs only onnxruntime, tokenizers and numpy, no torch):
+#   OnnxBiEncoder.encode and OnnxCrossEncoder.predict mirror
+#   SentenceTransformer.encode and CrossEncoder.predict, so they drop into
+#   SimpleRetriever or the reranking pipeline.
+#   - texts are tokenized once, sorted by length and batched, so each batch
+#     is padded only to its own longest text, rounded up to a multiple of 8
+#     (a handful of shapes instead of one per batch)
+#   - batches are capped in tokens as well as in texts, so a batch of long
+#     texts does not blow up the attention matrices
+#   - the session runs one intra-op thread per available core, sequentially,
+#     with every graph optimisation enabled (ONNX_ENCODER_THREADS overrides)
+#
+#   python onnx_encoders.py export all-MiniLM-L6-v2 onnx/all-MiniLM-L6-v2
+#   python onnx_encoders.py export cross-encoder/ms-marco-MiniLM-L-12-v2 onnx/ms-marco --kind cross
+#
+#   encoder = load_encoder("onnx/all-MiniLM-L6-v2")  # int8 by default
+#   embeddings = encoder.encode(["What is RAG?", "Vector databases"])
+# =============================================================================
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+CONFIG_FILE = "encoder_config.json"
+TOKENIZER_FILE = "tokenizer.json"
+FP32_FILE = "model_fp32.onnx"
+INT8_FILE = "model_int8.onnx"
+
+PAD_MULTIPLE = 8  # batches are padded to a multiple of this many tokens
+
+
+# -----------------------------------------------------------------------------
+# Export
+# -----------------------------------------------------------------------------
+def export(
+    model_name: str,
+    out_dir: str,
+    kind: str = "bi",
+    max_seq_length: Optional[int] = None,
+    opset: int = 17,
+    optimize: bool = True,
+    per_channel: bool = True,
+) -> Dict:
+    """
+    Export `model_name` (kind "bi" for a SentenceTransformer, "cross" for a
+    CrossEncoder) to `out_dir`: fp32 and int8 ONNX graphs, tokenizer.json and
+    encoder_config.json. Returns the config.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    if kind == "bi":
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(model_name, device="cpu")
+        transformer, tokenizer = model[0].auto_model, model.tokenizer
+        pooling = model[1]
+        if pooling.pooling_mode_cls_token:
+            pooling_mode = "cls"
+        elif pooling.pooling_mode_mean_tokens:
+            pooling_mode = "mean"
+        else:
+            raise ValueError(f"{model_name}: only CLS and mean pooling are supported")
+        config = {
+            "pooling": pooling_mode,
+            "normalize": any(type(module).__name__ == "Normalize" for module in model),
+            "dimension": model.get_sentence_embedding_dimension(),
+            "max_seq_length": max_seq_length or model.max_seq_length,
+        }
+        sample = tokenizer(["A sample sentence to trace the graph."], return_tensors="pt")
+        output_names = ["last_hidden_state"]
+        output_axes = {0: "batch", 1: "sequence"}
+    elif kind == "cross":
+        from sentence_transformers import CrossEncoder
+
+        model = CrossEncoder(model_name, device="cpu")
+        transformer, tokenizer = model.model, model.tokenizer
+        # attribute name differs across sentence-transformers versions
+        activation = getattr(model, "activation_fn", None) or getattr(model, "activation_fct", None)
+        config = {
+            "activation": "sigmoid" if isinstance(activation, torch.nn.Sigmoid) else "identity",
+            "max_seq_length": max_seq_length or model.max_length or tokenizer.model_max_length,
+        }
+        sample = tokenizer(["A sample query"], ["A sample passage to trace the graph."], return_tensors="pt")
+        output_names = ["logits"]
+        output_axes = {0: "batch"}
+    else:
+        raise ValueError(f"kind must be 'bi' or 'cross', not {kind!r}")
+
+    if not getattr(tokenizer, "is_fast", False):
+        raise ValueError(f"{model_name}: a fast (Rust) tokenizer is required")
+
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    config.update(
+        kind=kind,
+        model_name=model_name,
+        inputs=input_names,
+        pad_token_id=tokenizer.pad_token_id or 0,
+    )
+
+    fp32_path = os.path.join(out_dir, FP32_FILE)
+    transformer.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            ({name: sample[name] for name in input_names},),
+            fp32_path,
+            input_names=input_names,
+            output_names=output_names,
+            dynamic_axes={
+                **{name: {0: "batch", 1: "sequence"} for name in input_names},
+                output_names[0]: output_axes,
+            },
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+
+    if optimize:
+        # fuse attention / GELU / layer norm; num_heads and hidden_size are read from the graph
+        from onnxruntime.transformers import optimizer
+
+        optimized = optimizer.optimize_model(fp32_path, model_type="bert", num_heads=0, hidden_size=0)
+        optimized.save_model_to_file(fp32_path)
+
+    quantize_dynamic(
+        fp32_path,
+        os.path.join(out_dir, INT8_FILE),
+        weight_type=QuantType.QInt8,
+        per_channel=per_channel,
+    )
+
+    tokenizer.backend_tokenizer.save(os.path.join(out_dir, TOKENIZER_FILE))
+    with open(os.path.join(out_dir, CONFIG_FILE), "w") as f:
+        json.dump(config, f, indent=2)
+    return config
+
+
+# -----------------------------------------------------------------------------
+# Serving
+# -----------------------------------------------------------------------------
+def available_cores() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))  # respects CPU pinning / container limits
+    return os.cpu_count() or 1
+
+
+def session_options(threads: Optional[int] = None):
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = threads or int(os.getenv("ONNX_ENCODER_THREADS", 0)) or available_cores()
+    options.inter_op_num_threads = 1
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return options
+
+
+def plan_batches(
+    lengths: Sequence[int],
+    batch_size: int = 32,
+    max_tokens: int = 16384,
+    multiple: int = PAD_MULTIPLE,
+    max_length: Optional[int] = None,
+) -> List[Tuple[List[int], int]]:
+    """
+    Group text indices into (indices, padded_length) batches: longest texts
+    first, each batch padded to its longest text rounded up to `multiple`
+    (never past `max_length`), at most `batch_size` texts and `max_tokens`
+    padded tokens per batch.
+    """
+    def padded(length):
+        width = -(-max(length, 1) // multiple) * multiple
+        return min(width, max(max_length, length)) if max_length else width
+
+    order = sorted(range(len(lengths)), key=lambda i: -lengths[i])
+    batches = []
+    current, width = [], 0
+    for i in order:
+        if current and (len(current) == batch_size or width * (len(current) + 1) > max_tokens):
+            batches.append((current, width))
+            current = []
+        if not current:
+            width = padded(lengths[i])  # the longest text of the batch comes first
+        current.append(i)
+    if current:
+        batches.append((current, width))
+    return batches
+
+
+class _OnnxEncoder:
+    def __init__(
+        self,
+        path: str,
+        quantized: bool = True,
+        threads: Optional[int] = None,
+        max_tokens: int = 16384,
+    ):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(path, CONFIG_FILE)) as f:
+            self.config = json.load(f)
+        self.max_seq_length = self.config["max_seq_length"]
+        self.max_tokens = max_tokens
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(path, TOKENIZER_FILE))
+        self.tokenizer.no_padding()  # batches are padded by plan_batches
+        self.tokenizer.enable_truncation(self.max_seq_length)
+
+        self.model_file = INT8_FILE if quantized else FP32_FILE
+        self.session = ort.InferenceSession(
+            os.path.join(path, self.model_file),
+            sess_options=session_options(threads),
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def _run(self, encodings, batch_size: int):
+        """Yield (indices, first output, attention mask) per padded batch."""
+        lengths = [len(e.ids) for e in encodings]
+        pad_id = self.config["pad_token_id"]
+        for indices, width in plan_batches(lengths, batch_size, self.max_tokens, max_length=self.max_seq_length):
+            input_ids = np.full((len(indices), width), pad_id, dtype=np.int64)
+            attention_mask = np.zeros((len(indices), width), dtype=np.int64)
+            token_type_ids = np.zeros((len(indices), width), dtype=np.int64)
+            for row, i in enumerate(indices):
+                n = lengths[i]
+                input_ids[row, :n] = encodings[i].ids
+                attention_mask[row, :n] = 1
+                token_type_ids[row, :n] = encodings[i].type_ids
+            feed = {"input_ids": input_ids, "attention_mask": attention_mask, "token_type_ids": token_type_ids}
+            output = self.session.run(None, {name: feed[name] for name in self.input_names})[0]
+            yield indices, output, attention_mask
+
+
+class OnnxBiEncoder(_OnnxEncoder):
+    """Drop-in for SentenceTransformer.encode (numpy output only)."""
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.config["dimension"]
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        **kwargs,  # convert_to_numpy, show_progress_bar...: accepted, output is always numpy
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        embeddings = np.empty((len(texts), self.config["dimension"]), dtype=np.float32)
+        if not texts:
+            return embeddings
+
+        for indices, hidden, mask in self._run(self.tokenizer.encode_batch(texts), batch_size):
+            if self.config["pooling"] == "cls":
+                pooled = hidden[:, 0]
+            else:
+                weights = mask[..., None].astype(np.float32)
+                pooled = (hidden * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+            embeddings[indices] = pooled
+
+        if self.config["normalize"] or normalize_embeddings:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings[0] if single else embeddings
+
+
+class OnnxCrossEncoder(_OnnxEncoder):
+    """Drop-in for CrossEncoder.predict (numpy output only)."""
+
+    def predict(
+        self,
+        sentences: Union[Tuple[str, str], List[Tuple[str, str]]],
+        batch_size: int = 32,
+        **kwargs,
+    ) -> np.ndarray:
+        single = len(sentences) == 2 and isinstance(sentences[0], str)
+        pairs = [tuple(sentences)] if single else [tuple(pair) for pair in sentences]
+        scores = np.empty(len(pairs), dtype=np.float32)
+        if not pairs:
+            return scores
+
+        for indices, logits, _ in self._run(self.tokenizer.encode_batch(pairs), batch_size):
+            scores[indices] = logits[:, 0]
+
+        if self.config["activation"] == "sigmoid":
+            scores = 1.0 / (1.0 + np.exp(-scores))
+        return scores[0] if single else scores
+
+
+def load_encoder(path: str, quantized: bool = True, threads: Optional[int] = None):
+    """OnnxBiEncoder or OnnxCrossEncoder for an export directory."""
+    with open(os.path.join(path, CONFIG_FILE)) as f:
+        kind = json.load(f)["kind"]
+    cls = OnnxBiEncoder if kind == "bi" else OnnxCrossEncoder
+    return cls(path, quantized=quantized, threads=threads)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a day 1 encoder to quantized ONNX")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_export = sub.add_parser("export", help="export fp32 + int8 ONNX graphs")
+    p_export.add_argument("model", help="e.g. all-MiniLM-L6-v2, BAAI/bge-small-en-v1.5")
+    p_export.add_argument("out_dir")
+    p_export.add_argument("--kind", choices=["bi", "cross"], default="bi")
+    p_export.add_argument("--max-seq-length", type=int)
+    p_export.add_argument("--no-optimize", action="store_true", help="skip the transformer graph fusions")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    config = export(
+        args.model,
+        args.out_dir,
+        kind=args.kind,
+        max_seq_length=args.max_seq_length,
+        optimize=not args.no_optimize,
+    )
+    sizes = {
+        name: os.path.getsize(os.path.join(args.out_dir, name)) / 1e6 for name in (FP32_FILE, INT8_FILE)
+    }
+    print(f"Exported {args.model} ({config['kind']}-encoder) to {args.out_dir} in {time.perf_counter() - start:.1f}s")
+    print(f"  {FP32_FILE}: {sizes[FP32_FILE]:.1f} MB, {INT8_FILE}: {sizes[INT8_FILE]:.1f} MB")
+
+
+# -----------------------------------------------------------------------------
+# Execution Instructions
+# -----------------------------------------------------------------------------
+# pip install sentence-transformers onnx onnxruntime
+# Run this file with: python onnx_encoders.py export all-MiniLM-L6-v2 onnx/all-MiniLM-L6-v2
+# Then compare with the PyTorch path: python onnx_encoders_bench.py
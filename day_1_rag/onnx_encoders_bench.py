@@ -0,0 +1,237 @@
+# =============================================================================
+# ONNX ENCODERS vs PYTORCH: ACCURACY AND THROUGHPUT
+# =============================================================================
+# Compares the day 1 encoders served by sentence-transformers (PyTorch) with
+# the exports of onnx_encoders.py, fp32 and int8, on CPU:
+#
+# - bi-encoders (all-MiniLM-L6-v2, BAAI/bge-small-en-v1.5): retrieval
+#   precision@3, precision@5 and recall@5 on the documents and test queries
+#   of 4_rag_evaluation.ipynb, mean cosine between the PyTorch and ONNX
+#   embeddings, and encode throughput in texts/s
+# - cross-encoder (ms-marco-MiniLM-L-12-v2): precision@3 after reranking the
+#   same documents, share of queries with the same top-1 document as PyTorch,
+#   and predict throughput in pairs/s
+#
+# Accuracy deltas, agreement and speed-up are against PyTorch, or against
+# ONNX fp32 when sentence-transformers is not installed.
+#
+# The throughput corpus is made of 1 to 4 sentence windows of
+# text_for_reranking.txt, so text lengths vary like real chunks. Models that
+# have not been exported to --onnx-dir are skipped.
+# =============================================================================
+
+import argparse
+import ast
+import json
+import os
+import random
+import re
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from onnx_encoders import load_encoder
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+BI_ENCODERS = ["all-MiniLM-L6-v2", "BAAI/bge-small-en-v1.5"]
+CROSS_ENCODERS = ["cross-encoder/ms-marco-MiniLM-L-12-v2"]
+
+
+def load_evaluation_set():
+    """documents, test_queries, precision_at_k and recall_at_k from 4_rag_evaluation.ipynb."""
+    with open(os.path.join(HERE, "4_rag_evaluation.ipynb"), encoding="utf-8") as f:
+        cells = ["".join(cell["source"]) for cell in json.load(f)["cells"] if cell["cell_type"] == "code"]
+    source = "\n\n".join(
+        "\n".join(line for line in cell.splitlines() if not line.lstrip().startswith(("!", "%")))
+        for cell in cells
+    )
+    found = {"List": List}
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            if node.targets[0].id in ("documents", "test_queries"):
+                found[node.targets[0].id] = ast.literal_eval(node.value)
+        elif isinstance(node, ast.FunctionDef) and node.name in ("precision_at_k", "recall_at_k"):
+            exec(compile(ast.Module(body=[node], type_ignores=[]), "4_rag_evaluation.ipynb", "exec"), found)
+    return found["documents"], found["test_queries"], found["precision_at_k"], found["recall_at_k"]
+
+
+def throughput_corpus(n: int, seed: int = 0) -> List[str]:
+    with open(os.path.join(HERE, "text_for_reranking.txt"), encoding="utf-8") as f:
+        sentences = [s for s in re.split(r"(?<=[.!?])\s+|\n", f.read()) if s.strip()]
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        start = rng.randrange(len(sentences))
+        texts.append(" ".join(sentences[start:start + rng.randint(1, 4)]))
+    return texts
+
+
+def best_rate(fn, count: int, repeat: int) -> float:
+    """Items per second of the fastest of `repeat` runs (after one warm-up)."""
+    fn()
+    best = min(_timed(fn) for _ in range(repeat))
+    return count / best
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def export_dir(onnx_dir: str, model_name: str) -> str:
+    return os.path.join(onnx_dir, model_name.split("/")[-1])
+
+
+def normalize(x: np.ndarray) -> np.ndarray:
+    return x / np.maximum(np.linalg.norm(x, axis=-1, keepdims=True), 1e-12)
+
+
+# -----------------------------------------------------------------------------
+# Bi-encoders
+# -----------------------------------------------------------------------------
+def retrieval_metrics(encoder, documents, test_queries, precision_at_k, recall_at_k, batch_size):
+    doc_embeddings = normalize(encoder.encode([d["text"] for d in documents], batch_size=batch_size))
+    query_embeddings = normalize(encoder.encode([q["query"] for q in test_queries], batch_size=batch_size))
+    rankings = np.argsort(-(query_embeddings @ doc_embeddings.T), axis=1)
+    metrics = {"P@3": [], "P@5": [], "R@5": []}
+    for test_case, ranking in zip(test_queries, rankings):
+        retrieved_ids = [documents[i]["id"] for i in ranking]
+        metrics["P@3"].append(precision_at_k(retrieved_ids, test_case["relevant_docs"], k=3))
+        metrics["P@5"].append(precision_at_k(retrieved_ids, test_case["relevant_docs"], k=5))
+        metrics["R@5"].append(recall_at_k(retrieved_ids, test_case["relevant_docs"], k=5))
+    return {name: float(np.mean(values)) for name, values in metrics.items()}, np.vstack(
+        [doc_embeddings, query_embeddings]
+    )
+
+
+def bench_bi_encoder(model_name, reference_cls, args, evaluation, corpus) -> List[Dict]:
+    documents, test_queries, precision_at_k, recall_at_k = evaluation
+    backends = {}
+    if reference_cls is not None:
+        backends["pytorch"] = reference_cls(model_name, device="cpu")
+    for label, quantized in (("onnx fp32", False), ("onnx int8", True)):
+        backends[label] = load_encoder(export_dir(args.onnx_dir, model_name), quantized=quantized, threads=args.threads)
+
+    rows, reference_embeddings = [], None
+    for label, encoder in backends.items():
+        metrics, embeddings = retrieval_metrics(
+            encoder, documents, test_queries, precision_at_k, recall_at_k, args.batch_size
+        )
+        if reference_embeddings is None:
+            reference_embeddings = embeddings
+        rate = best_rate(lambda: encoder.encode(corpus, batch_size=args.batch_size), len(corpus), args.repeat)
+        agreement = float((embeddings * reference_embeddings).sum(axis=1).mean())
+        rows.append({"model": model_name, "backend": label, **metrics, "agreement": agreement, "rate": rate})
+    return rows
+
+
+# -----------------------------------------------------------------------------
+# Cross-encoders
+# -----------------------------------------------------------------------------
+def bench_cross_encoder(model_name, reference_cls, args, evaluation, corpus) -> List[Dict]:
+    documents, test_queries, precision_at_k, _ = evaluation
+    backends = {}
+    if reference_cls is not None:
+        backends["pytorch"] = reference_cls(model_name, device="cpu")
+    for label, quantized in (("onnx fp32", False), ("onnx int8", True)):
+        backends[label] = load_encoder(export_dir(args.onnx_dir, model_name), quantized=quantized, threads=args.threads)
+
+    pairs = [(q["query"], d["text"]) for q in test_queries for d in documents]
+    throughput_pairs = [(corpus[i], corpus[-1 - i]) for i in range(len(corpus))]
+    rows, reference_top1 = [], None
+    for label, encoder in backends.items():
+        scores = np.asarray(encoder.predict(pairs, batch_size=args.batch_size)).reshape(len(test_queries), len(documents))
+        rankings = np.argsort(-scores, axis=1)
+        top1 = rankings[:, 0]
+        if reference_top1 is None:
+            reference_top1 = top1
+        p3 = np.mean([
+            precision_at_k([documents[i]["id"] for i in ranking], test_case["relevant_docs"], k=3)
+            for test_case, ranking in zip(test_queries, rankings)
+        ])
+        rate = best_rate(
+            lambda: encoder.predict(throughput_pairs, batch_size=args.batch_size), len(throughput_pairs), args.repeat
+        )
+        agreement = float((top1 == reference_top1).mean())
+        rows.append({"model": model_name, "backend": label, "P@3": float(p3), "agreement": agreement, "rate": rate})
+    return rows
+
+
+def print_rows(rows: List[Dict], metrics: List[str], agreement: str, unit: str) -> None:
+    print(f"{'backend':<12}" + "".join(f"{m:>8}" for m in metrics) + f"{agreement:>12}{unit:>12}{'speed-up':>10}")
+    baseline = rows[0]
+    for row in rows:
+        cells = "".join(
+            f"{row[m]:>8.3f}" if row is baseline else f"{row[m] - baseline[m]:>+8.3f}" for m in metrics
+        )
+        print(
+            f"{row['backend']:<12}{cells}{row['agreement']:>12.4f}"
+            f"{row['rate']:>12.1f}{row['rate'] / baseline['rate']:>9.2f}x"
+        )
+    print(f"(metrics, agreement and speed-up of the other backends are against '{baseline['backend']}')\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the ONNX encoders with the PyTorch path")
+    parser.add_argument("--onnx-dir", default="onnx", help="directory holding one export per model")
+    parser.add_argument("--models", nargs="*", help="subset of models to compare")
+    parser.add_argument("--texts", type=int, default=2000, help="size of the throughput corpus")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threads", type=int, help="ONNX intra-op threads (default: available cores)")
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    try:
+        from sentence_transformers import CrossEncoder, SentenceTransformer
+    except ImportError:
+        print("sentence-transformers is not installed: comparing the ONNX backends only")
+        SentenceTransformer = CrossEncoder = None
+
+    evaluation = load_evaluation_set()
+    corpus = throughput_corpus(args.texts)
+
+    print("\n" + "=" * 80)
+    print(f"ONNX ENCODERS BENCHMARK - {len(corpus)} texts, batch size {args.batch_size}")
+    print("=" * 80 + "\n")
+
+    results = []
+    for kind, names, bench, reference_cls in (
+        ("bi", BI_ENCODERS, bench_bi_encoder, SentenceTransformer),
+        ("cross", CROSS_ENCODERS, bench_cross_encoder, CrossEncoder),
+    ):
+        for model_name in names:
+            if args.models and model_name not in args.models and model_name.split("/")[-1] not in args.models:
+                continue
+            path = export_dir(args.onnx_dir, model_name)
+            if not os.path.isdir(path):
+                flag = " --kind cross" if kind == "cross" else ""
+                print(f"Skipping {model_name}: run python onnx_encoders.py export {model_name} {path}{flag}\n")
+                continue
+            print(f"--- {model_name} ---")
+            rows = bench(model_name, reference_cls, args, evaluation, corpus)
+            if kind == "bi":
+                print_rows(rows, ["P@3", "P@5", "R@5"], "cosine", "texts/s")
+            else:
+                print_rows(rows, ["P@3"], "top-1 agree", "pairs/s")
+            results.extend(rows)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    print("=" * 80)
+    print("BENCHMARK COMPLETED")
+    print("=" * 80 + "\n")
+
+
+# -----------------------------------------------------------------------------
+# Execution Instructions
+# -----------------------------------------------------------------------------
+# pip install sentence-transformers onnx onnxruntime
+# Export the models first (see onnx_encoders.py), then run:
+#   python onnx_encoders_bench.py [--onnx-dir onnx] [--texts 2000] [--threads 4]
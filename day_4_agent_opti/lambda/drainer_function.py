@@ -0,0 +1,49 @@
+import json
+import os
+import boto3
+import logging
+
+from notification_outbox import DynamoDBDedupStore, drain_outbox, publish_batch
+
+# Setting up logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Clients are created once per Lambda container and reused across invocations
+dynamodb = boto3.resource('dynamodb')
+table = dynamodb.Table(os.environ.get("ORDERS_TABLE", "**********"))  # Change to your table name
+sns_client = boto3.client('sns')
+sqs_client = boto3.client('sqs')
+
+topic_arn = os.environ.get("TOPIC_ARN", 'arn:aws:sns:us-east-1:********:******')  # Change to your SNS Topic ARN
+outbox_queue_url = os.environ.get("OUTBOX_QUEUE_URL")
+dedup_store = DynamoDBDedupStore(table)
+
+
+def lambda_handler(event, context):
+    """
+    Drain the notification outbox.
+
+    - Triggered by an SQS event source mapping (with ReportBatchItemFailures
+      enabled): publishes the delivered records and reports the failed ones so
+      only those are retried.
+    - Triggered by a schedule (EventBridge): polls the queue until it is empty.
+    """
+    records = event.get("Records")
+
+    if records:
+        result = publish_batch(
+            [(r["messageId"], json.loads(r["body"])) for r in records],
+            sns_client,
+            topic_arn,
+            dedup_store,
+        )
+        logger.info(
+            f"Published {result['published']}, skipped {result['duplicates']} duplicates, "
+            f"failed {result['failed']}"
+        )
+        return {"batchItemFailures": [{"itemIdentifier": i} for i in result["failed"]]}
+
+    totals = drain_outbox(sqs_client, outbox_queue_url, sns_client, topic_arn, dedup_store)
+    logger.info(f"Drained outbox: {json.dumps(totals)}")
+    return totals
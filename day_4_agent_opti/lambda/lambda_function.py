@@ -0,0 +1,202 @@
+import json
+import os
+import boto3
+import logging
+from botocore.exceptions import ClientError
+import ast
+
+from notification_outbox import enqueue_notification, make_notification_id, publish_notification
+
+# Setting up logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# DynamoDB Resource initialization
+dynamodb = boto3.resource('dynamodb')
+table = dynamodb.Table(os.environ.get("ORDERS_TABLE", "**********"))  # Change to your table name
+
+# Notification settings. When OUTBOX_QUEUE_URL is set, send_notification_sms only
+# enqueues the SMS and the drainer Lambda (drainer_function.py) publishes it.
+topic_arn = os.environ.get("TOPIC_ARN", 'arn:aws:sns:us-east-1:********:******')  # Change to your SNS Topic ARN
+outbox_queue_url = os.environ.get("OUTBOX_QUEUE_URL")
+sqs_client = boto3.client('sqs') if outbox_queue_url else None
+sns_client = None if outbox_queue_url else boto3.client('sns')
+
+
+def format_response_body(event, responseBody):
+    """
+    Format the response body to include action group, function, and response data.
+    """
+    function_response = {
+        'actionGroup': event['actionGroup'],
+        'function': event['function'],
+        'functionResponse': {
+            'responseBody': responseBody
+        }
+    }
+
+    session_attributes = event['sessionAttributes']
+    prompt_session_attributes = event['promptSessionAttributes']
+
+    action_response = {
+        'messageVersion': '1.0',
+        'response': function_response,
+        'sessionAttributes': session_attributes,
+        'promptSessionAttributes': prompt_session_attributes
+    }
+
+    return action_response
+
+
+def get_orders(sessionId):
+    """
+    Retrieve all orders associated with a sessionId from DynamoDB.
+    """
+    try:
+        response = table.get_item(Key={"sessionId": sessionId})
+        return response.get("Item", {}).get("orders", [])
+    except Exception as e:
+        logger.error(f"Error retrieving orders for sessionId {sessionId}: {e}")
+        return []
+
+
+def lambda_handler(event, context):
+    """
+    Main Lambda function handler that processes different actions based on the 'function' key.
+    """
+    logger.info(f"EVENT: {json.dumps(event)}")
+    function = event['function']
+    parameters = {param["name"]: param["value"] for param in event.get('parameters', [])}
+    sessionId = event['sessionId']
+
+    if function == 'get_phone_number':
+        phone_number = parameters["phone_number"]
+        item = {
+            "sessionId": sessionId,
+            "phone_number": phone_number
+        }
+        try:
+            # Only put the item if 'Id' does not already exist
+            response = table.put_item(
+                Item=item,
+                ConditionExpression="attribute_not_exists(Id)"
+            )
+            logger.info("Phone number item created successfully!")
+            logger.debug(f"PutItem Response: {response}")
+
+            responseBody = {
+                "TEXT": {
+                    "body": f"The phone number {phone_number} has been saved for the conversation"
+                }
+            }
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                response = f"Phone number: {phone_number} already exists, no need to store it."
+            else:
+                response = f"An error occurred while storing the phone number {phone_number}: {e}"
+
+            logger.error(f"Error storing phone number {phone_number}: {response}")
+
+            responseBody = {
+                "TEXT": {
+                    "body": response
+                }
+            }
+
+        logger.info(f"ResponseBody: {json.dumps(responseBody)}")
+        action_response = format_response_body(event, responseBody)
+        return action_response
+
+    if function == 'place_order':
+        order = get_orders(sessionId)
+        order.append(parameters)
+
+        try:
+            response = table.update_item(
+                Key={"sessionId": sessionId},
+                UpdateExpression="SET orders = :orders",
+                ExpressionAttributeValues={":orders": order}
+            )
+            logger.info("Order placed successfully!")
+            logger.debug(f"UpdateItem Response: {response}")
+
+            responseBody = {
+                "TEXT": {
+                    "body": "The order was placed successfully!"
+                }
+            }
+        except Exception as e:
+            logger.error(f"Error placing order for sessionId {sessionId}: {e}")
+            responseBody = {
+                "TEXT": {
+                    "body": "Failed to place the order due to an error."
+                }
+            }
+
+        logger.info(f"ResponseBody: {json.dumps(responseBody)}")
+        action_response = format_response_body(event, responseBody)
+        return action_response
+
+    if function == 'get_all_orders':
+        orders = get_orders(sessionId)
+        responseBody = {
+            "TEXT": {
+                "body": f"The final list of orders is {orders}!"
+            }
+        }
+
+        logger.info(f"ResponseBody: {json.dumps(responseBody)}")
+        action_response = format_response_body(event, responseBody)
+        return action_response
+
+    if function == 'compute_bill':
+        list_of_prices = parameters["list_of_prices"]
+        # Convert the string to a list
+        numbers = ast.literal_eval(list_of_prices)
+        total = sum(numbers)
+
+        responseBody = {
+            "TEXT": {
+                "body": f"The bill is {total}!"
+            }
+        }
+
+        logger.info(f"Computed total bill: {total}")
+        action_response = format_response_body(event, responseBody)
+        return action_response
+
+    if function == 'send_notification_sms':
+        try:
+            if outbox_queue_url:
+                # Outbox: durably enqueue and answer the Agent right away.
+                # One SMS per session, or per order when the Agent passes an
+                # order_id / notification_id parameter. The id comes from the
+                # event, so no DynamoDB read is added to the Agent's wait
+                notification_id = make_notification_id(
+                    sessionId, parameters.get("notification_id") or parameters.get("order_id")
+                )
+                response = enqueue_notification(sqs_client, outbox_queue_url, sessionId, notification_id)
+                logger.info(f"SMS queued for delivery! Response: {response}")
+                body = "SMS queued, it will be sent shortly!"
+            else:
+                # Send the message to the SNS topic
+                response = publish_notification(sns_client, topic_arn)
+                logger.info(f"SMS sent successfully! Response: {response}")
+                body = "SMS sent!"
+
+            responseBody = {
+                "TEXT": {
+                    "body": body
+                }
+            }
+        except ClientError as e:
+            logger.error(f"Error sending SMS: {e}")
+            responseBody = {
+                "TEXT": {
+                    "body": f"Failed to send SMS: {e}"
+                }
+            }
+
+        logger.info(f"ResponseBody: {json.dumps(responseBody)}")
+        action_response = format_response_body(event, responseBody)
+        return action_response
@@ -0,0 +1,307 @@
+# =============================================================================
+# ORDER NOTIFICATION OUTBOX
+# =============================================================================
+# The original send_notification_sms action publishes to SNS synchronously, so
+# the Bedrock Agent waits on SNS before it can answer the customer.
+#
+# With the outbox pattern the action only writes the notification to a durable
+# queue (Amazon SQS) and returns straight away. A separate drainer Lambda reads
+# the queue, publishes to SNS in batches, retries transient failures and makes
+# sure each notification is sent only once. Notifications are keyed on the
+# sessionId, or on sessionId + the order (or notification) id when the action
+# passes one, so a later order in the same session can get its own SMS.
+#
+# This module has no AWS dependency: the boto3 clients are passed in, so the
+# whole flow can be exercised locally with the stand-ins defined at the bottom.
+# =============================================================================
+
+import json
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUBJECT = "SOMA Order"
+DEFAULT_MESSAGE = """Thank you for your order with SOMA!
+        We're preparing your meal and will notify you when it's ready.
+        Enjoy your meal!"""
+
+
+# -----------------------------------------------------------------------------
+# Producer side (called from the action Lambda)
+# -----------------------------------------------------------------------------
+def publish_notification(sns_client, topic_arn, message=DEFAULT_MESSAGE, subject=DEFAULT_SUBJECT):
+    """
+    Publish a notification to SNS synchronously (the original behaviour).
+    """
+    return sns_client.publish(TopicArn=topic_arn, Message=message, Subject=subject)
+
+
+def make_notification_id(session_id, order_id=None):
+    """
+    Stable id of a notification, built from the action's event only (no
+    DynamoDB read): the session id, or session id + `order_id` when the action
+    passes one. Retries of the same action share it.
+    """
+    return f"{session_id}#{order_id}" if order_id else session_id
+
+
+def enqueue_notification(
+    sqs_client, queue_url, session_id, notification_id, message=DEFAULT_MESSAGE, subject=DEFAULT_SUBJECT
+):
+    """
+    Durably enqueue a notification for a session and return immediately.
+
+    On a FIFO queue (URL ending in '.fifo') the sessionId is the message group
+    and the notification id the deduplication id, so SQS itself drops
+    duplicates sent within its 5 minute deduplication window.
+    """
+    body = {
+        "sessionId": session_id,
+        "notificationId": notification_id,
+        "message": message,
+        "subject": subject,
+        "enqueued_at": time.time(),
+    }
+    kwargs = {"QueueUrl": queue_url, "MessageBody": json.dumps(body)}
+    if queue_url.endswith(".fifo"):
+        kwargs["MessageGroupId"] = session_id
+        kwargs["MessageDeduplicationId"] = notification_id
+    return sqs_client.send_message(**kwargs)
+
+
+# -----------------------------------------------------------------------------
+# Deduplication stores
+# -----------------------------------------------------------------------------
+class DynamoDBDedupStore:
+    """
+    Record sent notification ids in a string set on the session item of the
+    orders table.
+
+    claim() is a conditional write, so two drainers racing on the same
+    notification cannot both publish.
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    def claim(self, session_id, notification_id):
+        try:
+            self.table.update_item(
+                Key={"sessionId": session_id},
+                UpdateExpression="ADD notified :ids",
+                ConditionExpression="attribute_not_exists(notified) OR NOT contains(notified, :id)",
+                ExpressionAttributeValues={":ids": {notification_id}, ":id": notification_id},
+            )
+            return True
+        except Exception as e:
+            code = getattr(e, "response", {}).get("Error", {}).get("Code")
+            if code == "ConditionalCheckFailedException":
+                return False
+            raise
+
+    def release(self, session_id, notification_id):
+        self.table.update_item(
+            Key={"sessionId": session_id},
+            UpdateExpression="DELETE notified :ids",
+            ExpressionAttributeValues={":ids": {notification_id}},
+        )
+
+
+class LocalDedupStore:
+    """In-memory stand-in for DynamoDBDedupStore."""
+
+    def __init__(self):
+        self.sent = set()
+
+    def claim(self, session_id, notification_id):
+        if (session_id, notification_id) in self.sent:
+            return False
+        self.sent.add((session_id, notification_id))
+        return True
+
+    def release(self, session_id, notification_id):
+        self.sent.discard((session_id, notification_id))
+
+
+# -----------------------------------------------------------------------------
+# Consumer side (the drainer Lambda)
+# -----------------------------------------------------------------------------
+def publish_with_retries(
+    sns_client, topic_arn, message, subject, max_attempts=3, backoff_seconds=0.2
+):
+    """
+    Publish to SNS, retrying with exponential backoff. Re-raises the last error.
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return sns_client.publish(TopicArn=topic_arn, Message=message, Subject=subject)
+        except Exception as e:
+            if attempt == max_attempts:
+                raise
+            delay = backoff_seconds * (2 ** (attempt - 1))
+            logger.warning(f"SNS publish failed (attempt {attempt}): {e}, retrying in {delay}s")
+            time.sleep(delay)
+
+
+def publish_batch(records, sns_client, topic_arn, dedup_store, max_attempts=3, backoff_seconds=0.2):
+    """
+    Publish a batch of outbox records.
+
+    Args:
+        records: list of (record_id, body) pairs where body is the decoded
+            message written by enqueue_notification
+        sns_client: boto3 SNS client (or LocalSNS)
+        topic_arn: SNS topic ARN
+        dedup_store: object with claim(session_id, notification_id) /
+            release(session_id, notification_id)
+
+    Returns:
+        dict with the ids that were 'done' (safe to delete) and 'failed'
+        (leave on the queue for redelivery), plus counters
+    """
+    done, failed = [], []
+    stats = {"published": 0, "duplicates": 0, "failed": 0}
+    seen = set()
+
+    for record_id, body in records:
+        session_id = body["sessionId"]
+        # messages enqueued before notification ids existed fall back to the session
+        notification_id = body.get("notificationId", session_id)
+        if notification_id in seen or not dedup_store.claim(session_id, notification_id):
+            stats["duplicates"] += 1
+            done.append(record_id)
+            continue
+        seen.add(notification_id)
+
+        try:
+            publish_with_retries(
+                sns_client,
+                topic_arn,
+                body.get("message", DEFAULT_MESSAGE),
+                body.get("subject", DEFAULT_SUBJECT),
+                max_attempts=max_attempts,
+                backoff_seconds=backoff_seconds,
+            )
+            stats["published"] += 1
+            done.append(record_id)
+        except Exception as e:
+            logger.error(f"Giving up on notification {notification_id}: {e}")
+            dedup_store.release(session_id, notification_id)
+            stats["failed"] += 1
+            failed.append(record_id)
+
+    return {"done": done, "failed": failed, **stats}
+
+
+def drain_outbox(
+    sqs_client,
+    queue_url,
+    sns_client,
+    topic_arn,
+    dedup_store,
+    batch_size=10,
+    max_batches=None,
+    max_attempts=3,
+    backoff_seconds=0.2,
+):
+    """
+    Poll the outbox queue until it is empty (or max_batches is reached).
+
+    Successfully handled messages are deleted in one delete_message_batch call
+    per batch; failed ones stay on the queue and become visible again after
+    the visibility timeout (configure a dead-letter queue for poison messages).
+    """
+    totals = {"batches": 0, "published": 0, "duplicates": 0, "failed": 0}
+
+    while max_batches is None or totals["batches"] < max_batches:
+        response = sqs_client.receive_message(
+            QueueUrl=queue_url, MaxNumberOfMessages=batch_size, WaitTimeSeconds=0
+        )
+        messages = response.get("Messages", [])
+        if not messages:
+            break
+
+        receipts = {m["MessageId"]: m["ReceiptHandle"] for m in messages}
+        records = [(m["MessageId"], json.loads(m["Body"])) for m in messages]
+        result = publish_batch(
+            records, sns_client, topic_arn, dedup_store, max_attempts, backoff_seconds
+        )
+
+        if result["done"]:
+            sqs_client.delete_message_batch(
+                QueueUrl=queue_url,
+                Entries=[
+                    {"Id": message_id, "ReceiptHandle": receipts[message_id]}
+                    for message_id in result["done"]
+                ],
+            )
+
+        totals["batches"] += 1
+        for key in ("published", "duplicates", "failed"):
+            totals[key] += result[key]
+
+    return totals
+
+
+# -----------------------------------------------------------------------------
+# Local stand-ins for SQS and SNS
+# -----------------------------------------------------------------------------
+class LocalQueue:
+    """
+    Minimal in-memory SQS stand-in: send_message, receive_message and
+    delete_message_batch. Received messages stay hidden until deleted or
+    until release_inflight() simulates the visibility timeout expiring.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.messages = []
+        self.inflight = {}
+
+    def send_message(self, QueueUrl, MessageBody, **kwargs):
+        time.sleep(self.latency)
+        message_id = str(uuid.uuid4())
+        self.messages.append({"MessageId": message_id, "Body": MessageBody})
+        return {"MessageId": message_id}
+
+    def receive_message(self, QueueUrl, MaxNumberOfMessages=1, **kwargs):
+        batch = self.messages[:MaxNumberOfMessages]
+        self.messages = self.messages[MaxNumberOfMessages:]
+        received = []
+        for message in batch:
+            receipt = str(uuid.uuid4())
+            self.inflight[receipt] = message
+            received.append({**message, "ReceiptHandle": receipt})
+        return {"Messages": received}
+
+    def delete_message_batch(self, QueueUrl, Entries):
+        for entry in Entries:
+            self.inflight.pop(entry["ReceiptHandle"], None)
+        return {"Successful": [{"Id": e["Id"]} for e in Entries]}
+
+    def release_inflight(self):
+        self.messages.extend(self.inflight.values())
+        self.inflight = {}
+
+
+class LocalSNS:
+    """
+    In-memory SNS stand-in with configurable latency. The first
+    `fail_first` publish calls raise, to exercise the retry path.
+    """
+
+    def __init__(self, latency=0.0, fail_first=0):
+        self.latency = latency
+        self.fail_first = fail_first
+        self.calls = 0
+        self.published = []
+
+    def publish(self, TopicArn, Message, Subject=None):
+        time.sleep(self.latency)
+        self.calls += 1
+        if self.calls <= self.fail_first:
+            raise ConnectionError("simulated SNS outage")
+        self.published.append({"TopicArn": TopicArn, "Message": Message, "Subject": Subject})
+        return {"MessageId": str(uuid.uuid4())}
@@ -0,0 +1,106 @@
+# =============================================================================
+# NOTIFICATION OUTBOX - LOCAL END-TO-END DEMO
+# =============================================================================
+# Runs the send_notification_sms flow against in-memory stand-ins for SQS and
+# SNS (no AWS account needed) and compares the latency seen by the Agent:
+#   - before: the action publishes to SNS synchronously
+#   - after:  the action enqueues to the outbox, a drainer publishes later
+# =============================================================================
+
+import statistics
+import time
+
+from notification_outbox import (
+    LocalDedupStore,
+    LocalQueue,
+    LocalSNS,
+    drain_outbox,
+    enqueue_notification,
+    make_notification_id,
+    publish_notification,
+)
+
+TOPIC_ARN = "arn:aws:sns:local:000000000000:soma-orders"
+QUEUE_URL = "https://sqs.local/000000000000/soma-outbox"
+
+# Simulated service latencies (seconds)
+SNS_LATENCY = 0.08
+SQS_LATENCY = 0.005
+
+
+def time_calls(fn, orders):
+    """Return per-call latencies in milliseconds."""
+    latencies = []
+    for session_id, order_id in orders:
+        start = time.perf_counter()
+        fn(session_id, order_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(label, latencies):
+    print(
+        f"{label:<28} p50={statistics.median(latencies):7.2f} ms   "
+        f"max={max(latencies):7.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    # (sessionId, order_id passed by the action): 20 sessions without an order
+    # id, two of which trigger the SMS action twice (agent retry), and a
+    # second order in one session, notified with its own order id
+    orders = [(f"session-{i:03d}", None) for i in range(20)]
+    orders += [("session-003", None), ("session-011", None)]
+    orders += [("session-007", "order-2")]
+
+    print("\n" + "=" * 80)
+    print("NOTIFICATION OUTBOX DEMO")
+    print("=" * 80 + "\n")
+
+    # -------------------------------------------------------------------------
+    # Before: synchronous SNS publish inside the action
+    # -------------------------------------------------------------------------
+    sync_sns = LocalSNS(latency=SNS_LATENCY)
+    before = time_calls(lambda sid, n: publish_notification(sync_sns, TOPIC_ARN), orders)
+
+    # -------------------------------------------------------------------------
+    # After: enqueue in the action, drain in the background
+    # -------------------------------------------------------------------------
+    queue = LocalQueue(latency=SQS_LATENCY)
+    after = time_calls(
+        lambda sid, n: enqueue_notification(queue, QUEUE_URL, sid, make_notification_id(sid, n)), orders
+    )
+
+    print("Action latency seen by the Agent:")
+    summarize("  before (sync SNS publish)", before)
+    summarize("  after  (outbox enqueue)", after)
+    print(f"  speed-up: {statistics.median(before) / statistics.median(after):.1f}x\n")
+
+    # The first two SNS calls fail to exercise the retry path
+    sns = LocalSNS(latency=SNS_LATENCY, fail_first=2)
+    dedup = LocalDedupStore()
+
+    start = time.perf_counter()
+    totals = drain_outbox(queue, QUEUE_URL, sns, TOPIC_ARN, dedup, backoff_seconds=0.01)
+    elapsed = time.perf_counter() - start
+
+    print("Drainer:")
+    print(f"  batches:    {totals['batches']}")
+    print(f"  published:  {totals['published']}")
+    print(f"  duplicates: {totals['duplicates']}")
+    print(f"  failed:     {totals['failed']}")
+    print(f"  SNS calls:  {sns.calls} (including retries)")
+    print(f"  drain time: {elapsed:.2f}s (off the Agent's critical path)")
+
+    assert totals["published"] == len(set(orders)), "every order notified once"
+    assert not queue.messages and not queue.inflight, "outbox fully drained"
+
+    print("\n" + "=" * 80)
+    print("DEMO COMPLETED - every order was notified exactly once")
+    print("=" * 80 + "\n")
+
+
+# -----------------------------------------------------------------------------
+# Execution Instructions
+# -----------------------------------------------------------------------------
+# Run this file with: python outbox_demo.py
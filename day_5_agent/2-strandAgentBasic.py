@@ -13,7 +13,9 @@ from strands.models import BedrockModel
 # -----------------------------------------------------------------------------
 # Custom Tool Definition
 # -----------------------------------------------------------------------------
-# Define a custom tool as a Python function using the @tool decorator
+# Define a custom tool as a Python function using the @tool decorator.
+# letter_counter is not memoized: counting is cheaper than a cache lookup
+# (see tool_cache.py).
 @tool
 def letter_counter(word: str, letter: str) -> int:
     """
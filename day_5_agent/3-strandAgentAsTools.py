@@ -10,7 +10,11 @@ from strands import Agent, tool
 import json
 from datetime import datetime
 import random
+import threading
 from strands.models import BedrockModel
+from agent_pool import AgentPool
+from fan_out import fan_out
+from tool_cache import nondeterministic
 
 # -----------------------------------------------------------------------------
 # Model Configuration
@@ -23,6 +27,7 @@ bedrock_model = BedrockModel(model_id="eu.amazon.nova-lite-v1:0", temperature=0.
 # Weather Data Tool
 # -----------------------------------------------------------------------------
 @tool
+@nondeterministic  # random and time-dependent: never memoize
 def get_weather(location: str) -> str:
     """
     Get current weather for a location (simulated).
@@ -63,21 +68,15 @@ def get_weather(location: str) -> str:
 
 
 # -----------------------------------------------------------------------------
-# Weather Analysis Agent
+# Specialist Agent Pools
 # -----------------------------------------------------------------------------
-@tool
-def weather_analyst(location: str) -> str:
-    """
-    Analyze weather conditions and provide a summary.
-
-    Args:
-        location: City name or location
-
-    Returns:
-        Weather analysis and summary
-    """
+# Building an Agent (system prompt, tool registry, model client) on every tool
+# call is wasted work: the specialists are built once, kept warm in a bounded
+# pool, and their conversation history is cleared between uses. The pools are
+# thread-safe, so several orchestrators can share them.
+def build_weather_agent():
     # Create a specialized weather analysis agent
-    weather_agent = Agent(
+    return Agent(
         system_prompt="""
         You are a weather analysis expert. Given weather data:
         1. Summarize the current conditions in a friendly way
@@ -88,10 +87,41 @@ def weather_analyst(location: str) -> str:
         """,
         tools=[get_weather],  # Use our custom weather tool
         model=bedrock_model,
+        callback_handler=None,  # Don't stream: several may run in parallel
     )
 
-    # Format the output with clear section headers
-    response = weather_agent(f"Analyze the weather in {location}")
+
+def build_activity_agent():
+    # Create a specialized activity recommendation agent
+    return Agent(
+        system_prompt="""
+        You are an activity recommendation specialist. Based on weather conditions:
+        1. Suggest 3-5 appropriate activities
+        2. Explain why each activity is suitable for the weather
+        3. Include both indoor and outdoor options when appropriate
+        
+        Be creative and practical with your suggestions.
+        """,
+        model=bedrock_model,
+        callback_handler=None,  # Don't stream: several may run in parallel
+        # No additional tools needed for this agent
+    )
+
+
+weather_agent_pool = AgentPool(build_weather_agent, max_size=4, name="weather_analyst")
+activity_agent_pool = AgentPool(
+    build_activity_agent, max_size=4, name="activity_recommender"
+)
+
+
+# -----------------------------------------------------------------------------
+# Weather Analysis Agent
+# -----------------------------------------------------------------------------
+def analyze_weather(location: str, cancel_signal=None) -> str:
+    # Borrow a pre-built weather analysis agent from the pool. Setting
+    # cancel_signal stops the agent early, so it goes back to the pool
+    with weather_agent_pool.acquire() as weather_agent:
+        response = weather_agent(f"Analyze the weather in {location}", cancel_signal=cancel_signal)
 
     # Add visual formatting to make the output clear
     formatted_response = f"""
@@ -106,36 +136,30 @@ def weather_analyst(location: str) -> str:
     return formatted_response
 
 
-# -----------------------------------------------------------------------------
-# Activity Recommendation Agent
-# -----------------------------------------------------------------------------
 @tool
-def activity_recommender(weather_info: str) -> str:
+def weather_analyst(location: str) -> str:
     """
-    Recommend activities based on weather conditions.
+    Analyze weather conditions and provide a summary.
 
     Args:
-        weather_info: Description of weather conditions
+        location: City name or location
 
     Returns:
-        List of recommended activities
+        Weather analysis and summary
     """
-    # Create a specialized activity recommendation agent
-    activity_agent = Agent(
-        system_prompt="""
-        You are an activity recommendation specialist. Based on weather conditions:
-        1. Suggest 3-5 appropriate activities
-        2. Explain why each activity is suitable for the weather
-        3. Include both indoor and outdoor options when appropriate
-        
-        Be creative and practical with your suggestions.
-        """,
-        model=bedrock_model,
-        # No additional tools needed for this agent
-    )
+    return analyze_weather(location)
 
-    # Get recommendations based on weather
-    response = activity_agent(f"Recommend activities for this weather: {weather_info}")
+
+# -----------------------------------------------------------------------------
+# Activity Recommendation Agent
+# -----------------------------------------------------------------------------
+def recommend_activities(weather_info: str, cancel_signal=None) -> str:
+    # Borrow a pre-built activity recommendation agent from the pool
+    with activity_agent_pool.acquire() as activity_agent:
+        response = activity_agent(
+            f"Recommend activities for this weather: {weather_info}",
+            cancel_signal=cancel_signal,
+        )
 
     # Format the output with clear section headers
     formatted_response = f"""
@@ -148,6 +172,67 @@ def activity_recommender(weather_info: str) -> str:
     return formatted_response
 
 
+@tool
+def activity_recommender(weather_info: str) -> str:
+    """
+    Recommend activities based on weather conditions.
+
+    Args:
+        weather_info: Description of weather conditions
+
+    Returns:
+        List of recommended activities
+    """
+    return recommend_activities(weather_info)
+
+
+# -----------------------------------------------------------------------------
+# Multi-Location Planner (parallel fan-out)
+# -----------------------------------------------------------------------------
+# Each location is independent, so the weather -> activities pipeline of every
+# city runs concurrently: planning N cities takes about as long as planning one.
+SPECIALIST_TIMEOUT = 120.0  # seconds per city
+
+
+def plan_location(location: str, cancel_signal=None) -> str:
+    weather = analyze_weather(location, cancel_signal)
+    if cancel_signal is not None and cancel_signal.is_set():
+        return weather  # timed out: do not start the second agent
+    activities = recommend_activities(weather, cancel_signal)
+    return weather + activities
+
+
+@tool
+def multi_location_planner(locations: str) -> str:
+    """
+    Analyze the weather and recommend activities for several locations at once.
+
+    Args:
+        locations: Comma-separated list of cities or locations (e.g., 'Paris, Lyon')
+
+    Returns:
+        Weather analysis and activity recommendations for every location
+    """
+    cities = [c.strip() for c in locations.split(",") if c.strip()]
+    # A city that times out has its agents cancelled, so they return to the
+    # pools instead of running on in the background
+    cancel_signals = {city: threading.Event() for city in cities}
+    results = fan_out(
+        {city: (lambda city=city: plan_location(city, cancel_signals[city])) for city in cities},
+        max_workers=weather_agent_pool.max_size,
+        timeout=SPECIALIST_TIMEOUT,
+        on_timeout=lambda city: cancel_signals[city].set(),
+    )
+
+    sections = []
+    for city, result in results.items():
+        if result.ok:
+            sections.append(result.value)
+        else:
+            sections.append(f"\n📍 {city}: planning failed ({result.error})\n")
+    return "\n".join(sections)
+
+
 # -----------------------------------------------------------------------------
 # Main Orchestrator Agent
 # -----------------------------------------------------------------------------
@@ -162,13 +247,21 @@ def main():
         2. Then, use the activity_recommender tool to suggest activities based on the weather
         3. Finally, summarize the plan in a friendly, helpful way
         
+        When the user asks about several locations, call the multi_location_planner
+        tool ONCE with all of them (comma-separated) instead of steps 1 and 2: it
+        plans every location in parallel.
+        
         Always follow this sequence and clearly explain what you're doing at each step.
         Make your responses visually appealing and easy to understand.
         """,
-        tools=[weather_analyst, activity_recommender],
+        tools=[weather_analyst, activity_recommender, multi_location_planner],
         model=bedrock_model,
     )
 
+    # Pre-build one specialist of each kind so the first question is fast too
+    weather_agent_pool.warm(1)
+    activity_agent_pool.warm(1)
+
     # Print welcome message
     print(
         """
@@ -182,6 +275,9 @@ def main():
     while True:
         user_input = input("\n🔍 Your question (or 'exit' to quit): ")
         if user_input.lower() in ["exit", "quit", "q"]:
+            print("\nSpecialist agent pools:")
+            weather_agent_pool.print_stats()
+            activity_agent_pool.print_stats()
             print("\nThank you for using the Weather-Aware Activity Planner! Goodbye!")
             break
 
@@ -203,3 +299,4 @@ if __name__ == "__main__":
 # -----------------------------------------------------------------------------
 # Run this file with: python 3-strandAgentAsTools.py
 # -->Plan my activities for this week-end in Paris
+# -->Plan my week-end in Paris and Lyon
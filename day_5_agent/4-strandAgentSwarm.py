@@ -7,6 +7,7 @@
 # =============================================================================
 
 import logging
+import os
 from strands import Agent
 from strands.multiagent import Swarm
 from strands.models import BedrockModel
@@ -51,6 +52,17 @@ architect = Agent(
     model=bedrock_model,
 )
 
+# -----------------------------------------------------------------------------
+# Profiling (optional)
+# -----------------------------------------------------------------------------
+# Record per-node wall time, model latency, tokens and handoffs.
+# Disable with SWARM_PROFILE=0: no hooks are registered at all in that case.
+profiler = None
+if os.getenv("SWARM_PROFILE", "1") != "0":
+    from swarm_profiler import SwarmProfiler
+
+    profiler = SwarmProfiler().attach([researcher, coder, reviewer, architect])
+
 # -----------------------------------------------------------------------------
 # Swarm Configuration
 # -----------------------------------------------------------------------------
@@ -76,8 +88,15 @@ result = swarm("Design and implement a simple REST API for a todo app")
 print(f"Status: {result.status}")
 print(f"Node history: {[node.node_id for node in result.node_history]}")
 
+# Where did the time and tokens go?
+if profiler is not None:
+    profiler.print_summary()
+    profiler.export_chrome_trace("swarm_trace.json")
+
 
 # -----------------------------------------------------------------------------
 # Execution Instructions
 # -----------------------------------------------------------------------------
 # Run this file with: python 4-strandAgentSwarm.py
+# Open swarm_trace.json at https://ui.perfetto.dev to see the timeline
+# (set SWARM_PROFILE=0 to disable profiling)
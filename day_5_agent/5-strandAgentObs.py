@@ -6,21 +6,27 @@
 # =============================================================================
 
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from strands import Agent, tool
-from strands_tools import calculator
-from strands.models import BedrockModel
-from langfuse import Langfuse, observe
+from span_buffer import SpanBuffer
+from agent_tracing import TracingHooks, default_sinks, langfuse_sink_from_env
+from session_registry import SessionRegistry
+from model_router import ModelRouter, agent_caller
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Langfuse client
-langfuse = Langfuse(
-    public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
-    secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
-    host=os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com"),
-)
+# Agent turns, model calls and tool calls are recorded into an in-process ring
+# buffer and exported to Langfuse in batches on a background thread, so tracing
+# never adds network latency to the agent loop. Spans keep their recorded ids
+# and times, so each turn is one nested, session-tagged trace in Langfuse.
+span_buffer = SpanBuffer(sinks=default_sinks(langfuse_sink_from_env()))
+
+# Each message is sent to the cheapest model its difficulty allows (Nova Lite,
+# Nova Pro or Claude 3.7 Sonnet by default, see model_router.py); unsure
+# answers are retried on the next larger model.
+model_router = ModelRouter()
 
 
 # -----------------------------------------------------------------------------
@@ -78,32 +84,74 @@ def text_analyzer(text: str) -> dict:
     return analysis
 
 
+# -----------------------------------------------------------------------------
+# Session Registry
+# -----------------------------------------------------------------------------
+# One live agent (and model client) per session_id: repeat messages in a
+# session skip all construction and keep their conversation. Idle or least
+# recently used sessions are evicted, and spilled to SESSION_SPILL_DIR (if set)
+# so they can be rehydrated later.
+MAX_SESSIONS = 100
+SESSION_IDLE_TIMEOUT = 15 * 60  # seconds
+MAX_HISTORY_MESSAGES = 40  # message-count window kept per session (not a memory bound)
+
+
+@lru_cache(maxsize=None)
+def bedrock_model(model_id: str):
+    """One Bedrock model client per model id, shared by every session."""
+    from strands.models import BedrockModel
+
+    return BedrockModel(model_id=model_id)
+
+
+def build_agent(session_id: str) -> Agent:
+    # Deferred imports: only paid when the first session is created
+    from strands_tools import calculator
+    from strands.agent.conversation_manager import SlidingWindowConversationManager
+
+    # Create agent with tools, traced into the span buffer. The model router
+    # swaps in the model chosen for each message.
+    return Agent(
+        model=bedrock_model("eu.amazon.nova-pro-v1:0"),
+        tools=[calculator, web_search, text_analyzer],
+        hooks=[TracingHooks(span_buffer, session_id=session_id)],
+        conversation_manager=SlidingWindowConversationManager(
+            window_size=MAX_HISTORY_MESSAGES
+        ),
+    )
+
+
+agent_sessions = SessionRegistry(
+    build_agent,
+    max_sessions=MAX_SESSIONS,
+    idle_timeout=SESSION_IDLE_TIMEOUT,
+    spill_dir=os.getenv("SESSION_SPILL_DIR"),
+)
+
+
 # -----------------------------------------------------------------------------
 # Observed Agent Function
 # -----------------------------------------------------------------------------
-@observe(name="strands_agent_interaction")
 def run_agent_with_observability(message: str, session_id: str = "default"):
     """
-    Run the agent with full Langfuse observability tracking.
+    Run the agent with full observability tracking (buffered spans exported to Langfuse).
 
     Args:
         message (str): The user message to process
         session_id (str): Session identifier for tracking conversations
     """
-    # Configure Bedrock model
-    bedrock_model = BedrockModel(
-        model_id="eu.amazon.nova-pro-v1:0",
-    )
-
-    # Create agent with tools
-    agent = Agent(model=bedrock_model, tools=[calculator, web_search, text_analyzer])
-
     # Execute agent
     print(f"\n{'='*80}")
     print(f"USER MESSAGE: {message}")
     print(f"{'='*80}\n")
 
-    response = agent(message)
+    # Reuse the session's agent (built on the first message only). It is held
+    # for the whole call: other messages of the session wait for their turn
+    with agent_sessions.session(session_id) as agent:
+        response = model_router.route(
+            message,
+            agent_caller(agent, lambda route: bedrock_model(route["model_id"]), message),
+        )
 
     print(f"\n{'='*80}")
     print("AGENT RESPONSE COMPLETED")
@@ -138,8 +186,17 @@ if __name__ == "__main__":
     print("\n--- Example 2: Web Search Query ---")
     run_agent_with_observability(message_2, session_id="session_002")
 
-    # Flush Langfuse to ensure all traces are sent
-    langfuse.flush()
+    # Example 3: Follow-up in the first session (reuses its agent and history)
+    message_3 = "Double the result of the calculation you did earlier."
+
+    print("\n--- Example 3: Follow-up in session_001 ---")
+    run_agent_with_observability(message_3, session_id="session_001")
+
+    print(f"Session registry: {agent_sessions.summary()}")
+    model_router.print_report()
+
+    # Export the remaining buffered spans before exiting
+    span_buffer.shutdown()
 
     print("\n" + "=" * 80)
     print("DEMO COMPLETED - Check your Langfuse dashboard for traces!")
@@ -7,227 +7,53 @@
 # while maintaining full Langfuse observability.
 # =============================================================================
 
-import os
 import json
-from typing import Dict, List, Any
+import os
+import sys
+from functools import lru_cache
 from dotenv import load_dotenv
-from strands import Agent, tool
-from strands_tools import calculator
-from strands.models import BedrockModel
-from langfuse import Langfuse, observe
-from mcp import stdio_client, StdioServerParameters
-from strands.tools.mcp import MCPClient
+from mcp_manager import MCPConnectionManager
+from span_buffer import SpanBuffer
+from agent_tracing import TracingHooks, default_sinks, langfuse_sink_from_env, trace_tool_cache
+from model_router import ModelRouter, agent_caller
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Langfuse client
-langfuse = Langfuse(
-    public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
-    secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
-    host=os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com"),
-)
+# Agent turns, model calls and tool calls are recorded into an in-process ring
+# buffer and exported to Langfuse in batches on a background thread, so tracing
+# never adds network latency to the agent loop. Spans keep their recorded ids
+# and times, so each turn is one nested, session-tagged trace in Langfuse.
+span_buffer = SpanBuffer(sinks=default_sinks(langfuse_sink_from_env()))
 
-
-# =============================================================================
-# CUSTOM MCP SERVER IMPLEMENTATION
-# =============================================================================
-class AWSLabMCPServer:
-    """
-    A custom MCP (Model Context Protocol) server for managing AWS lab environments
-    and project resources. This demonstrates how to build domain-specific MCP servers.
-
-    This server manages:
-    - Student AWS lab configurations
-    - Project deployment status
-    - AWS service usage tracking
-    - Lab environment recommendations
-    """
-
-    def __init__(self):
-        # Simulated AWS lab configurations for students
-        self.lab_configs = {
-            "STU001": {
-                "name": "Alice Johnson",
-                "project": "RAG Chatbot",
-                "aws_services": ["Bedrock", "S3", "Lambda"],
-                "region": "us-east-1",
-                "status": "deployed",
-                "estimated_cost": "$12.50/month",
-                "last_deployment": "2025-10-25",
-            },
-            "STU002": {
-                "name": "Bob Smith",
-                "project": "Fine-tuning Pipeline",
-                "aws_services": ["SageMaker", "S3", "ECR"],
-                "region": "eu-west-3",
-                "status": "in-progress",
-                "estimated_cost": "$45.00/month",
-                "last_deployment": "2025-10-24",
-            },
-            "STU003": {
-                "name": "Carol Davis",
-                "project": "Bedrock Agent",
-                "aws_services": ["Bedrock Agents", "Lambda", "DynamoDB", "SNS"],
-                "region": "us-east-1",
-                "status": "testing",
-                "estimated_cost": "$8.75/month",
-                "last_deployment": "2025-10-26",
-            },
-        }
-
-        # AWS service recommendations based on use cases
-        self.service_recommendations = {
-            "rag": {
-                "services": [
-                    "Amazon Bedrock Knowledge Bases",
-                    "Amazon OpenSearch",
-                    "S3",
-                    "Lambda",
-                ],
-                "estimated_cost": "$10-50/month",
-                "difficulty": "Intermediate",
-            },
-            "fine-tuning": {
-                "services": ["Amazon SageMaker", "S3", "ECR", "CloudWatch"],
-                "estimated_cost": "$40-200/month",
-                "difficulty": "Advanced",
-            },
-            "agents": {
-                "services": ["Amazon Bedrock Agents", "Lambda", "DynamoDB", "SNS"],
-                "estimated_cost": "$5-30/month",
-                "difficulty": "Intermediate",
-            },
-            "inference-optimization": {
-                "services": ["Amazon Bedrock", "Lambda", "API Gateway", "CloudWatch"],
-                "estimated_cost": "$15-100/month",
-                "difficulty": "Advanced",
-            },
-        }
-
-    def get_lab_config(self, student_id: str) -> Dict[str, Any]:
-        """Retrieve AWS lab configuration for a student."""
-        return self.lab_configs.get(
-            student_id.upper(),
-            {"error": f"No lab configuration found for {student_id}"},
-        )
-
-    def get_service_recommendations(self, use_case: str) -> Dict[str, Any]:
-        """Get AWS service recommendations for a specific use case."""
-        use_case_lower = use_case.lower()
-        for key, value in self.service_recommendations.items():
-            if key in use_case_lower:
-                return {"use_case": key, **value}
-        return {"error": f"No recommendations found for use case: {use_case}"}
-
-    def list_all_projects(self) -> List[Dict[str, str]]:
-        """List all student projects and their status."""
-        return [
-            {
-                "student_id": student_id,
-                "name": config["name"],
-                "project": config["project"],
-                "status": config["status"],
-            }
-            for student_id, config in self.lab_configs.items()
-        ]
-
-    def estimate_cost(
-        self, services: List[str], hours_per_month: int = 720
-    ) -> Dict[str, Any]:
-        """Estimate AWS costs for given services."""
-        # Simplified cost estimation (educational purposes)
-        cost_per_service = {
-            "Bedrock": 0.005 * hours_per_month,  # Per request pricing simplified
-            "S3": 2.00,  # Storage
-            "Lambda": 0.20 * (hours_per_month / 100),  # Invocations
-            "SageMaker": 0.269 * (hours_per_month / 24),  # ml.m5.xlarge
-            "DynamoDB": 1.25,  # On-demand pricing
-            "SNS": 0.50,  # Notifications
-            "Bedrock Agents": 0.01 * hours_per_month,
-            "ECR": 1.00,
-            "CloudWatch": 0.30,
-            "OpenSearch": 15.00,
-            "API Gateway": 3.50,
-        }
-
-        total = sum(cost_per_service.get(service, 5.0) for service in services)
-
-        return {
-            "services": services,
-            "estimated_monthly_cost": f"${total:.2f}",
-            "breakdown": {
-                service: f"${cost_per_service.get(service, 5.0):.2f}"
-                for service in services
-            },
-        }
+# Each request is sent to the cheapest model its difficulty allows, with
+# unsure answers retried on the next larger model (see model_router.py)
+model_router = ModelRouter()
 
 
 # =============================================================================
-# CUSTOM MCP-CONNECTED TOOLS
+# CUSTOM MCP SERVER (AWS Lab MCP)
 # =============================================================================
-# Initialize the custom AWS Lab MCP server
-aws_lab_mcp = AWSLabMCPServer()
-
-
-@tool
-def get_student_lab_config(student_id: str) -> str:
-    """
-    Get AWS lab configuration for a specific student including their project,
-    deployed services, region, and estimated costs.
-
-    Args:
-        student_id (str): The student ID to look up (e.g., 'STU001')
-
-    Returns:
-        str: Student's AWS lab configuration as formatted JSON
-    """
-    result = aws_lab_mcp.get_lab_config(student_id)
-    return json.dumps(result, indent=2)
-
-
-@tool
-def get_aws_recommendations(use_case: str) -> str:
-    """
-    Get AWS service recommendations for a specific use case like RAG,
-    fine-tuning, agents, or inference optimization.
-
-    Args:
-        use_case (str): The use case (e.g., 'rag', 'fine-tuning', 'agents')
-
-    Returns:
-        str: Recommended AWS services with cost estimates and difficulty level
-    """
-    result = aws_lab_mcp.get_service_recommendations(use_case)
-    return json.dumps(result, indent=2)
-
-
-@tool
-def list_student_projects() -> str:
-    """
-    List all student projects with their current deployment status.
-
-    Returns:
-        str: List of all projects as formatted JSON
-    """
-    projects = aws_lab_mcp.list_all_projects()
-    return json.dumps(projects, indent=2)
-
+# The custom AWS Lab MCP server lives in aws_lab_mcp_server.py and runs as its
+# own stdio MCP server process. It serves student lab configurations, service
+# recommendations, the project list and cost estimates from precomputed
+# indexes loaded from data/aws_lab_data.json.
+AWS_LAB_SERVER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "aws_lab_mcp_server.py"
+)
 
-@tool
-def estimate_aws_cost(services: str) -> str:
-    """
-    Estimate monthly AWS costs for a comma-separated list of services.
 
-    Args:
-        services (str): Comma-separated AWS service names (e.g., 'Bedrock,S3,Lambda')
+# The MCP client stack is imported by the factories, i.e. when the connection
+# manager starts the servers, not when this module is loaded.
+def build_aws_lab_client():
+    from mcp import stdio_client, StdioServerParameters
+    from strands.tools.mcp import MCPClient
 
-    Returns:
-        str: Cost estimate with breakdown as formatted JSON
-    """
-    service_list = [s.strip() for s in services.split(",")]
-    result = aws_lab_mcp.estimate_cost(service_list)
-    return json.dumps(result, indent=2)
+    return MCPClient(
+        lambda: stdio_client(
+            StdioServerParameters(command=sys.executable, args=[AWS_LAB_SERVER])
+        )
+    )
 
 
 # =============================================================================
@@ -236,12 +62,34 @@ def estimate_aws_cost(services: str) -> str:
 # This integrates the official AWS Documentation MCP server from AWS Labs.
 # It provides real-time access to AWS service documentation.
 # Installation: uvx awslabs.aws-documentation-mcp-server@latest
-stdio_mcp_client = MCPClient(
-    lambda: stdio_client(
-        StdioServerParameters(
-            command="uvx", args=["awslabs.aws-documentation-mcp-server@latest"]
+def build_aws_docs_client():
+    from mcp import stdio_client, StdioServerParameters
+    from strands.tools.mcp import MCPClient
+
+    return MCPClient(
+        lambda: stdio_client(
+            StdioServerParameters(
+                command="uvx", args=["awslabs.aws-documentation-mcp-server@latest"]
+            )
         )
     )
+
+
+# The connection manager starts every MCP server concurrently, keeps them
+# alive with health checks and caches their tool schemas, so creating an agent
+# per request does no MCP round trip. The AWS Lab server's cache_stats tool is
+# hidden from agents: it only feeds the tracing below.
+mcp_manager = MCPConnectionManager(
+    {"aws-lab": build_aws_lab_client, "aws-docs": build_aws_docs_client},
+    health_check_interval=60.0,
+    hidden_tools=["cache_stats"],
+)
+
+# The AWS Lab tool caches live in the MCP server process: their hits and
+# misses since the previous request are recorded as `cache:<tool>` spans
+poll_cache_stats = trace_tool_cache(
+    span_buffer,
+    remote_stats={"aws-lab": lambda: json.loads(mcp_manager.call_tool("aws-lab", "cache_stats"))},
 )
 
 
@@ -249,9 +97,19 @@ stdio_mcp_client = MCPClient(
 # MAIN EXECUTION
 # =============================================================================
 if __name__ == "__main__":
-    with stdio_mcp_client:
+    from strands import Agent
+    from strands_tools import calculator
+    from strands.models import BedrockModel
+
+    @lru_cache(maxsize=None)
+    def bedrock_model(model_id: str):
+        return BedrockModel(model_id=model_id)
+
+    def route_model(route):
+        return bedrock_model(route["model_id"])
+
+    with mcp_manager:
 
-        @observe(name="strands_agent_mcp_interaction")
         def run_agent_with_mcp(message: str, session_id: str = "default"):
             """
             Run the agent with dual MCP server integration:
@@ -264,34 +122,29 @@ if __name__ == "__main__":
                 message (str): The user message to process
                 session_id (str): Session identifier for tracking conversations
             """
-            # Configure Bedrock model
-            bedrock_model = BedrockModel(
-                model_id="eu.amazon.nova-pro-v1:0",
-            )
-
-            # Combine custom tools with AWS Documentation MCP tools
+            # Combine custom AWS Lab MCP tools with AWS Documentation MCP tools
             # This demonstrates how agents can use multiple MCP servers simultaneously
-            custom_tools = [
-                calculator,
-                get_student_lab_config,
-                get_aws_recommendations,
-                list_student_projects,
-                estimate_aws_cost,
-            ]
+            custom_tools = [calculator] + mcp_manager.tools("aws-lab")
 
-            # Add AWS Documentation MCP tools
-            aws_docs_tools = [t for t in stdio_mcp_client.list_tools_sync()]
+            # Add AWS Documentation MCP tools (cached by the connection manager)
+            aws_docs_tools = mcp_manager.tools("aws-docs")
 
             all_tools = custom_tools + aws_docs_tools
 
-            agent = Agent(model=bedrock_model, tools=all_tools)
+            # The model router picks the model (and swaps it on escalation)
+            agent = Agent(
+                model=route_model(model_router.policy["routes"][0]),
+                tools=all_tools,
+                hooks=[TracingHooks(span_buffer, session_id=session_id)],
+            )
 
             # Execute agent
             print(f"\n{'='*80}")
             print(f"USER MESSAGE: {message}")
             print(f"{'='*80}\n")
 
-            response = agent(message)
+            response = model_router.route(message, agent_caller(agent, route_model, message))
+            poll_cache_stats()
 
             print(f"\n{'='*80}")
             print("AGENT RESPONSE COMPLETED")
@@ -347,8 +200,11 @@ if __name__ == "__main__":
         print("\n--- Example 4: Cost Analysis and Planning ---")
         run_agent_with_mcp(message_4, session_id="mcp_session_004")
 
-        # Flush Langfuse to ensure all traces are sent
-        langfuse.flush()
+        model_router.print_report()
+        print(f"AWS Lab tool cache: {mcp_manager.call_tool('aws-lab', 'cache_stats')}")
+
+        # Export the remaining buffered spans before exiting
+        span_buffer.shutdown()
 
         print("\n" + "=" * 80)
         print("DUAL MCP DEMO COMPLETED!")
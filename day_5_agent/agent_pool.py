@@ -0,0 +1,209 @@
+# =============================================================================
+# AGENT POOL
+# =============================================================================
+# Keeps pre-built specialist agents warm so agents-as-tools do not rebuild
+# their Agent (system prompt, tool registry, model client) on every call.
+#
+# An agent is checked out for exactly one conversation at a time. When it is
+# returned, its conversation history, agent.state and conversation-manager
+# state are put back to what they were right after construction, so callers
+# always get a "fresh" agent without paying the construction cost again.
+# =============================================================================
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+
+def snapshot_agent(agent) -> Dict[str, Any]:
+    """
+    Capture the resettable state of a freshly built Strands Agent: agent.state
+    and the conversation manager's state (removed message count, summary...).
+    """
+    snapshot = {"state": agent.state.get() if hasattr(agent, "state") else {}}
+    manager = getattr(agent, "conversation_manager", None)
+    if manager is not None and hasattr(manager, "get_state"):
+        snapshot["conversation_manager"] = manager.get_state()
+    return snapshot
+
+
+def reset_agent(agent, snapshot: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Clear the conversation state of a Strands Agent so it can be reused:
+    messages are emptied, agent.state and the conversation manager go back to
+    `snapshot` (from snapshot_agent), or to empty when there is none.
+    """
+    agent.messages.clear()
+
+    snapshot = snapshot or {}
+    if hasattr(agent, "state"):
+        for key in list(agent.state.get()):
+            agent.state.delete(key)
+        for key, value in snapshot.get("state", {}).items():
+            agent.state.set(key, value)
+
+    manager = getattr(agent, "conversation_manager", None)
+    if manager is None:
+        return
+    if "conversation_manager" in snapshot:
+        manager.restore_from_session(snapshot["conversation_manager"])
+    elif hasattr(manager, "removed_message_count"):
+        manager.removed_message_count = 0
+
+
+class AgentPool:
+    """
+    A bounded, thread-safe pool of agents built by `factory`.
+
+    - At most `max_size` agents are ever built; when all of them are busy,
+      acquire() waits (up to `timeout` seconds) for one to be returned.
+    - Agents can be pre-built with warm() at startup.
+    - Construction and reuse timings are recorded and available via stats();
+      the first checkout of a pre-built agent counts as a warm hit, not a reuse.
+    - Returned agents are reset with reset_agent() to their post-construction
+      snapshot, or with `reset(agent)` when one is given.
+
+    Usage:
+        pool = AgentPool(build_weather_agent, max_size=4, name="weather")
+        with pool.acquire() as agent:
+            response = agent("Analyze the weather in Paris")
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        max_size: int = 4,
+        name: str = "agent",
+        reset: Optional[Callable[[object], None]] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.factory = factory
+        self.max_size = max_size
+        self.name = name
+        self.reset = reset
+
+        self._idle: List[object] = []
+        self._snapshots: Dict[int, Dict[str, Any]] = {}  # id(agent) -> post-construction state
+        self._checked_out_before = set()  # id(agent) of agents that served a call
+        self._warm_hits = 0
+        self._created = 0
+        self._condition = threading.Condition()
+
+        self._construction_times: List[float] = []
+        self._reuse_times: List[float] = []
+
+    def warm(self, count: Optional[int] = None) -> None:
+        """Pre-build `count` agents (defaults to max_size)."""
+        count = self.max_size if count is None else min(count, self.max_size)
+        agents = []
+        for _ in range(count):
+            agent = self._build()
+            if agent is None:
+                break
+            agents.append(agent)
+        with self._condition:
+            self._idle.extend(agents)
+            self._condition.notify_all()
+
+    def _build(self):
+        """Build a new agent if the pool still has capacity, else return None."""
+        with self._condition:
+            if self._created >= self.max_size:
+                return None
+            self._created += 1
+
+        start = time.perf_counter()
+        try:
+            agent = self.factory()
+        except Exception:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+        elapsed = time.perf_counter() - start
+        snapshot = snapshot_agent(agent) if self.reset is None else None
+
+        with self._condition:
+            self._construction_times.append(elapsed)
+            self._snapshots[id(agent)] = snapshot
+        return agent
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Check out an agent for the duration of the `with` block.
+
+        Raises:
+            TimeoutError: if no agent becomes available within `timeout` seconds
+        """
+        start = time.perf_counter()
+        agent = None
+
+        with self._condition:
+            if self._idle:
+                agent = self._idle.pop()
+            elif self._created >= self.max_size:
+                if not self._condition.wait_for(lambda: self._idle, timeout=timeout):
+                    raise TimeoutError(
+                        f"No '{self.name}' agent available after {timeout}s "
+                        f"(pool size {self.max_size})"
+                    )
+                agent = self._idle.pop()
+            if agent is not None:
+                if id(agent) in self._checked_out_before:
+                    self._reuse_times.append(time.perf_counter() - start)
+                else:
+                    self._warm_hits += 1  # pre-built by warm(), first use
+                self._checked_out_before.add(id(agent))
+
+        if agent is None:
+            agent = self._build()
+            if agent is None:
+                # Another thread filled the pool in the meantime: wait for a slot
+                with self.acquire(timeout=timeout) as pooled:
+                    yield pooled
+                return
+            with self._condition:
+                self._checked_out_before.add(id(agent))
+
+        try:
+            yield agent
+        finally:
+            if self.reset is None:
+                reset_agent(agent, self._snapshots.get(id(agent)))
+            else:
+                self.reset(agent)
+            with self._condition:
+                self._idle.append(agent)
+                self._condition.notify()
+
+    def stats(self) -> Dict[str, float]:
+        """Construction-vs-reuse timing summary."""
+        with self._condition:
+            built = len(self._construction_times)
+            reused = len(self._reuse_times)
+            return {
+                "name": self.name,
+                "max_size": self.max_size,
+                "built": built,
+                "warm_hits": self._warm_hits,
+                "reused": reused,
+                "avg_construction_ms": (
+                    sum(self._construction_times) / built * 1000 if built else 0.0
+                ),
+                "avg_reuse_ms": (
+                    sum(self._reuse_times) / reused * 1000 if reused else 0.0
+                ),
+            }
+
+    def print_stats(self) -> None:
+        s = self.stats()
+        print(
+            f"[{s['name']}] built {s['built']}/{s['max_size']} agents "
+            f"(avg {s['avg_construction_ms']:.1f} ms each, {s['warm_hits']} pre-built by warm()), "
+            f"reused {s['reused']} times "
+            f"(avg checkout {s['avg_reuse_ms']:.3f} ms)"
+        )
@@ -0,0 +1,194 @@
+# =============================================================================
+# AGENT TRACING HOOKS
+# =============================================================================
+# Strands hook provider that records agent turns, model calls and tool calls
+# into a SpanBuffer. Hooks only create small in-memory records; exporting to
+# Langfuse or any other sink happens on the buffer's background thread.
+# =============================================================================
+
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from strands.hooks import (
+    AfterInvocationEvent,
+    AfterModelCallEvent,
+    AfterToolCallEvent,
+    BeforeInvocationEvent,
+    BeforeModelCallEvent,
+    BeforeToolCallEvent,
+    HookProvider,
+    HookRegistry,
+)
+
+import tool_cache
+from span_buffer import LangfuseSink, OTLPJsonFileSink, SpanBuffer, SpanRecord
+
+logger = logging.getLogger(__name__)
+
+
+def _usage(agent) -> Tuple[int, int]:
+    """(input, output) tokens the agent has used since it was built."""
+    usage = agent.event_loop_metrics.accumulated_usage
+    return usage.get("inputTokens", 0), usage.get("outputTokens", 0)
+
+
+def _message_text(messages) -> Optional[str]:
+    """Text of the last message of an invocation's input, if any."""
+    if not messages:
+        return None
+    content = messages[-1].get("content", [])
+    return "\n".join(block["text"] for block in content if "text" in block) or None
+
+
+class TracingHooks(HookProvider):
+    """
+    Record an `agent_turn` span per invocation, with `model_call` and
+    `tool_call` child spans. The turn carries the session id, the user input
+    and the final answer, which the Langfuse sink puts on the trace.
+
+    Usage:
+        agent = Agent(model=model, tools=tools, hooks=[TracingHooks(buffer, session_id)])
+    """
+
+    def __init__(self, buffer: SpanBuffer, session_id: Optional[str] = None):
+        self.buffer = buffer
+        self.session_id = session_id
+        self._turn: Optional[SpanRecord] = None
+        self._usage_before: Tuple[int, int] = (0, 0)
+        self._model: Optional[SpanRecord] = None
+        self._tools: Dict[str, SpanRecord] = {}
+
+    def register_hooks(self, registry: HookRegistry, **kwargs) -> None:
+        registry.add_callback(BeforeInvocationEvent, self._before_invocation)
+        registry.add_callback(AfterInvocationEvent, self._after_invocation)
+        registry.add_callback(BeforeModelCallEvent, self._before_model)
+        registry.add_callback(AfterModelCallEvent, self._after_model)
+        registry.add_callback(BeforeToolCallEvent, self._before_tool)
+        registry.add_callback(AfterToolCallEvent, self._after_tool)
+
+    def _before_invocation(self, event: BeforeInvocationEvent) -> None:
+        # accumulated_usage covers the agent's whole life (session agents serve
+        # many turns): the turn records the difference
+        self._usage_before = _usage(event.agent)
+        self._turn = self.buffer.start_span(
+            "agent_turn",
+            kind="agent",
+            agent=event.agent.name,
+            session_id=self.session_id,
+            input=_message_text(getattr(event, "messages", None)),
+        )
+
+    def _after_invocation(self, event: AfterInvocationEvent) -> None:
+        if self._turn is None:
+            return
+        input_after, output_after = _usage(event.agent)
+        input_tokens = input_after - self._usage_before[0]
+        output_tokens = output_after - self._usage_before[1]
+        result = getattr(event, "result", None)
+        self.buffer.end_span(
+            self._turn,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+            output=str(result) if result is not None else None,
+        )
+        self._turn = None
+
+    def _before_model(self, event: BeforeModelCallEvent) -> None:
+        self._model = self.buffer.start_span("model_call", kind="model", parent=self._turn)
+
+    def _after_model(self, event: AfterModelCallEvent) -> None:
+        if self._model is None:
+            return
+        if event.exception is not None:
+            self.buffer.end_span(self._model, status="error", error=repr(event.exception))
+        else:
+            self.buffer.end_span(self._model)
+        self._model = None
+
+    def _before_tool(self, event: BeforeToolCallEvent) -> None:
+        tool_use = event.tool_use
+        self._tools[tool_use["toolUseId"]] = self.buffer.start_span(
+            f"tool:{tool_use['name']}", kind="tool", parent=self._turn, tool=tool_use["name"]
+        )
+
+    def _after_tool(self, event: AfterToolCallEvent) -> None:
+        span = self._tools.pop(event.tool_use["toolUseId"], None)
+        if span is None:
+            return
+        status = "ok"
+        if event.exception is not None or event.result.get("status") == "error":
+            status = "error"
+        self.buffer.end_span(span, status=status)
+
+
+def trace_tool_cache(
+    buffer: SpanBuffer,
+    remote_stats: Optional[Dict[str, Callable[[], Dict[str, Dict[str, Any]]]]] = None,
+) -> Callable[[], None]:
+    """
+    Record memoized tool lookups as `cache:<tool>` spans.
+
+    In-process caches record one span per lookup (hit=True/False). Caches in
+    other processes, such as the tools of an MCP server, are read through
+    `remote_stats` (source -> function returning that process's
+    tool_cache.stats()). Call the returned poll() after each request: it
+    records one span per tool with the hits and misses since the last poll.
+    """
+
+    def record(name: str, event: str) -> None:
+        buffer.end_span(
+            buffer.start_span(f"cache:{name}", kind="cache", tool=name, hit=event == "hit")
+        )
+
+    tool_cache.subscribe(record)
+    seen: Dict[tuple, Dict[str, int]] = {}
+
+    def poll() -> None:
+        for source, fetch in (remote_stats or {}).items():
+            try:
+                stats = fetch()
+            except Exception:
+                logger.exception("Could not read the tool cache stats of %s", source)
+                continue
+            for name, counters in stats.items():
+                previous = seen.get((source, name), {})
+                if counters["hits"] < previous.get("hits", 0) or counters["misses"] < previous.get("misses", 0):
+                    previous = {}  # the server restarted, its counters too
+                hits = counters["hits"] - previous.get("hits", 0)
+                misses = counters["misses"] - previous.get("misses", 0)
+                seen[(source, name)] = counters
+                if hits or misses:
+                    buffer.end_span(
+                        buffer.start_span(
+                            f"cache:{name}", kind="cache", tool=name, source=source, hits=hits, misses=misses
+                        )
+                    )
+
+    return poll
+
+
+def langfuse_sink_from_env() -> Optional[LangfuseSink]:
+    """LangfuseSink from the LANGFUSE_* environment variables, None without keys."""
+    public_key, secret_key = os.getenv("LANGFUSE_PUBLIC_KEY"), os.getenv("LANGFUSE_SECRET_KEY")
+    if not public_key or not secret_key:
+        return None
+    return LangfuseSink(
+        host=os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com"),
+        public_key=public_key,
+        secret_key=secret_key,
+    )
+
+
+def default_sinks(langfuse_sink: Optional[LangfuseSink] = None) -> List[object]:
+    """
+    Sinks configured for the demos: Langfuse when a sink is given, plus an
+    OTLP-JSON file when SPAN_OTLP_FILE is set.
+    """
+    sinks = []
+    if langfuse_sink is not None:
+        sinks.append(langfuse_sink)
+    if os.getenv("SPAN_OTLP_FILE"):
+        sinks.append(OTLPJsonFileSink(os.environ["SPAN_OTLP_FILE"]))
+    return sinks
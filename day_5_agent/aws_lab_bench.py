@@ -0,0 +1,177 @@
+# =============================================================================
+# AWS LAB MCP SERVER BENCHMARK
+# =============================================================================
+# Generates a synthetic lab dataset (thousands of students, hundreds of use
+# cases) and measures:
+#   1. in-process lookups: the original linear scan / per-call price rebuild
+#      vs the precomputed indexes of AWSLabMCPServer
+#   2. request throughput of the stdio MCP server under concurrent requests
+# =============================================================================
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from aws_lab_mcp_server import AWSLabMCPServer, DEFAULT_DATA_FILE
+
+SERVICES = ["Bedrock", "S3", "Lambda", "SageMaker", "DynamoDB", "SNS", "ECR", "CloudWatch"]
+
+
+def synthetic_data(n_students: int, n_use_cases: int) -> dict:
+    with open(DEFAULT_DATA_FILE) as f:
+        data = json.load(f)
+
+    rng = random.Random(42)
+    data["lab_configs"] = {
+        f"STU{i:06d}": {
+            "name": f"Student {i}",
+            "project": f"Project {i % 97}",
+            "aws_services": rng.sample(SERVICES, 3),
+            "region": rng.choice(["us-east-1", "eu-west-3"]),
+            "status": rng.choice(["deployed", "in-progress", "testing"]),
+            "estimated_cost": f"${rng.uniform(5, 50):.2f}/month",
+            "last_deployment": "2025-10-25",
+        }
+        for i in range(n_students)
+    }
+    for i in range(n_use_cases):
+        data["service_recommendations"][f"usecase{i:05d}"] = {
+            "services": rng.sample(SERVICES, 3),
+            "estimated_cost": "$10-50/month",
+            "difficulty": "Intermediate",
+        }
+    return data
+
+
+# -----------------------------------------------------------------------------
+# Original (pre-index) implementations, for comparison
+# -----------------------------------------------------------------------------
+def linear_recommendations(recommendations: dict, use_case: str) -> dict:
+    use_case_lower = use_case.lower()
+    for key, value in recommendations.items():
+        if key in use_case_lower:
+            return {"use_case": key, **value}
+    return {"error": f"No recommendations found for use case: {use_case}"}
+
+
+def rebuilt_estimate(lab: AWSLabMCPServer, services: list, hours_per_month: int = 720) -> dict:
+    cost_per_service = lab._build_price_table(hours_per_month)
+    total = sum(cost_per_service.get(s, 5.0) for s in services)
+    return {
+        "services": services,
+        "estimated_monthly_cost": f"${total:.2f}",
+        "breakdown": {s: f"${cost_per_service.get(s, 5.0):.2f}" for s in services},
+    }
+
+
+def ops_per_second(fn, queries) -> float:
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def bench_in_process(data: dict, n_queries: int) -> None:
+    lab = AWSLabMCPServer(data)
+    rng = random.Random(0)
+    n_use_cases = len(data["service_recommendations"])
+    queries = [
+        f"I need help with usecase{rng.randrange(n_use_cases - 4):05d} for my project"
+        for _ in range(n_queries)
+    ]
+    service_lists = [rng.sample(SERVICES, 4) for _ in range(n_queries)]
+
+    print(f"In-process lookups ({n_queries:,} queries):")
+    print(f"{'operation':<32}{'before ops/s':>15}{'after ops/s':>15}")
+    rows = [
+        (
+            "get_service_recommendations",
+            lambda q: linear_recommendations(lab.service_recommendations, q),
+            lab.get_service_recommendations,
+            queries,
+        ),
+        (
+            "estimate_cost",
+            lambda s: rebuilt_estimate(lab, s),
+            lab.estimate_cost,
+            service_lists,
+        ),
+    ]
+    for name, before, after, inputs in rows:
+        print(f"{name:<32}{ops_per_second(before, inputs):>15,.0f}{ops_per_second(after, inputs):>15,.0f}")
+
+
+async def bench_mcp(data_file: str, n_requests: int, concurrency: int, n_students: int) -> None:
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    server = os.path.join(os.path.dirname(os.path.abspath(__file__)), "aws_lab_mcp_server.py")
+    params = StdioServerParameters(
+        command=sys.executable, args=[server], env={**os.environ, "AWS_LAB_DATA": data_file}
+    )
+    rng = random.Random(1)
+    calls = [
+        rng.choice(
+            [
+                ("get_student_lab_config", {"student_id": f"STU{rng.randrange(n_students):06d}"}),
+                ("get_aws_recommendations", {"use_case": "fine tuning"}),
+                ("estimate_aws_cost", {"services": "Bedrock,S3,Lambda"}),
+            ]
+        )
+        for _ in range(n_requests)
+    ]
+
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def call(name, arguments):
+                async with semaphore:
+                    await session.call_tool(name, arguments)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(call(name, args) for name, args in calls))
+            elapsed = time.perf_counter() - start
+
+    print(
+        f"\nMCP server over stdio: {n_requests:,} requests, concurrency {concurrency}: "
+        f"{n_requests / elapsed:,.0f} req/s ({elapsed / n_requests * 1000:.2f} ms/request)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the AWS Lab MCP server")
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--use-cases", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--skip-mcp", action="store_true", help="only run the in-process part")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 80)
+    print(f"AWS LAB MCP BENCHMARK - {args.students:,} students, {args.use_cases} use cases")
+    print("=" * 80 + "\n")
+
+    data = synthetic_data(args.students, args.use_cases)
+    bench_in_process(data, args.queries)
+
+    if not args.skip_mcp:
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(data, f)
+        try:
+            asyncio.run(bench_mcp(f.name, args.requests, args.concurrency, args.students))
+        finally:
+            os.remove(f.name)
+
+
+# -----------------------------------------------------------------------------
+# Execution Instructions
+# -----------------------------------------------------------------------------
+# Run this file with: python aws_lab_bench.py [--students 5000] [--skip-mcp]
@@ -0,0 +1,214 @@
+# =============================================================================
+# AWS LAB MCP SERVER
+# =============================================================================
+# A custom MCP (Model Context Protocol) server for managing AWS lab
+# environments and project resources, served over stdio so any MCP client
+# (Strands agents, Claude Desktop, the MCP inspector...) can use it.
+#
+# The lab data lives in data/aws_lab_data.json (override with AWS_LAB_DATA)
+# and is loaded once into precomputed indexes:
+#   - lab configurations by student id
+#   - a keyword index for service recommendations
+#   - the project list
+#   - price tables per hours_per_month value
+#
+# The tool handlers are async and only do dictionary lookups, so the server
+# answers concurrent requests without blocking. Their serialised responses are
+# memoized (tool_cache.memoize), so repeated questions skip the json.dumps.
+# The `cache_stats` tool returns the hit/miss counters of those caches, so the
+# agent process can trace them (agent_tracing.trace_tool_cache).
+#
+# Run it with: python aws_lab_mcp_server.py
+# =============================================================================
+
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, List
+
+import tool_cache
+from tool_cache import memoize
+
+DEFAULT_DATA_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "aws_lab_data.json"
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _normalize_keyword(keyword: str) -> str:
+    return "-".join(_WORD.findall(keyword.lower()))
+
+
+def _service_list(services: str) -> List[str]:
+    return [s.strip() for s in services.split(",")]
+
+
+class AWSLabMCPServer:
+    """
+    Indexed AWS lab data backing the MCP tools.
+
+    This server manages:
+    - Student AWS lab configurations
+    - Project deployment status
+    - AWS service usage tracking
+    - Lab environment recommendations
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.lab_configs = {sid.upper(): cfg for sid, cfg in data["lab_configs"].items()}
+        self.service_recommendations = data["service_recommendations"]
+        self.service_prices = data["service_prices"]
+        self.default_service_price = data.get("default_service_price", 5.0)
+
+        # Recommendations without their lookup keywords, and keyword -> use case
+        # (the first use case in file order wins when keywords overlap)
+        self._recommendations = {}
+        self._keyword_index = {}
+        self._priority = {}
+        for priority, (use_case, rec) in enumerate(self.service_recommendations.items()):
+            self._recommendations[use_case] = {
+                "use_case": use_case,
+                **{k: v for k, v in rec.items() if k != "keywords"},
+            }
+            self._priority[use_case] = priority
+            for keyword in [use_case, *rec.get("keywords", [])]:
+                self._keyword_index.setdefault(_normalize_keyword(keyword), use_case)
+
+        self._projects = [
+            {
+                "student_id": student_id,
+                "name": config["name"],
+                "project": config["project"],
+                "status": config["status"],
+            }
+            for student_id, config in self.lab_configs.items()
+        ]
+
+        self.price_table = lru_cache(maxsize=32)(self._build_price_table)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_DATA_FILE) -> "AWSLabMCPServer":
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def _build_price_table(self, hours_per_month: int) -> Dict[str, float]:
+        """Monthly cost per service: fixed + rate * hours_per_month / per_hours."""
+        return {
+            service: price.get("fixed", 0.0)
+            + price.get("rate", 0.0) * hours_per_month / price.get("per_hours", 1)
+            for service, price in self.service_prices.items()
+        }
+
+    def get_lab_config(self, student_id: str) -> Dict[str, Any]:
+        """Retrieve AWS lab configuration for a student."""
+        return self.lab_configs.get(
+            student_id.upper(),
+            {"error": f"No lab configuration found for {student_id}"},
+        )
+
+    def get_service_recommendations(self, use_case: str) -> Dict[str, Any]:
+        """Get AWS service recommendations for a specific use case."""
+        # Look up every word of the query plus joined word pairs
+        # ('fine tuning' -> 'fine-tuning' and 'finetuning')
+        index = self._keyword_index
+        best = None
+        previous = None
+        for word in _WORD.findall(use_case.lower()):
+            for keyword in (
+                (word,)
+                if previous is None
+                else (word, f"{previous}-{word}", previous + word)
+            ):
+                match = index.get(keyword)
+                if match is not None and (
+                    best is None or self._priority[match] < self._priority[best]
+                ):
+                    best = match
+            previous = word
+        if best is not None:
+            return self._recommendations[best]
+        return {"error": f"No recommendations found for use case: {use_case}"}
+
+    def list_all_projects(self) -> List[Dict[str, str]]:
+        """List all student projects and their status."""
+        return self._projects
+
+    def estimate_cost(
+        self, services: List[str], hours_per_month: int = 720
+    ) -> Dict[str, Any]:
+        """Estimate AWS costs for given services."""
+        prices = self.price_table(hours_per_month)
+        costs = [prices.get(service, self.default_service_price) for service in services]
+
+        return {
+            "services": services,
+            "estimated_monthly_cost": f"${sum(costs):.2f}",
+            "breakdown": {service: f"${cost:.2f}" for service, cost in zip(services, costs)},
+        }
+
+
+# =============================================================================
+# MCP SERVER
+# =============================================================================
+def build_server(lab: AWSLabMCPServer):
+    """Expose the lab data as MCP tools on a FastMCP server."""
+    from mcp.server.fastmcp import FastMCP
+
+    mcp = FastMCP("aws-lab")
+
+    # The lab data is loaded once per process, so cached responses never go
+    # stale; the caches are only size-bounded.
+    @mcp.tool()
+    @memoize(maxsize=1024)
+    async def get_student_lab_config(student_id: str) -> str:
+        """
+        Get AWS lab configuration for a specific student including their project,
+        deployed services, region, and estimated costs.
+
+        Args:
+            student_id: The student ID to look up (e.g., 'STU001')
+        """
+        return json.dumps(lab.get_lab_config(student_id), indent=2)
+
+    @mcp.tool()
+    @memoize(maxsize=1024)
+    async def get_aws_recommendations(use_case: str) -> str:
+        """
+        Get AWS service recommendations for a specific use case like RAG,
+        fine-tuning, agents, or inference optimization.
+
+        Args:
+            use_case: The use case (e.g., 'rag', 'fine-tuning', 'agents')
+        """
+        return json.dumps(lab.get_service_recommendations(use_case), indent=2)
+
+    @mcp.tool()
+    @memoize(maxsize=1)
+    async def list_student_projects() -> str:
+        """List all student projects with their current deployment status."""
+        return json.dumps(lab.list_all_projects(), indent=2)
+
+    @mcp.tool()
+    @memoize(normalize=lambda a: {"services": _service_list(a["services"])})
+    async def estimate_aws_cost(services: str) -> str:
+        """
+        Estimate monthly AWS costs for a comma-separated list of services.
+
+        Args:
+            services: Comma-separated AWS service names (e.g., 'Bedrock,S3,Lambda')
+        """
+        return json.dumps(lab.estimate_cost(_service_list(services)), indent=2)
+
+    @mcp.tool()
+    async def cache_stats() -> str:
+        """Hit/miss/eviction counters of this server's tool caches (for tracing, not for agents)."""
+        return json.dumps(tool_cache.stats())
+
+    return mcp
+
+
+if __name__ == "__main__":
+    lab = AWSLabMCPServer.from_file(os.getenv("AWS_LAB_DATA", DEFAULT_DATA_FILE))
+    build_server(lab).run()  # stdio transport
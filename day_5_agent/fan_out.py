@@ -0,0 +1,97 @@
+# =============================================================================
+# FAN-OUT
+# =============================================================================
+# Runs independent calls (e.g. one specialist-agent pipeline per city)
+# concurrently on a thread pool, with a per-call timeout, and collects the
+# results in the original order. Agent calls are I/O bound (waiting on the
+# model), so threads give near-linear speed-ups.
+# =============================================================================
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass
+class FanOutResult:
+    """Outcome of one fanned-out call."""
+
+    key: str
+    value: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def fan_out(
+    calls: Dict[str, Callable[[], Any]],
+    max_workers: int = 4,
+    timeout: Optional[float] = None,
+    on_timeout: Optional[Callable[[str], None]] = None,
+) -> Dict[str, FanOutResult]:
+    """
+    Run independent zero-argument callables concurrently.
+
+    Args:
+        calls: mapping of key -> callable
+        max_workers: maximum number of calls running at the same time
+        timeout: per-call timeout in seconds, measured from when the call starts
+        on_timeout: called with the key of each call that times out, so the
+            caller can cancel it (e.g. set the cancel signal of its agent) and
+            let it hand back what it holds
+
+    Returns:
+        mapping of key -> FanOutResult, in the same order as `calls`. A call
+        that raises or times out gets `error` set instead of `value`; a
+        timed-out call is not waited for, calls that never started are
+        cancelled.
+    """
+
+    started: Dict[str, float] = {}
+
+    def run(key, fn):
+        start = started[key] = time.perf_counter()
+        try:
+            return FanOutResult(key, value=fn(), elapsed=time.perf_counter() - start)
+        except Exception as e:
+            return FanOutResult(key, error=repr(e), elapsed=time.perf_counter() - start)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fan_out")
+    try:
+        futures = {key: executor.submit(run, key, fn) for key, fn in calls.items()}
+        results: Dict[str, FanOutResult] = {}
+        while len(results) < len(futures):
+            now = time.perf_counter()
+            deadlines = []
+            for key, future in futures.items():
+                if key in results:
+                    continue
+                if future.done():
+                    results[key] = future.result()
+                elif timeout is not None and key in started:
+                    deadline = started[key] + timeout
+                    if deadline <= now:
+                        results[key] = FanOutResult(key, error=f"timed out after {timeout}s", elapsed=timeout)
+                        if on_timeout is not None:
+                            on_timeout(key)
+                    else:
+                        deadlines.append(deadline - now)
+                elif timeout is not None and future.running():
+                    deadlines.append(timeout)  # just picked up by a worker, start not recorded yet
+            if len(results) == len(futures):
+                break
+
+            # Calls only start when a worker frees up, i.e. when a future
+            # completes (timed-out ones included), which also ends the wait
+            wait(
+                [f for f in futures.values() if not f.done()],
+                timeout=min(deadlines) if deadlines else None,
+                return_when=FIRST_COMPLETED,
+            )
+        return {key: results[key] for key in futures}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,183 @@
+# =============================================================================
+# IMPORT TIME BENCHMARK
+# =============================================================================
+# Measures how long the agent scripts and the chatbot library take to load,
+# with a per-package breakdown from `python -X importtime`. Each target is
+# loaded in a fresh interpreter as a regular module (not as __main__), so no
+# demo runs and nothing is cached between measurements.
+#
+#   python import_time_bench.py                        # report
+#   python import_time_bench.py --save baseline.json   # record a baseline
+#   python import_time_bench.py --check baseline.json  # fail on regressions
+#
+# The heavy stacks (strands_tools, langfuse, mcp, langchain) are imported on
+# first use, so they should not show up in the breakdown of a plain load.
+# =============================================================================
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_TARGETS = [
+    os.path.join(HERE, "5-strandAgentObs.py"),
+    os.path.join(HERE, "6-strandAgentMCP.py"),
+    os.path.join(HERE, "..", "Project", "vanilla_project", "app", "rag_chatbot_lib.py"),
+]
+
+# Load a file as a module named "target" from its own directory
+LOADER = """
+import importlib.util, os, sys
+path = sys.argv[1]
+sys.path.insert(0, os.path.dirname(path))
+spec = importlib.util.spec_from_file_location("target", path)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+"""
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Cumulative microseconds per top-level package, from -X importtime output."""
+    packages: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        name = name[1:]  # one separator space, then two per nesting level
+        if name.startswith(" "):
+            continue  # nested import, already counted in its parent
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + int(cumulative)
+    return packages
+
+
+def measure(path: str, repeat: int) -> Dict[str, object]:
+    """Median wall time of loading `path`, and its package breakdown."""
+    timings: List[float] = []
+    packages: Dict[str, int] = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", LOADER, path],
+            cwd=os.path.dirname(path),
+            capture_output=True,
+            text=True,
+        )
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+            return {"error": error}
+        timings.append(elapsed)
+        packages = parse_importtime(proc.stderr)
+    return {"seconds": statistics.median(timings), "packages": packages}
+
+
+def interpreter_startup(repeat: int):
+    """Median startup time of a bare interpreter running the loader's imports,
+    and the packages it imports (left out of the per-target breakdown)."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import importlib.util, os, sys"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), set(parse_importtime(proc.stderr))
+
+
+def report(
+    results: Dict[str, Dict[str, object]], startup: float, baseline_packages: set, top: int
+) -> None:
+    print(f"Interpreter startup: {startup * 1000:.0f} ms (subtracted below)\n")
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name}: could not be imported here ({result['error']})\n")
+            continue
+        print(f"{name}: {(result['seconds'] - startup) * 1000:.0f} ms")
+        packages = sorted(
+            ((p, us) for p, us in result["packages"].items() if p not in baseline_packages),
+            key=lambda kv: kv[1],
+            reverse=True,
+        )
+        for package, micros in packages[:top]:
+            print(f"    {package:<32}{micros / 1000:>9.1f} ms")
+        print()
+
+
+def check(
+    results: Dict[str, Dict[str, object]],
+    baseline: Dict[str, float],
+    startup: float,
+    tolerance: float,
+    slack: float = 0.010,
+) -> List[str]:
+    """Targets whose load time grew by more than `tolerance` (and `slack` seconds,
+    so tiny timings don't flap) over the baseline."""
+    regressions = []
+    for name, result in results.items():
+        if "error" in result or name not in baseline:
+            continue
+        current = result["seconds"] - startup
+        if current > max(baseline[name] * (1 + tolerance), baseline[name] + slack):
+            regressions.append(
+                f"{name}: {current * 1000:.0f} ms vs baseline {baseline[name] * 1000:.0f} ms"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time benchmark for the entry points")
+    parser.add_argument("targets", nargs="*", help="files to load (default: scripts 5, 6 and the chatbot lib)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="packages shown per target")
+    parser.add_argument("--save", metavar="FILE", help="write the load times as a baseline")
+    parser.add_argument("--check", metavar="FILE", help="compare with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--slack-ms", type=float, default=10.0, help="absolute slowdown always allowed")
+    args = parser.parse_args(argv)
+
+    targets = [os.path.abspath(t) for t in (args.targets or DEFAULT_TARGETS)]
+    startup, baseline_packages = interpreter_startup(args.repeat)
+    results = {os.path.basename(path): measure(path, args.repeat) for path in targets}
+    report(results, startup, baseline_packages, args.top)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {name: r["seconds"] - startup for name, r in results.items() if "error" not in r},
+                f,
+                indent=2,
+            )
+        print(f"Baseline written to {args.save}")
+
+    if args.check:
+        with open(args.check) as f:
+            regressions = check(
+                results, json.load(f), startup, args.tolerance, args.slack_ms / 1000
+            )
+        if regressions:
+            print("Import time regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regression beyond {args.tolerance:.0%} of {args.check}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# -----------------------------------------------------------------------------
+# Execution Instructions
+# -----------------------------------------------------------------------------
+# Run this file with: python import_time_bench.py [--save|--check baseline.json]
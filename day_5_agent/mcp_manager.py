@@ -0,0 +1,203 @@
+# =============================================================================
+# MCP CONNECTION MANAGER
+# =============================================================================
+# Starts every configured MCP server concurrently, keeps the connections
+# alive with periodic health checks, and caches their tool lists so that
+# creating an agent per request does no MCP round trip at all.
+#
+# Health checks re-list the tools of each server: a failure restarts the
+# connection, and a changed tool schema (detected with a fingerprint of the
+# tool specs) refreshes the cache and bumps `version`.
+#
+# Servers can expose internal tools (e.g. cache_stats) that are hidden from
+# agents and called directly with call_tool().
+# =============================================================================
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional
+
+if TYPE_CHECKING:  # the mcp client stack is only imported by the server factories
+    from strands.tools.mcp import MCPClient
+
+logger = logging.getLogger(__name__)
+
+
+def tools_fingerprint(tools) -> str:
+    """Stable hash of the tool specs exposed by a server."""
+    specs = sorted((t.tool_spec for t in tools), key=lambda spec: spec["name"])
+    return hashlib.sha256(json.dumps(specs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class MCPConnectionManager:
+    """
+    Manage a set of MCP servers for the lifetime of the application.
+
+    Args:
+        servers: mapping of server name -> factory returning a new MCPClient
+        health_check_interval: seconds between health checks (None disables them)
+        hidden_tools: names of tools left out of tools(), for call_tool() only
+
+    Usage:
+        manager = MCPConnectionManager({"aws-docs": build_aws_docs_client})
+        with manager:
+            agent = Agent(tools=custom_tools + manager.tools())
+    """
+
+    def __init__(
+        self,
+        servers: Dict[str, Callable[[], "MCPClient"]],
+        health_check_interval: Optional[float] = 30.0,
+        hidden_tools: Iterable[str] = (),
+    ):
+        self.servers = servers
+        self.health_check_interval = health_check_interval
+        self.hidden_tools = frozenset(hidden_tools)
+
+        self._clients: Dict[str, "MCPClient"] = {}
+        self._tools: Dict[str, list] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+        self.version = 0
+        self.startup_times: Dict[str, float] = {}
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+    def start(self) -> "MCPConnectionManager":
+        """Start all servers concurrently and cache their tools."""
+        with ThreadPoolExecutor(max_workers=max(1, len(self.servers))) as executor:
+            futures = {
+                name: executor.submit(self._connect, name) for name in self.servers
+            }
+            for name, future in futures.items():
+                future.result()  # re-raise startup errors
+
+        if self.health_check_interval:
+            self._stopped.clear()
+            self._health_thread = threading.Thread(
+                target=self._health_loop, name="mcp-health-check", daemon=True
+            )
+            self._health_thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._health_thread is not None:
+            self._health_thread.join()
+            self._health_thread = None
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for name, client in clients.items():
+            self._close(name, client)
+
+    def __enter__(self) -> "MCPConnectionManager":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    # -------------------------------------------------------------------------
+    # Tool cache
+    # -------------------------------------------------------------------------
+    def tools(self, *names: str) -> list:
+        """Cached tools of the given servers (all servers by default)."""
+        with self._lock:
+            selected = names or self._tools.keys()
+            return [
+                tool
+                for name in selected
+                for tool in self._tools.get(name, [])
+                if tool.tool_name not in self.hidden_tools
+            ]
+
+    def call_tool(self, name: str, tool: str, arguments: Optional[dict] = None) -> str:
+        """
+        Call `tool` on server `name` directly (no agent) and return its text.
+        Raises RuntimeError when the tool reports an error.
+        """
+        with self._lock:
+            client = self._clients[name]
+        result = client.call_tool_sync(f"direct-{uuid.uuid4().hex}", tool, arguments or {})
+        text = "".join(block.get("text", "") for block in result.get("content", []))
+        if result.get("status") == "error":
+            raise RuntimeError(f"MCP tool {name}/{tool} failed: {text}")
+        return text
+
+    def refresh(self, name: str) -> bool:
+        """
+        Re-list the tools of one server. Returns True when the schema changed.
+        Raises if the server does not answer.
+        """
+        with self._lock:
+            client = self._clients[name]
+        tools = list(client.list_tools_sync())
+        return self._store_tools(name, tools)
+
+    def _store_tools(self, name: str, tools: list, replace: bool = False) -> bool:
+        # Tools are bound to their client, so a new connection always replaces
+        # them; `version` only moves when the schema itself changed
+        fingerprint = tools_fingerprint(tools)
+        with self._lock:
+            changed = self._fingerprints.get(name) != fingerprint
+            if changed or replace:
+                self._tools[name] = tools
+                self._fingerprints[name] = fingerprint
+            if changed:
+                self.version += 1
+        if changed:
+            logger.info(f"MCP server '{name}': {len(tools)} tools cached (v{self.version})")
+        return changed
+
+    # -------------------------------------------------------------------------
+    # Connections and health checks
+    # -------------------------------------------------------------------------
+    def _connect(self, name: str) -> None:
+        start = time.perf_counter()
+        client = self.servers[name]()
+        client.start()
+        tools = list(client.list_tools_sync())
+        self.startup_times[name] = time.perf_counter() - start
+
+        with self._lock:
+            old = self._clients.get(name)
+            self._clients[name] = client
+        self._store_tools(name, tools, replace=True)
+        if old is not None:
+            self._close(name, old)
+
+    @staticmethod
+    def _close(name: str, client: "MCPClient") -> None:
+        try:
+            client.stop(None, None, None)
+        except Exception as e:
+            logger.warning(f"Error stopping MCP server '{name}': {e}")
+
+    def check_health(self) -> Dict[str, str]:
+        """Check every server once; restart the ones that do not answer."""
+        status = {}
+        for name in list(self.servers):
+            try:
+                changed = self.refresh(name)
+                status[name] = "changed" if changed else "ok"
+            except Exception as e:
+                logger.warning(f"MCP server '{name}' unhealthy ({e}), restarting")
+                try:
+                    self._connect(name)
+                    status[name] = "restarted"
+                except Exception as e:
+                    logger.error(f"Could not restart MCP server '{name}': {e}")
+                    status[name] = "down"
+        return status
+
+    def _health_loop(self) -> None:
+        while not self._stopped.wait(self.health_check_interval):
+            self.check_health()
@@ -0,0 +1,118 @@
+# =============================================================================
+# MCP CONNECTION MANAGER - LOCAL DEMO
+# =============================================================================
+# Exercises MCPConnectionManager against local stub MCP servers
+# (mcp_stub_server.py), no uvx or network needed:
+#   1. serial vs concurrent startup of 3 slow-starting servers
+#   2. per-request tool lookup: list_tools_sync() vs the cached tools
+#   3. change detection after a server restarts with a new tool
+# =============================================================================
+
+import os
+import sys
+import time
+
+from mcp import StdioServerParameters, stdio_client
+from strands.tools.mcp import MCPClient
+
+from mcp_manager import MCPConnectionManager
+
+STARTUP_DELAY = 1.0  # seconds each stub server takes to start
+STUB_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mcp_stub_server.py")
+
+
+def stub_client(name: str, extra_tool: bool = False) -> MCPClient:
+    env = {
+        **os.environ,
+        "STUB_MCP_NAME": name,
+        "STUB_MCP_STARTUP_DELAY": str(STARTUP_DELAY),
+    }
+    if extra_tool:
+        env["STUB_MCP_EXTRA_TOOL"] = "1"
+    return MCPClient(
+        lambda: stdio_client(
+            StdioServerParameters(command=sys.executable, args=[STUB_SERVER], env=env)
+        )
+    )
+
+
+if __name__ == "__main__":
+    names = ["stub-a", "stub-b", "stub-c"]
+
+    print("\n" + "=" * 80)
+    print("MCP CONNECTION MANAGER DEMO")
+    print("=" * 80 + "\n")
+
+    # -------------------------------------------------------------------------
+    # 1. Serial startup (what the original script does, one server at a time)
+    # -------------------------------------------------------------------------
+    start = time.perf_counter()
+    clients = [stub_client(name) for name in names]
+    for client in clients:
+        client.start()
+        client.list_tools_sync()
+    serial = time.perf_counter() - start
+    for client in clients:
+        client.stop(None, None, None)
+
+    # -------------------------------------------------------------------------
+    # 2. Concurrent startup with the manager
+    # -------------------------------------------------------------------------
+    upgraded = {"stub-c": False}
+    servers = {
+        "stub-a": lambda: stub_client("stub-a"),
+        "stub-b": lambda: stub_client("stub-b"),
+        "stub-c": lambda: stub_client("stub-c", extra_tool=upgraded["stub-c"]),
+    }
+    manager = MCPConnectionManager(servers, health_check_interval=None)
+
+    start = time.perf_counter()
+    manager.start()
+    concurrent = time.perf_counter() - start
+
+    print(f"Startup of {len(names)} servers ({STARTUP_DELAY:.0f}s each):")
+    print(f"  serial:     {serial:.2f}s")
+    print(f"  concurrent: {concurrent:.2f}s\n")
+
+    # -------------------------------------------------------------------------
+    # 3. Per-request tool lookup
+    # -------------------------------------------------------------------------
+    n = 50
+    start = time.perf_counter()
+    for _ in range(n):
+        for name in names:
+            list(manager._clients[name].list_tools_sync())
+    listed = (time.perf_counter() - start) / n * 1000
+
+    start = time.perf_counter()
+    for _ in range(n):
+        tools = manager.tools()
+    cached = (time.perf_counter() - start) / n * 1000
+
+    print(f"Tool lookup per request ({len(tools)} tools):")
+    print(f"  list_tools_sync() on every server: {listed:.2f} ms")
+    print(f"  cached manager.tools():            {cached:.4f} ms\n")
+
+    # -------------------------------------------------------------------------
+    # 4. Change detection: stub-c dies and comes back with a new tool
+    # -------------------------------------------------------------------------
+    version = manager.version
+    upgraded["stub-c"] = True
+    manager._clients["stub-c"].stop(None, None, None)
+
+    status = manager.check_health()
+    print(f"Health check after stopping stub-c: {status}")
+    print(f"  cache version: {version} -> {manager.version}")
+    print(f"  stub-c tools:  {[t.tool_name for t in manager.tools('stub-c')]}")
+
+    manager.stop()
+
+    print("\n" + "=" * 80)
+    print("DEMO COMPLETED")
+    print("=" * 80 + "\n")
+
+
+# -----------------------------------------------------------------------------
+# Execution Instructions
+# -----------------------------------------------------------------------------
+# Run this file with: python mcp_manager_demo.py
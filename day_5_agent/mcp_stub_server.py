@@ -0,0 +1,45 @@
+# =============================================================================
+# STUB MCP SERVER
+# =============================================================================
+# A tiny stdio MCP server used to exercise the MCP connection manager locally,
+# without uvx or network access.
+#
+# Environment variables:
+#   STUB_MCP_NAME           server name (default: "stub")
+#   STUB_MCP_STARTUP_DELAY  seconds to sleep before serving (simulates a slow
+#                           `uvx ...@latest` start)
+#   STUB_MCP_EXTRA_TOOL     when set, also expose a `reverse` tool (simulates a
+#                           server upgrade that changes the tool schema)
+# =============================================================================
+
+import os
+import time
+
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP(os.getenv("STUB_MCP_NAME", "stub"))
+
+
+@mcp.tool()
+def echo(text: str) -> str:
+    """Return the text unchanged."""
+    return text
+
+
+@mcp.tool()
+def word_count(text: str) -> int:
+    """Count the words in a text."""
+    return len(text.split())
+
+
+if os.getenv("STUB_MCP_EXTRA_TOOL"):
+
+    @mcp.tool()
+    def reverse(text: str) -> str:
+        """Reverse a text."""
+        return text[::-1]
+
+
+if __name__ == "__main__":
+    time.sleep(float(os.getenv("STUB_MCP_STARTUP_DELAY", "0")))
+    mcp.run()  # stdio transport
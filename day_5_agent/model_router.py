@@ -0,0 +1,366 @@
+# =============================================================================
+# MODEL ROUTER
+# =============================================================================
+# Sends each request to the cheapest model that can handle it instead of
+# pinning one model per agent.
+#
+# - a difficulty score in [0, 1] is computed from cheap signals: request
+#   length, expected tool calls, reasoning keywords and, when the caller has
+#   retrieved documents, the retrieval confidence
+# - the policy lists the routes cheapest first, each with the highest
+#   difficulty it accepts; the first route that accepts the score is used
+# - an answer that looks unsure (empty, "I don't know"...) is retried on the
+#   next larger route, up to `max_escalations` times. A retry replays the
+#   whole request, tools included, so agent_caller() only allows it when the
+#   first attempt called no tool
+# - per-route calls, latency, tokens and cost are recorded, together with what
+#   the same requests would have cost on the largest route alone
+#
+# The policy is DEFAULT_POLICY unless MODEL_ROUTING_POLICY points to a JSON
+# file with the same keys (missing keys keep their default, and "weights" is
+# merged key by key).
+#
+# agent_caller() sets the model on the agent itself, so the agent must not
+# serve another request during route(): hold the session for the whole call.
+#
+#   router = ModelRouter()
+#   with agent_sessions.session(session_id) as agent:
+#       result = router.route(message, agent_caller(agent, model_for, message))
+# =============================================================================
+
+import copy
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# Prices are USD per 1,000 tokens (Bedrock on-demand list prices, check your region)
+DEFAULT_POLICY: Dict[str, Any] = {
+    "routes": [
+        {
+            "name": "small",
+            "model_id": "eu.amazon.nova-lite-v1:0",
+            "max_difficulty": 0.3,
+            "input_price": 0.00006,
+            "output_price": 0.00024,
+        },
+        {
+            "name": "medium",
+            "model_id": "eu.amazon.nova-pro-v1:0",
+            "max_difficulty": 0.6,
+            "input_price": 0.0008,
+            "output_price": 0.0032,
+        },
+        {
+            "name": "large",
+            "model_id": "eu.anthropic.claude-3-7-sonnet-20250219-v1:0",
+            "max_difficulty": 1.0,
+            "input_price": 0.003,
+            "output_price": 0.015,
+        },
+    ],
+    # Relative weight of each signal in the difficulty score
+    "weights": {"length": 0.25, "tools": 0.3, "reasoning": 0.45, "retrieval": 0.4},
+    "long_request_words": 120,  # length signal saturates here
+    "many_tools": 3,  # tools signal saturates here
+    "reasoning_terms": [
+        "why", "explain", "compare", "difference", "analy", "design", "plan",
+        "trade-off", "step by step", "evaluate", "recommend", "optimi", "prove",
+    ],
+    "tool_terms": [
+        "calculate", "search", "look up", "weather", "time", "count", "cost",
+        "estimate", "list", "configuration",
+    ],
+    "escalate_below": 0.5,  # answer confidence under which the next route is tried
+    "max_escalations": 1,
+}
+
+_NUMBERED_ITEM = re.compile(r"^\s*\d+[.)]\s", re.MULTILINE)
+_ARITHMETIC = re.compile(r"\d+(?:\.\d+)?\s*[-+*/^]\s*\(?\d")
+_UNSURE = re.compile(
+    r"\b(i don't know|i do not know|i'm not sure|i am not sure|cannot answer|can't answer"
+    r"|unable to (?:answer|find|help)|no (?:relevant )?information)\b",
+    re.IGNORECASE,
+)
+
+
+ROUTE_KEYS = ("name", "model_id", "max_difficulty", "input_price", "output_price")
+
+
+def load_policy(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    DEFAULT_POLICY, overridden by the JSON file at `path` or MODEL_ROUTING_POLICY.
+    Nested dicts ("weights") are merged key by key, so a file can change one
+    weight; other keys are replaced.
+
+    Raises:
+        ValueError: if the resulting policy is incomplete
+    """
+    policy = copy.deepcopy(DEFAULT_POLICY)
+    path = path or os.getenv("MODEL_ROUTING_POLICY")
+    if path:
+        with open(path) as f:
+            for key, value in json.load(f).items():
+                if isinstance(value, dict) and isinstance(policy.get(key), dict):
+                    policy[key].update(value)
+                else:
+                    policy[key] = value
+    validate_policy(policy)
+    return policy
+
+
+def validate_policy(policy: Dict[str, Any]) -> None:
+    """Raise ValueError on a policy route() could not use."""
+    if not policy["routes"]:
+        raise ValueError("the routing policy needs at least one route")
+    for route in policy["routes"]:
+        missing = [key for key in ROUTE_KEYS if key not in route]
+        if missing:
+            raise ValueError(f"route {route.get('name', route)!r} is missing {', '.join(missing)}")
+    missing = [name for name in DEFAULT_POLICY["weights"] if name not in policy["weights"]]
+    if missing:
+        raise ValueError(f"the routing policy has no weight for {', '.join(missing)}")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) when the model reports none."""
+    return max(1, len(text) // 4)
+
+
+def request_features(
+    text: str,
+    policy: Dict[str, Any],
+    retrieval_scores: Optional[Iterable[float]] = None,
+    tools_available: bool = True,
+) -> Dict[str, Any]:
+    lower = text.lower()
+    features = {
+        "words": len(text.split()),
+        "reasoning_terms": sum(term in lower for term in policy["reasoning_terms"]),
+        "expected_tools": 0,
+    }
+    if tools_available:
+        # one tool per numbered task, or per tool keyword / arithmetic expression
+        features["expected_tools"] = max(
+            len(_NUMBERED_ITEM.findall(text)),
+            sum(term in lower for term in policy["tool_terms"]) + len(_ARITHMETIC.findall(text)),
+        )
+    if retrieval_scores is not None:
+        features["retrieval_score"] = max(retrieval_scores, default=0.0)
+    return features
+
+
+def difficulty(features: Dict[str, Any], policy: Dict[str, Any]) -> float:
+    """Weighted mean of the normalised signals, in [0, 1]."""
+    signals = {
+        "length": min(features["words"] / policy["long_request_words"], 1.0),
+        "tools": min(features["expected_tools"] / policy["many_tools"], 1.0),
+        "reasoning": min(features["reasoning_terms"] / 2, 1.0),
+    }
+    if "retrieval_score" in features:
+        # low similarity between question and context = hard to answer from it
+        signals["retrieval"] = 1.0 - min(max(features["retrieval_score"], 0.0), 1.0)
+    weights = policy["weights"]
+    return sum(weights[name] * value for name, value in signals.items()) / sum(
+        weights[name] for name in signals
+    )
+
+
+def answer_confidence(answer: str) -> float:
+    """Cheap confidence estimate of a model answer: 0 (empty), 0.2 (unsure) or 1."""
+    if not answer.strip():
+        return 0.0
+    if _UNSURE.search(answer):
+        return 0.2
+    return 1.0
+
+
+class ModelRouter:
+    """
+    Thread-safe router: route() picks the model for one request and
+    escalates unsure answers, report() summarises calls, latency, tokens,
+    cost and savings per route.
+    """
+
+    def __init__(self, policy: Optional[Dict[str, Any]] = None):
+        self.policy = policy or load_policy()
+        self.routes = {route["name"]: route for route in self.policy["routes"]}
+        self._order = [route["name"] for route in self.policy["routes"]]
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {
+                name: {
+                    "requests": 0,  # requests first sent to this route
+                    "calls": 0,  # model calls, escalation retries included
+                    "escalated": 0,  # unsure answers retried on the next route
+                    "seconds": 0.0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "cost": 0.0,
+                }
+                for name in self._order
+            }
+            self._requests = 0
+            self._request_seconds = 0.0
+            self._largest_only_cost = 0.0
+
+    def cost(self, route: Dict[str, Any], input_tokens: int, output_tokens: int) -> float:
+        return (input_tokens * route["input_price"] + output_tokens * route["output_price"]) / 1000
+
+    def choose(self, features: Dict[str, Any]) -> Tuple[str, float]:
+        """Return (route name, difficulty score) for the request features."""
+        score = difficulty(features, self.policy)
+        for name in self._order:
+            if score <= self.routes[name]["max_difficulty"]:
+                return name, score
+        return self._order[-1], score
+
+    def route(
+        self,
+        text: str,
+        call: Callable[[Dict[str, Any]], Tuple[Any, int, int]],
+        retrieval_scores: Optional[Iterable[float]] = None,
+        tools_available: bool = True,
+        confidence: Callable[[str], float] = answer_confidence,
+    ):
+        """
+        Answer `text` with `call(route) -> (answer, input_tokens, output_tokens)`
+        on the chosen route, retrying on larger routes while the answer
+        confidence is below the policy's `escalate_below`. A retry calls
+        `call` again from scratch; a call whose `retryable` attribute is False
+        after an attempt (e.g. it ran tools with side effects) is not retried.
+        """
+        features = request_features(text, self.policy, retrieval_scores, tools_available)
+        name, _ = self.choose(features)
+        with self._lock:
+            self._stats[name]["requests"] += 1
+
+        request_start = time.perf_counter()
+        escalations = 0
+        while True:
+            route = self.routes[name]
+            start = time.perf_counter()
+            answer, input_tokens, output_tokens = call(route)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self._stats[name]
+                stats["calls"] += 1
+                stats["seconds"] += elapsed
+                stats["input_tokens"] += input_tokens
+                stats["output_tokens"] += output_tokens
+                stats["cost"] += self.cost(route, input_tokens, output_tokens)
+
+            position = self._order.index(name)
+            if (
+                position + 1 == len(self._order)
+                or escalations >= self.policy["max_escalations"]
+                or not getattr(call, "retryable", True)
+                or confidence(str(answer)) >= self.policy["escalate_below"]
+            ):
+                break
+            with self._lock:
+                self._stats[name]["escalated"] += 1
+            name = self._order[position + 1]
+            escalations += 1
+
+        with self._lock:
+            self._requests += 1
+            self._request_seconds += time.perf_counter() - request_start
+            # the largest route would have used about as many tokens as the final answer
+            self._largest_only_cost += self.cost(
+                self.routes[self._order[-1]], input_tokens, output_tokens
+            )
+        return answer
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Per-route counters plus totals. `cost_saved` compares with sending
+        every request to the largest route; `latency_saved_s` uses the mean
+        latency observed on the largest route (None until it has been called).
+        """
+        with self._lock:
+            routes = {}
+            for name in self._order:
+                stats = dict(self._stats[name])
+                stats["avg_latency_ms"] = stats["seconds"] / stats["calls"] * 1000 if stats["calls"] else 0.0
+                routes[name] = stats
+            cost = sum(stats["cost"] for stats in routes.values())
+            largest = routes[self._order[-1]]
+            latency_saved = None
+            if largest["calls"]:
+                latency_saved = largest["seconds"] / largest["calls"] * self._requests - self._request_seconds
+            return {
+                "requests": self._requests,
+                "routes": routes,
+                "cost": cost,
+                "largest_only_cost": self._largest_only_cost,
+                "cost_saved": self._largest_only_cost - cost,
+                "avg_request_ms": self._request_seconds / self._requests * 1000 if self._requests else 0.0,
+                "latency_saved_s": latency_saved,
+            }
+
+    def print_report(self) -> None:
+        r = self.report()
+        print(f"{'route':<10}{'requests':>10}{'calls':>8}{'escalated':>11}{'avg latency':>14}{'tokens in/out':>18}{'cost':>12}")
+        for name, s in r["routes"].items():
+            tokens = f"{s['input_tokens']:,}/{s['output_tokens']:,}"
+            print(
+                f"{name:<10}{s['requests']:>10}{s['calls']:>8}{s['escalated']:>11}"
+                f"{s['avg_latency_ms']:>11.0f} ms{tokens:>18}{'$' + format(s['cost'], '.4f'):>12}"
+            )
+        saved = r["cost_saved"] / r["largest_only_cost"] if r["largest_only_cost"] else 0.0
+        print(
+            f"Cost ${r['cost']:.4f} vs ${r['largest_only_cost']:.4f} on '{self._order[-1]}' only "
+            f"({saved:.0%} saved), avg {r['avg_request_ms']:.0f} ms per request"
+        )
+        if r["latency_saved_s"] is not None and len(self._order) > 1:
+            print(f"Estimated latency saved: {r['latency_saved_s']:.1f}s over {r['requests']} requests")
+
+
+# -----------------------------------------------------------------------------
+# Strands integration
+# -----------------------------------------------------------------------------
+def agent_caller(agent, model_for: Callable[[Dict[str, Any]], Any], message: str):
+    """
+    Build the `call` of ModelRouter.route for a Strands agent: the agent runs
+    `message` on `model_for(route)`, and a retry on a larger route starts from
+    the conversation as it was before the request.
+
+    The model is set on the agent itself, so the caller must hold the agent
+    for the whole route() call (SessionRegistry.session does). A retry would
+    run every tool of the first attempt again, so once an attempt has called
+    a tool, `call.retryable` turns False and the router keeps that answer.
+    """
+    history = list(agent.messages)
+
+    def usage():
+        metrics = getattr(agent, "event_loop_metrics", None)
+        return dict(getattr(metrics, "accumulated_usage", None) or {})
+
+    def call(route):
+        agent.messages[:] = history
+        agent.model = model_for(route)
+        before = usage()
+        result = agent(message)
+        after = usage()
+        if any(
+            isinstance(block, dict) and "toolUse" in block
+            for turn in agent.messages[len(history):]
+            for block in turn.get("content", [])
+        ):
+            call.retryable = False
+        if "inputTokens" in after:
+            return (
+                result,
+                after["inputTokens"] - before.get("inputTokens", 0),
+                after["outputTokens"] - before.get("outputTokens", 0),
+            )
+        return result, estimate_tokens(message), estimate_tokens(str(result))
+
+    call.retryable = True
+    return call
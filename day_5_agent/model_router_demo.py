@@ -0,0 +1,141 @@
+# =============================================================================
+# MODEL ROUTING DEMO (offline)
+# =============================================================================
+# Runs the same mix of easy and hard agent requests twice through
+# ModelRouter, with stand-in models instead of Bedrock:
+#   1. routed with the default policy (small / medium / large)
+#   2. everything on the largest model
+# and prints per-route calls, escalations, latency, tokens and cost, plus the
+# measured savings and how many final answers were still unsure.
+#
+# A stand-in model sleeps like a real one (fixed latency + per output token)
+# and answers "I'm not sure" when a request is beyond its capability, which
+# exercises escalation.
+# =============================================================================
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from model_router import DEFAULT_POLICY, ModelRouter, answer_confidence, difficulty, estimate_tokens, request_features
+
+# Per route: (seconds before the first token, seconds per output token, capability)
+STAND_IN_PROFILES = {
+    "small": (0.15, 0.002, 0.35),
+    "medium": (0.30, 0.005, 0.70),
+    "large": (0.60, 0.012, 1.00),
+}
+
+EASY = [
+    "What time is it?",
+    "Calculate 3111696 / 74088",
+    "How many letter R's are in the word strawberry?",
+    "What's the current weather like?",
+    "Search for information about Python",
+    "Show me the lab configuration of student STU{n:03d}",
+]
+
+HARD = [
+    """I have 3 tasks for you:
+
+    1. Search for information about Python programming language
+    2. Calculate the result of (1234 + 5678) * 2
+    3. Analyze this text: "Artificial intelligence is transforming the world."
+    """,
+    """I want to build a RAG application for my project. Can you:
+    1. What AWS services do you recommend for RAG?
+    2. Look up AWS Bedrock Knowledge Bases documentation to explain how it works
+    3. Estimate the monthly cost for: Bedrock, S3, Lambda, OpenSearch
+    """,
+    """I'm planning a fine-tuning project. Can you:
+    1. Get AWS service recommendations for fine-tuning
+    2. Calculate the estimated cost for: SageMaker, S3, ECR, CloudWatch
+    3. Compare it with the cost of a RAG-based approach
+    """,
+    "Explain why my Lambda costs doubled and compare the trade-offs of provisioned concurrency.",
+]
+
+
+class StandInModel:
+    """Answers after a realistic delay; unsure when the request is too hard."""
+
+    def __init__(self, route, policy, rng):
+        self.route = route
+        self.first_token, self.per_token, self.capability = STAND_IN_PROFILES[route["name"]]
+        self.policy = policy
+        self.rng = rng
+
+    def __call__(self, message):
+        # the true difficulty is the router's estimate, give or take a bit
+        true_difficulty = difficulty(request_features(message, self.policy), self.policy) + self.rng.uniform(-0.15, 0.15)
+        output_tokens = self.rng.randint(60, 200)
+        time.sleep(self.first_token + self.per_token * output_tokens)
+        if true_difficulty > self.capability:
+            return "I'm not sure I can answer all of that.", estimate_tokens(message), 12
+        return "x " * output_tokens, estimate_tokens(message) + 400, output_tokens  # + system prompt, tool specs
+
+
+def workload(n, hard_share, seed=0):
+    rng = random.Random(seed)
+    return [
+        rng.choice(HARD) if rng.random() < hard_share else rng.choice(EASY).format(n=rng.randrange(100))
+        for _ in range(n)
+    ]
+
+
+def run(router, messages, concurrency, seed=0):
+    rng = random.Random(seed)
+    models = {name: StandInModel(route, router.policy, rng) for name, route in router.routes.items()}
+
+    def answer(message):
+        return router.route(message, lambda route: models[route["name"]](message))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        answers = list(pool.map(answer, messages))
+    unsure = sum(answer_confidence(a) < router.policy["escalate_below"] for a in answers)
+    return time.perf_counter() - start, unsure
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline demo of cost/latency-aware model routing")
+    parser.add_argument("--requests", type=int, default=120)
+    parser.add_argument("--hard-share", type=float, default=0.3, help="share of multi-step requests")
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    messages = workload(args.requests, args.hard_share)
+
+    print("\n" + "=" * 80)
+    print(f"MODEL ROUTING DEMO - {args.requests} requests, {args.hard_share:.0%} multi-step")
+    print("=" * 80 + "\n")
+
+    routed = ModelRouter(dict(DEFAULT_POLICY))
+    elapsed, unsure = run(routed, messages, args.concurrency)
+    print("--- Routed (default policy) ---")
+    routed.print_report()
+    print(f"Wall time {elapsed:.1f}s, {unsure} unsure final answers\n")
+
+    largest = dict(DEFAULT_POLICY, routes=DEFAULT_POLICY["routes"][-1:])
+    large_only = ModelRouter(largest)
+    elapsed_large, unsure_large = run(large_only, messages, args.concurrency)
+    print(f"--- Everything on '{largest['routes'][0]['name']}' ---")
+    large_only.print_report()
+    print(f"Wall time {elapsed_large:.1f}s, {unsure_large} unsure final answers\n")
+
+    r, b = routed.report(), large_only.report()
+    print(
+        f"Routing saved {1 - r['cost'] / b['cost']:.0%} of the token cost "
+        f"and {1 - r['avg_request_ms'] / b['avg_request_ms']:.0%} of the mean request latency"
+    )
+
+    print("\n" + "=" * 80)
+    print("DEMO COMPLETED")
+    print("=" * 80 + "\n")
+
+
+# -----------------------------------------------------------------------------
+# Execution Instructions
+# -----------------------------------------------------------------------------
+# Run this file with: python model_router_demo.py [--requests 120] [--hard-share 0.3]
@@ -0,0 +1,234 @@
+# =============================================================================
+# SESSION REGISTRY
+# =============================================================================
+# Maps a session_id to a live Agent (with its model client) so that repeat
+# messages in a session skip all construction and keep their conversation.
+#
+# - LRU eviction once more than `max_sessions` agents are alive
+# - idle-timeout eviction of sessions not used for `idle_timeout` seconds
+# - optional spill of evicted conversations to disk (`spill_dir`), restored
+#   the next time the session comes back
+# - a lock per session: a Strands Agent runs one invocation at a time, so
+#   callers hold the session with `with sessions.session(id) as agent:` for
+#   the whole call, and a busy session is never evicted
+#
+# Spilled conversations are pickled: messages hold bytes (images, documents)
+# and nested content blocks that JSON would flatten to strings. The files are
+# written outside the registry lock.
+#
+# Retention is a message-count window, not a memory bound: the agent's
+# conversation manager (e.g. SlidingWindowConversationManager, configured in
+# the factory) keeps the last N messages of each live session.
+# =============================================================================
+
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class _Session:
+    __slots__ = ("agent", "lock", "last_used")
+
+    def __init__(self, agent, last_used: float):
+        self.agent = agent
+        self.lock = threading.Lock()
+        self.last_used = last_used
+
+
+class SessionRegistry:
+    """
+    LRU / idle-timeout cache of agents keyed by session_id.
+
+    Usage:
+        sessions = SessionRegistry(build_agent, max_sessions=100, idle_timeout=900)
+        with sessions.session("session_001") as agent:
+            agent("Hello")
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Any],
+        max_sessions: int = 100,
+        idle_timeout: Optional[float] = 900.0,
+        spill_dir: Optional[str] = None,
+    ):
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.spill_dir = spill_dir
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        # session_id -> _Session, least recently used first
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        # evicted conversations not yet on disk: session_id -> messages
+        self._spilling: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "rehydrated": 0, "evicted": 0, "spilled": 0}
+
+    @contextmanager
+    def session(self, session_id: str, timeout: Optional[float] = None):
+        """
+        Hold the session's agent for the `with` block, building it on first
+        use. Other messages of the same session wait for the block to end.
+
+        Raises:
+            TimeoutError: if the session stays busy for `timeout` seconds
+        """
+        while True:
+            entry, owned = self._entry(session_id)
+            if owned:
+                break
+            if not entry.lock.acquire(timeout=-1 if timeout is None else timeout):
+                raise TimeoutError(f"session {session_id!r} still busy after {timeout}s")
+            with self._lock:
+                if self._sessions.get(session_id) is entry:
+                    break
+            # evicted while we waited for it: its history is spilled, start over
+            entry.lock.release()
+        try:
+            yield entry.agent
+        finally:
+            entry.last_used = time.monotonic()
+            entry.lock.release()
+
+    def get(self, session_id: str):
+        """
+        Return the live agent for `session_id` without holding it. Only safe
+        when messages of one session never run concurrently; prefer session().
+        """
+        with self.session(session_id) as agent:
+            return agent
+
+    def _entry(self, session_id: str) -> Tuple[_Session, bool]:
+        """The session's entry, and whether this call created it (its lock is then held)."""
+        now = time.monotonic()
+        with self._lock:
+            evicted = self._evict_idle(now)
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                self._sessions.move_to_end(session_id)
+                entry.last_used = now
+                self.stats["hits"] += 1
+                # sessions that were busy at their turn may still be over the cap
+                evicted += self._evict_lru(keep=session_id)
+        if entry is not None:
+            self._spill(evicted)
+            return entry, False
+
+        agent = self.factory(session_id)
+        with self._lock:
+            # Another thread may have created the session in the meantime:
+            # its agent wins, ours is dropped before it has any history
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                self._sessions.move_to_end(session_id)
+                self.stats["hits"] += 1
+                owned = False
+            else:
+                self.stats["misses"] += 1
+                entry = _Session(agent, now)
+                entry.lock.acquire()  # nobody can use it before its history is back
+                self._sessions[session_id] = entry
+                evicted += self._evict_lru()
+                owned = True
+        self._spill(evicted)
+
+        if owned:
+            messages = self._load_spilled(session_id)
+            if messages is not None:
+                entry.agent.messages.extend(messages)
+                with self._lock:
+                    self.stats["rehydrated"] += 1
+        return entry, owned
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    # -------------------------------------------------------------------------
+    # Eviction and spill (called with self._lock held, except _spill)
+    # -------------------------------------------------------------------------
+    def _evict_idle(self, now: float) -> List[Tuple[str, list]]:
+        if self.idle_timeout is None:
+            return []
+        expired = [
+            session_id
+            for session_id, entry in self._sessions.items()
+            if now - entry.last_used >= self.idle_timeout and not entry.lock.locked()
+        ]
+        return [self._evict(session_id) for session_id in expired]
+
+    def _evict_lru(self, keep: Optional[str] = None) -> List[Tuple[str, list]]:
+        evicted = []
+        for session_id in list(self._sessions):
+            if len(self._sessions) <= self.max_sessions:
+                break
+            # busy sessions (and the one being handed out) stay
+            if session_id != keep and not self._sessions[session_id].lock.locked():
+                evicted.append(self._evict(session_id))
+        return evicted
+
+    def _evict(self, session_id: str) -> Tuple[str, list]:
+        entry = self._sessions.pop(session_id)
+        self.stats["evicted"] += 1
+        messages = list(entry.agent.messages)
+        if self.spill_dir:
+            self._spilling[session_id] = messages  # visible to _load_spilled until written
+        return session_id, messages
+
+    def _spill(self, evicted: List[Tuple[str, list]]) -> None:
+        """Write evicted conversations to disk, outside the registry lock."""
+        if not self.spill_dir:
+            return
+        for session_id, messages in evicted:
+            path = self._spill_path(session_id)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(messages, f, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                if self._spilling.get(session_id) is messages:
+                    os.replace(tmp_path, path)
+                    del self._spilling[session_id]
+                    self.stats["spilled"] += 1
+                else:  # the session came back while we were writing
+                    os.remove(tmp_path)
+
+    def _spill_path(self, session_id: str) -> str:
+        safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in session_id)
+        return os.path.join(self.spill_dir, f"{safe_id}.pkl")
+
+    def _load_spilled(self, session_id: str) -> Optional[list]:
+        if not self.spill_dir:
+            return None
+        with self._lock:
+            messages = self._spilling.pop(session_id, None)
+        if messages is not None:
+            return messages
+        path = self._spill_path(session_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            messages = pickle.load(f)
+        os.remove(path)
+        return messages
+
+    def clear(self) -> None:
+        """Evict every idle session (spilling them if a spill_dir is set)."""
+        with self._lock:
+            evicted = [
+                self._evict(session_id)
+                for session_id, entry in list(self._sessions.items())
+                if not entry.lock.locked()
+            ]
+        self._spill(evicted)
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            return {"live_sessions": len(self._sessions), **self.stats}
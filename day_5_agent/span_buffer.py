@@ -0,0 +1,401 @@
+# =============================================================================
+# SPAN BUFFER
+# =============================================================================
+# Low-overhead tracing for the agent loop.
+#
+# Recording a span only appends a small record to an in-process ring buffer;
+# a background thread drains the buffer in batches and hands each batch to
+# one or more sinks (Langfuse, an OTLP-JSON file, a local collector...).
+# The agent never waits on the network: when a sink is slow or down, the
+# buffer keeps the most recent spans and counts the ones it had to drop.
+# Every recorded span ends up counted exactly once in `stats`: exported,
+# failed (every sink gave up), dropped (buffer full or still buffered at
+# shutdown), or still buffered / in flight.
+# =============================================================================
+
+import base64
+import json
+import threading
+import time
+import urllib.request
+from random import getrandbits
+from time import time_ns
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class SpanRecord:
+    """
+    A finished (or in-progress) span. Times are Unix epoch nanoseconds; ids
+    are random integers, formatted as hex only when exported.
+    """
+
+    name: str
+    kind: str
+    trace_id: int
+    span_id: int
+    parent_id: Optional[int] = None
+    start_ns: int = 0
+    end_ns: int = 0
+    status: str = "ok"
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+def trace_id_hex(span: SpanRecord) -> str:
+    return f"{span.trace_id:032x}"
+
+
+def span_id_hex(span_id: Optional[int]) -> str:
+    return f"{span_id:016x}" if span_id is not None else ""
+
+
+# =============================================================================
+# SINKS
+# =============================================================================
+class LocalCollectorSink:
+    """
+    In-memory stand-in for a trace collector. `latency` simulates a slow
+    backend and `down=True` makes every export fail.
+    """
+
+    def __init__(self, latency: float = 0.0, down: bool = False):
+        self.latency = latency
+        self.down = down
+        self.spans: List[SpanRecord] = []
+        self.batches = 0
+
+    def export(self, batch: List[SpanRecord]) -> None:
+        time.sleep(self.latency)
+        if self.down:
+            raise ConnectionError("collector unavailable")
+        self.spans.extend(batch)
+        self.batches += 1
+
+    def flush(self) -> None:
+        pass
+
+
+def otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    out = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            out.append({"key": key, "value": {"boolValue": value}})
+        elif isinstance(value, int):
+            out.append({"key": key, "value": {"intValue": str(value)}})
+        elif isinstance(value, float):
+            out.append({"key": key, "value": {"doubleValue": value}})
+        else:
+            out.append({"key": key, "value": {"stringValue": str(value)}})
+    return out
+
+
+def to_otlp(
+    batch: List[SpanRecord],
+    service_name: str,
+    span_attributes: Callable[[SpanRecord], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """A batch as one OTLP/JSON ExportTraceServiceRequest, ids and times as recorded."""
+    spans = [
+        {
+            "traceId": trace_id_hex(span),
+            "spanId": span_id_hex(span.span_id),
+            "parentSpanId": span_id_hex(span.parent_id),
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": otlp_attributes(span_attributes(span)),
+            "status": {"code": 1 if span.status == "ok" else 2},
+        }
+        for span in batch
+    ]
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": otlp_attributes({"service.name": service_name})},
+                "scopeSpans": [{"scope": {"name": "span_buffer"}, "spans": spans}],
+            }
+        ]
+    }
+
+
+class OTLPJsonFileSink:
+    """
+    Append each batch to a file as one OTLP/JSON ExportTraceServiceRequest
+    per line (the format accepted by the OpenTelemetry collector file receiver).
+    """
+
+    def __init__(self, path: str, service_name: str = "strands-agent"):
+        self.path = path
+        self.service_name = service_name
+
+    def to_otlp(self, batch: List[SpanRecord]) -> Dict[str, Any]:
+        return to_otlp(batch, self.service_name, lambda span: {"span.kind": span.kind, **span.attributes})
+
+    def export(self, batch: List[SpanRecord]) -> None:
+        with open(self.path, "a") as f:
+            f.write(json.dumps(self.to_otlp(batch)) + "\n")
+
+    def flush(self) -> None:
+        pass
+
+
+class LangfuseSink:
+    """
+    Send spans to Langfuse's OpenTelemetry endpoint
+    ({host}/api/public/otel/v1/traces) as OTLP/JSON.
+
+    Spans keep their recorded trace id, parent span id and start/end times,
+    so each agent turn shows up as one nested trace: the turn at the root,
+    model and tool calls below it. Root spans carry the trace name,
+    session_id, input and output. (The Langfuse SDK stamps its own start
+    time and span ids on every observation, which would turn buffered spans
+    into one root trace each, timed at export.)
+    """
+
+    OBSERVATION_TYPES = {"agent": "agent", "model": "generation", "tool": "tool"}
+
+    def __init__(
+        self,
+        host: str,
+        public_key: str,
+        secret_key: str,
+        service_name: str = "strands-agent",
+        timeout: float = 10.0,
+    ):
+        self.endpoint = host.rstrip("/") + "/api/public/otel/v1/traces"
+        token = base64.b64encode(f"{public_key}:{secret_key}".encode()).decode()
+        self.headers = {"Authorization": f"Basic {token}", "Content-Type": "application/json"}
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def span_attributes(self, span: SpanRecord) -> Dict[str, Any]:
+        attributes = dict(span.attributes)
+        session_id = attributes.pop("session_id", None)
+        input_, output = attributes.pop("input", None), attributes.pop("output", None)
+
+        out = {
+            "langfuse.observation.type": self.OBSERVATION_TYPES.get(span.kind, "span"),
+            "langfuse.observation.input": input_,
+            "langfuse.observation.output": output,
+        }
+        if span.status != "ok":
+            out["langfuse.observation.level"] = "ERROR"
+            out["langfuse.observation.status_message"] = attributes.get("error")
+        for key, value in attributes.items():
+            out[f"langfuse.observation.metadata.{key}"] = value
+        if span.parent_id is None:
+            out.update({
+                "langfuse.trace.name": span.name,
+                "session.id": session_id,
+                "langfuse.trace.input": input_,
+                "langfuse.trace.output": output,
+            })
+        return out
+
+    def export(self, batch: List[SpanRecord]) -> None:
+        body = json.dumps(to_otlp(batch, self.service_name, self.span_attributes)).encode()
+        request = urllib.request.Request(self.endpoint, data=body, headers=self.headers, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:  # raises on 4xx/5xx
+            response.read()
+
+    def flush(self) -> None:
+        pass
+
+
+# =============================================================================
+# BUFFER
+# =============================================================================
+class _SpanScope:
+    """Class-based context manager: much cheaper than a @contextmanager generator."""
+
+    __slots__ = ("buffer", "record")
+
+    def __init__(self, buffer: "SpanBuffer", record: SpanRecord):
+        self.buffer = buffer
+        self.record = record
+
+    def __enter__(self) -> SpanRecord:
+        return self.record
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc is None:
+            self.buffer.end_span(self.record)
+        else:
+            self.buffer.end_span(self.record, status="error", error=repr(exc))
+        return False
+
+
+class SpanBuffer:
+    """
+    Ring buffer of finished spans exported in batches on a background thread.
+
+    Args:
+        sinks: objects with export(batch) and flush()
+        capacity: maximum number of spans kept; the oldest are dropped first
+        batch_size: spans per export call (reaching it wakes the exporter)
+        flush_interval: maximum seconds between exports
+        max_attempts: export attempts per batch and sink before giving up
+
+    Usage:
+        buffer = SpanBuffer(sinks=[OTLPJsonFileSink("spans.jsonl")])
+        with buffer.span("agent_turn", kind="agent", session_id="s1"):
+            ...
+        buffer.shutdown()
+    """
+
+    def __init__(
+        self,
+        sinks: Optional[List[Any]] = None,
+        capacity: int = 10_000,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_attempts: int = 3,
+    ):
+        self.sinks = list(sinks or [])
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+
+        self._spans: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()  # guards _spans bookkeeping and stats
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._exporting = False
+
+        self.stats = {
+            "recorded": 0,
+            "exported": 0,  # accepted by at least one sink
+            "failed": 0,  # every sink gave up on them
+            "dropped": 0,  # evicted from a full buffer, or still buffered at shutdown
+            "in_flight": 0,  # taken by the exporter, not yet settled
+            "export_errors": 0,  # failed export attempts (retries included)
+        }
+
+        self._thread = threading.Thread(
+            target=self._run, name="span-buffer-exporter", daemon=True
+        )
+        self._thread.start()
+
+    # -------------------------------------------------------------------------
+    # Recording (hot path)
+    # -------------------------------------------------------------------------
+    def start_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        parent: Optional[SpanRecord] = None,
+        **attributes,
+    ) -> SpanRecord:
+        if parent is None:
+            return SpanRecord(
+                name, kind, getrandbits(128), getrandbits(64), None, time_ns(), 0, "ok", attributes
+            )
+        return SpanRecord(
+            name, kind, parent.trace_id, getrandbits(64), parent.span_id, time_ns(), 0, "ok", attributes
+        )
+
+    def end_span(self, span: SpanRecord, status: str = "ok", **attributes) -> None:
+        span.end_ns = time_ns()
+        span.status = status
+        if attributes:
+            span.attributes.update(attributes)
+
+        with self._lock:
+            pending = len(self._spans)
+            if pending == self.capacity:
+                self.stats["dropped"] += 1  # the deque evicts the oldest span
+            self._spans.append(span)
+            self.stats["recorded"] += 1
+        if pending >= self.batch_size and not self._wake.is_set():
+            self._wake.set()
+
+    def span(self, name: str, kind: str = "internal", parent: Optional[SpanRecord] = None, **attributes):
+        """Context manager recording a span around the `with` block."""
+        return _SpanScope(self, self.start_span(name, kind, parent, **attributes))
+
+    # -------------------------------------------------------------------------
+    # Export (background thread)
+    # -------------------------------------------------------------------------
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._export_pending()
+        self._export_pending()
+
+    def _export_pending(self) -> None:
+        self._exporting = True
+        try:
+            while True:
+                with self._lock:
+                    batch = []
+                    while self._spans and len(batch) < self.batch_size:
+                        batch.append(self._spans.popleft())
+                    self.stats["in_flight"] = len(batch)
+                if not batch:
+                    break
+                delivered = [self._export(sink, batch) for sink in self.sinks]
+                with self._lock:
+                    self.stats["in_flight"] = 0
+                    self.stats["exported" if any(delivered) else "failed"] += len(batch)
+        finally:
+            self._exporting = False
+
+    def _export(self, sink, batch: List[SpanRecord]) -> bool:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                sink.export(batch)
+                return True
+            except Exception:
+                with self._lock:
+                    self.stats["export_errors"] += 1
+                if attempt < self.max_attempts and not self._stopped.is_set():
+                    time.sleep(0.05 * 2 ** (attempt - 1))
+        return False
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Ask the exporter to drain the buffer and wait up to `timeout` seconds.
+        Returns True when everything recorded so far was handed to the sinks.
+        """
+        deadline = time.monotonic() + timeout
+        self._wake.set()
+        while (self._spans or self._exporting) and time.monotonic() < deadline:
+            time.sleep(0.005)
+        drained = not self._spans and not self._exporting
+        for sink in self.sinks:
+            try:
+                sink.flush()
+            except Exception:
+                with self._lock:
+                    self.stats["export_errors"] += 1
+        return drained
+
+    def shutdown(self, timeout: float = 5.0) -> bool:
+        """
+        Flush and stop the exporter thread, waiting at most `timeout` seconds.
+        Spans still buffered after that are discarded and counted as dropped;
+        a batch the exporter is still sending stays counted as in flight.
+        """
+        deadline = time.monotonic() + timeout
+        drained = self.flush(timeout)
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(max(0.0, deadline - time.monotonic()))
+        with self._lock:
+            self.stats["dropped"] += len(self._spans)
+            self._spans.clear()
+        return drained
@@ -0,0 +1,90 @@
+# =============================================================================
+# SPAN BUFFER BENCHMARK
+# =============================================================================
+# Measures the cost of recording a span on the agent's thread, and what
+# happens when the sink is healthy, slow or down. No network needed: the
+# sinks are local stand-ins.
+# =============================================================================
+
+import statistics
+import time
+
+from span_buffer import LocalCollectorSink, SpanBuffer
+
+N_SPANS = 90_000  # tight loop used to measure per-span overhead
+N_TURNS = 300  # paced agent turns used for the sink scenarios
+TURN_WORK = 0.002  # seconds of simulated model/tool work per turn
+
+
+def traced_turn(buffer: SpanBuffer) -> None:
+    """One agent turn with a model call and a tool call (3 spans)."""
+    with buffer.span("agent_turn", kind="agent", session_id="bench") as turn:
+        with buffer.span("model_call", kind="model", parent=turn):
+            pass
+        with buffer.span("tool:calculator", kind="tool", parent=turn, tool="calculator"):
+            pass
+
+
+def measure_overhead() -> None:
+    buffer = SpanBuffer(sinks=[LocalCollectorSink()], flush_interval=0.05)
+    start = time.perf_counter()
+    for _ in range(N_SPANS // 3):
+        traced_turn(buffer)
+    elapsed = time.perf_counter() - start
+    buffer.shutdown()
+    print(f"Recording overhead: {elapsed / N_SPANS * 1e9:.0f} ns/span ({N_SPANS:,} spans)")
+
+
+def run_scenario(label: str, sink: LocalCollectorSink) -> None:
+    """Paced turns: report the agent-side latency added by tracing."""
+    buffer = SpanBuffer(sinks=[sink], capacity=500, batch_size=64, flush_interval=0.05)
+
+    added = []
+    for _ in range(N_TURNS):
+        time.sleep(TURN_WORK)
+        start = time.perf_counter()
+        traced_turn(buffer)
+        added.append((time.perf_counter() - start) * 1e6)
+
+    start = time.perf_counter()
+    buffer.shutdown(timeout=1.0)
+    shutdown = time.perf_counter() - start
+
+    stats = buffer.stats
+    print(
+        f"{label:<22}{statistics.median(added):>9.1f}{max(added):>9.1f}"
+        f"{stats['recorded']:>10}{stats['exported']:>10}{stats['failed']:>8}{stats['dropped']:>9}"
+        f"{stats['in_flight']:>8}{stats['export_errors']:>8}{shutdown:>9.2f}"
+    )
+    assert len(sink.spans) == stats["exported"]
+    assert stats["recorded"] == stats["exported"] + stats["failed"] + stats["dropped"] + stats["in_flight"]
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 80)
+    print("SPAN BUFFER BENCHMARK")
+    print("=" * 80 + "\n")
+
+    measure_overhead()
+
+    print(f"\n{N_TURNS} paced agent turns per sink (capacity 500 spans):\n")
+    print(
+        f"{'sink':<22}{'p50 us':>9}{'max us':>9}{'recorded':>10}{'exported':>10}{'failed':>8}"
+        f"{'dropped':>9}{'flight':>8}{'errors':>8}{'close s':>9}"
+    )
+    run_scenario("healthy collector", LocalCollectorSink())
+    run_scenario("slow (200 ms/batch)", LocalCollectorSink(latency=0.2))
+    run_scenario("down", LocalCollectorSink(down=True))
+
+    print(
+        "\np50/max us is the time a turn spends recording its 3 spans. A slow or"
+        "\ndown sink never blocks the agent: the ring buffer keeps the latest"
+        "\nspans, counts the dropped ones, and shutdown waits at most its timeout."
+        "\nEvery recorded span is exported, failed, dropped or still in flight."
+    )
+
+
+# -----------------------------------------------------------------------------
+# Execution Instructions
+# -----------------------------------------------------------------------------
+# Run this file with: python span_buffer_bench.py
@@ -0,0 +1,237 @@
+# =============================================================================
+# SWARM PROFILER
+# =============================================================================
+# Records, for every agent in a Swarm:
+#   - the wall time of each node execution (agent invocation)
+#   - the latency of each model call inside it
+#   - the input/output tokens it consumed
+#   - the handoff edges between nodes
+#
+# and exports them as a Chrome trace / Perfetto JSON timeline (open it at
+# https://ui.perfetto.dev or chrome://tracing) plus a summary table.
+#
+# Profiling uses Strands agent hooks. Nothing is registered unless attach()
+# is called, so a disabled profiler costs nothing.
+# =============================================================================
+
+import json
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from strands.hooks import (
+    AfterInvocationEvent,
+    AfterModelCallEvent,
+    BeforeInvocationEvent,
+    BeforeModelCallEvent,
+    HookProvider,
+    HookRegistry,
+)
+
+
+@dataclass
+class Span:
+    """One timed interval on the timeline (times are perf_counter seconds)."""
+
+    node: str
+    kind: str  # "node" or "model"
+    start: float
+    end: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    attrs: Dict[str, object] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def _usage(agent) -> Tuple[int, int]:
+    usage = agent.event_loop_metrics.accumulated_usage
+    return usage.get("inputTokens", 0), usage.get("outputTokens", 0)
+
+
+class SwarmProfiler(HookProvider):
+    """
+    Hook provider that profiles the agents of a Swarm.
+
+    Usage:
+        profiler = SwarmProfiler()
+        profiler.attach([researcher, coder, reviewer, architect])
+        result = swarm("...")
+        profiler.print_summary()
+        profiler.export_chrome_trace("swarm_trace.json")
+    """
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._open_nodes: Dict[str, Tuple[Span, int, int]] = {}
+        self._open_models: Dict[str, Span] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    # -------------------------------------------------------------------------
+    # Hook registration
+    # -------------------------------------------------------------------------
+    def attach(self, agents) -> "SwarmProfiler":
+        """Register the profiling hooks on each agent."""
+        for agent in agents:
+            agent.hooks.add_hook(self)
+        return self
+
+    def register_hooks(self, registry: HookRegistry, **kwargs) -> None:
+        registry.add_callback(BeforeInvocationEvent, self._before_invocation)
+        registry.add_callback(AfterInvocationEvent, self._after_invocation)
+        registry.add_callback(BeforeModelCallEvent, self._before_model)
+        registry.add_callback(AfterModelCallEvent, self._after_model)
+
+    def _before_invocation(self, event: BeforeInvocationEvent) -> None:
+        agent = event.agent
+        span = Span(node=agent.name, kind="node", start=time.perf_counter())
+        self._open_nodes[agent.name] = (span, *_usage(agent))
+
+    def _after_invocation(self, event: AfterInvocationEvent) -> None:
+        agent = event.agent
+        opened = self._open_nodes.pop(agent.name, None)
+        if opened is None:
+            return
+        span, input_before, output_before = opened
+        span.end = time.perf_counter()
+        input_after, output_after = _usage(agent)
+        span.input_tokens = input_after - input_before
+        span.output_tokens = output_after - output_before
+        with self._lock:
+            self.spans.append(span)
+
+    def _before_model(self, event: BeforeModelCallEvent) -> None:
+        self._open_models[event.agent.name] = Span(
+            node=event.agent.name, kind="model", start=time.perf_counter()
+        )
+
+    def _after_model(self, event: AfterModelCallEvent) -> None:
+        span = self._open_models.pop(event.agent.name, None)
+        if span is None:
+            return
+        span.end = time.perf_counter()
+        if event.exception is not None:
+            span.attrs["error"] = repr(event.exception)
+        with self._lock:
+            self.spans.append(span)
+
+    # -------------------------------------------------------------------------
+    # Analysis
+    # -------------------------------------------------------------------------
+    def node_spans(self) -> List[Span]:
+        return sorted((s for s in self.spans if s.kind == "node"), key=lambda s: s.start)
+
+    def handoffs(self) -> List[Tuple[str, str]]:
+        """Handoff edges, in execution order."""
+        nodes = self.node_spans()
+        return [(a.node, b.node) for a, b in zip(nodes, nodes[1:])]
+
+    def summary(self) -> List[Dict[str, object]]:
+        """Per-agent totals, slowest first."""
+        rows = defaultdict(
+            lambda: {
+                "executions": 0,
+                "wall_s": 0.0,
+                "model_calls": 0,
+                "model_s": 0.0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+            }
+        )
+        for span in self.spans:
+            row = rows[span.node]
+            if span.kind == "node":
+                row["executions"] += 1
+                row["wall_s"] += span.duration
+                row["input_tokens"] += span.input_tokens
+                row["output_tokens"] += span.output_tokens
+            else:
+                row["model_calls"] += 1
+                row["model_s"] += span.duration
+
+        table = [{"node": node, **row} for node, row in rows.items()]
+        return sorted(table, key=lambda r: r["wall_s"], reverse=True)
+
+    def print_summary(self, top: Optional[int] = None) -> None:
+        table = self.summary()[:top]
+
+        print(f"\n{'='*80}")
+        print("SWARM PROFILE - slowest agents")
+        print(f"{'='*80}")
+        print(
+            f"{'node':<14}{'runs':>6}{'wall s':>10}{'model s':>10}"
+            f"{'calls':>7}{'in tok':>10}{'out tok':>10}"
+        )
+        for r in table:
+            print(
+                f"{r['node']:<14}{r['executions']:>6}{r['wall_s']:>10.2f}{r['model_s']:>10.2f}"
+                f"{r['model_calls']:>7}{r['input_tokens']:>10}{r['output_tokens']:>10}"
+            )
+
+        print("\nMost token-hungry agents:")
+        for r in sorted(
+            table, key=lambda r: r["input_tokens"] + r["output_tokens"], reverse=True
+        ):
+            print(f"  {r['node']:<14}{r['input_tokens'] + r['output_tokens']:>10} tokens")
+
+        edges = defaultdict(int)
+        for edge in self.handoffs():
+            edges[edge] += 1
+        print("\nHandoffs:")
+        for (source, target), count in edges.items():
+            print(f"  {source} -> {target} (x{count})")
+
+    # -------------------------------------------------------------------------
+    # Chrome trace / Perfetto export
+    # -------------------------------------------------------------------------
+    def chrome_trace(self) -> Dict[str, object]:
+        """Build a Chrome Trace Event Format document."""
+
+        def us(t):
+            return int((t - self._origin) * 1_000_000)
+
+        nodes = sorted({s.node for s in self.spans})
+        tids = {node: i + 1 for i, node in enumerate(nodes)}
+
+        events = [
+            {"ph": "M", "name": "thread_name", "pid": 1, "tid": tid, "args": {"name": node}}
+            for node, tid in tids.items()
+        ]
+        for span in sorted(self.spans, key=lambda s: s.start):
+            events.append(
+                {
+                    "name": span.node if span.kind == "node" else "model_call",
+                    "cat": span.kind,
+                    "ph": "X",
+                    "pid": 1,
+                    "tid": tids[span.node],
+                    "ts": us(span.start),
+                    "dur": us(span.end) - us(span.start),
+                    "args": {
+                        "input_tokens": span.input_tokens,
+                        "output_tokens": span.output_tokens,
+                        **span.attrs,
+                    },
+                }
+            )
+
+        # Handoffs as flow arrows from the end of one node to the start of the next
+        node_spans = self.node_spans()
+        for i, (a, b) in enumerate(zip(node_spans, node_spans[1:])):
+            common = {"name": "handoff", "cat": "handoff", "id": i, "pid": 1}
+            events.append({**common, "ph": "s", "tid": tids[a.node], "ts": us(a.end) - 1})
+            events.append(
+                {**common, "ph": "f", "bp": "e", "tid": tids[b.node], "ts": us(b.start)}
+            )
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        print(f"\nTimeline written to {path} (open it at https://ui.perfetto.dev)")
@@ -0,0 +1,238 @@
+# =============================================================================
+# TOOL CACHE
+# =============================================================================
+# Memoization for deterministic agent tools. Agents often call the same tool
+# with the same arguments several times within and across sessions; caching
+# the final result (already serialised) skips the work and the json.dumps.
+#
+#   @tool
+#   @memoize(ttl=300)
+#   def get_aws_recommendations(use_case: str) -> str: ...
+#
+# A lookup costs a lock, a key and a copy of mutable results, so it only pays
+# off for tools that do real work. Trivial tools such as letter_counter or
+# text_analyzer are faster left alone (tools.text_analyzer.memoized in
+# benchmarks/ measures the overhead).
+#
+# - keys are tuples of the argument values in signature order (positional,
+#   keyword and default values all map to the same key), optionally through
+#   a `normalize` function; the signature is inspected once per tool
+# - mutable results (dicts, lists...) are copied in and out of the cache, so
+#   callers never share them
+# - per-tool TTL and size-bounded LRU eviction
+# - tools marked @nondeterministic (weather, clock...) refuse to be cached
+# - hit/miss counters per tool via stats(), and listeners for observability
+# =============================================================================
+
+import asyncio
+import copy
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_registry: Dict[str, "ToolCache"] = {}
+_listeners: List[Callable[[str, str], None]] = []
+
+_IMMUTABLE = (str, bytes, int, float, bool, type(None), frozenset)
+
+
+def nondeterministic(func: Callable) -> Callable:
+    """Mark a tool whose results must never be cached (e.g. get_weather)."""
+    func.__tool_cache__ = False
+    return func
+
+
+def subscribe(listener: Callable[[str, str], None]) -> None:
+    """Call `listener(tool_name, event)` on every cache 'hit' or 'miss'."""
+    _listeners.append(listener)
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss/eviction counters of every memoized tool."""
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+def clear_all() -> None:
+    for cache in _registry.values():
+        cache.clear()
+
+
+def unregister(name: str) -> None:
+    """Drop the cache registered under `name` so the name can be memoized again."""
+    _registry.pop(name, None)
+
+
+def _copy(value: Any) -> Any:
+    return value if isinstance(value, _IMMUTABLE) else copy.deepcopy(value)
+
+
+class ToolCache:
+    """Thread-safe LRU cache with an optional per-entry TTL."""
+
+    def __init__(self, name: str, maxsize: int = 256, ttl: Optional[float] = None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key: Hashable):
+        """Return (found, value); mutable values are returned as a copy."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, _copy(value)
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        value = _copy(value)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._entries),
+        }
+
+
+def _notify(name: str, event: str) -> None:
+    for listener in _listeners:
+        try:
+            listener(name, event)
+        except Exception:
+            # observability must never break the tool call itself
+            logger.exception("tool_cache listener %r failed on %s %s", listener, name, event)
+
+
+def _key_builder(func: Callable, normalize: Optional[Callable]) -> Callable[[tuple, dict], Hashable]:
+    """
+    Return make_key(args, kwargs) for `func`. The signature is inspected here,
+    once; calls only build a tuple of the argument values in signature order.
+    """
+    signature = inspect.signature(func)
+    parameters = list(signature.parameters.values())
+    names = tuple(p.name for p in parameters)
+    defaults = {p.name: p.default for p in parameters if p.default is not inspect.Parameter.empty}
+    simple = all(
+        p.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+        for p in parameters
+    )
+
+    def values(args, kwargs) -> tuple:
+        if simple and not kwargs and len(args) == len(names):
+            return args
+        if simple and len(args) <= len(names) and all(name in names[len(args):] for name in kwargs):
+            try:
+                return args + tuple(
+                    kwargs[name] if name in kwargs else defaults[name] for name in names[len(args):]
+                )
+            except KeyError:
+                pass  # missing argument: let bind() raise the usual TypeError
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return tuple(bound.arguments.values())
+
+    def make_key(args, kwargs) -> Hashable:
+        key = values(args, kwargs)
+        if normalize is not None:
+            key = tuple(sorted(normalize(dict(zip(names, key))).items()))
+        try:
+            hash(key)
+        except TypeError:  # lists, dicts...: fall back to their JSON form
+            key = json.dumps(key, sort_keys=True, default=repr)
+        return key
+
+    return make_key
+
+
+def memoize(
+    ttl: Optional[float] = None,
+    maxsize: int = 256,
+    normalize: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+    name: Optional[str] = None,
+) -> Callable:
+    """
+    Cache the results of a deterministic tool. Place it *under* @tool so the
+    tool spec is still built from the original signature and docstring.
+
+    Args:
+        ttl: seconds a result stays valid (None: until evicted)
+        maxsize: maximum number of cached results (least recently used evicted)
+        normalize: optional function mapping the bound arguments (a dict) to a
+            canonical form (e.g. strip/split a comma-separated list)
+        name: metrics name (defaults to the function name)
+
+    Raises:
+        ValueError: if the tool is @nondeterministic, or another memoized
+            tool already uses `name` (see unregister)
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if getattr(func, "__tool_cache__", True) is False:
+            raise ValueError(f"{func.__name__} is marked nondeterministic and cannot be cached")
+
+        cache_name = name or func.__name__
+        if cache_name in _registry:
+            raise ValueError(f"a tool cache named {cache_name!r} already exists; pass another name=")
+        cache = _registry[cache_name] = ToolCache(cache_name, maxsize, ttl)
+        make_key = _key_builder(func, normalize)
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+                found, value = cache.get(key)
+                _notify(cache_name, "hit" if found else "miss")
+                if found:
+                    return value
+                value = await func(*args, **kwargs)
+                cache.put(key, value)
+                return value
+
+            async_wrapper.cache = cache
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            found, value = cache.get(key)
+            _notify(cache_name, "hit" if found else "miss")
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator